@@ -0,0 +1,228 @@
+"""
+Seeds a local backend with synthetic users, worlds and campaigns, then drives the API with
+concurrent virtual users, each repeating: login -> GET /worlds -> GET /world/{id} -> POST /object/{id}.
+
+    python -m backend.benchmarks.load --users 20 --concurrency 50 --duration 30
+
+Requests go to the app in process unless --url is given. To load a running server, seed the same
+SQLite file it reads:
+
+    DATABASE_BACKEND=sqlite SQLITE_PATH=/tmp/load.sqlite3 uvicorn backend.main:app --workers 4
+    python -m backend.benchmarks.load --backend sqlite --sqlite-path /tmp/load.sqlite3 --url http://localhost:8000
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import platform
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+PASSWORD = "load-test-password"
+STEPS = ("login", "worlds", "world", "object_post")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=20, help="seeded users, each with one world and campaign")
+    parser.add_argument("--objects", type=int, default=100, help="objects per seeded world")
+    parser.add_argument("--concurrency", type=int, default=20, help="virtual users running at once")
+    parser.add_argument("--duration", type=float, default=30, help="seconds to run for")
+    parser.add_argument("--think-ms", type=float, default=0, help="pause between a virtual user's requests")
+    parser.add_argument("--url", help="base URL of a running server; the app is driven in process when omitted")
+    parser.add_argument("--backend", default="memory", choices=["memory", "sqlite"], help="storage backend to seed")
+    parser.add_argument("--sqlite-path", default=":memory:", help="database file for --backend sqlite")
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated round trip added to every storage call")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    args = parser.parse_args(argv)
+    if args.url and (args.backend != "sqlite" or args.sqlite_path == ":memory:"):
+        parser.error("--url needs --backend sqlite with a --sqlite-path the server also reads")
+    return args
+
+
+# The backend is chosen when repos is first imported, so configure it before importing anything from backend
+ARGS = parse_args() if __name__ == "__main__" else None
+if ARGS is not None:
+    os.environ["DATABASE_BACKEND"] = ARGS.backend
+    os.environ["SQLITE_PATH"] = ARGS.sqlite_path
+    os.environ["DATABASE_LATENCY_MS"] = str(ARGS.latency_ms)
+    os.environ["DATABASE_WARM_UP"] = "0"
+    os.environ.setdefault("JWT_KEY", "load-test")
+    logging.disable(logging.WARNING)
+
+from backend.models import User
+from backend.benchmarks.run import percentile
+from backend.benchmarks.synthetic import seed_user, seed_world, seed_campaign
+
+
+# === Results ===
+class LoadStats:
+    """
+    Latencies and failures per step, plus completed journeys, for one run.
+    """
+
+    def __init__(self):
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+        self.journeys = 0
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+
+    def record(self, step: str, elapsed: float, status: Optional[int]):
+        self.latencies[step].append(elapsed * 1000)
+        if status is None or status >= 400:
+            self.errors[step] += 1
+        self.statuses[step][status or 0] += 1
+
+    def report(self) -> Dict:
+        seconds = (self.finished or time.perf_counter()) - self.started
+        steps = {}
+        total = errors = 0
+        for step in STEPS:
+            latencies = self.latencies.get(step, [])
+            if not latencies:
+                continue
+            total += len(latencies)
+            errors += self.errors[step]
+            steps[step] = {
+                "requests": len(latencies),
+                "errors": self.errors[step],
+                "error_rate": round(self.errors[step] / len(latencies), 4),
+                "statuses": {str(code): count for code, count in sorted(self.statuses[step].items())},
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p90_ms": round(percentile(latencies, 90), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+                "max_ms": round(max(latencies), 2),
+            }
+        return {
+            "seconds": round(seconds, 2),
+            "requests": total,
+            "requests_per_second": round(total / seconds, 2) if seconds else 0,
+            "journeys": self.journeys,
+            "journeys_per_second": round(self.journeys / seconds, 2) if seconds else 0,
+            "error_rate": round(errors / total, 4) if total else 0,
+            "steps": steps,
+        }
+
+
+# === Virtual Users ===
+async def timed(stats: LoadStats, step: str, request):
+    started = time.perf_counter()
+    try:
+        response = await request
+    except Exception:
+        stats.record(step, time.perf_counter() - started, None)
+        return None
+    stats.record(step, time.perf_counter() - started, response.status_code)
+    return response if response.status_code < 400 else None
+
+async def virtual_user(client, user: User, stats: LoadStats, deadline: float, think: float, rng: random.Random):
+    """
+    Repeats the editor journey until the deadline. A failed step abandons the rest of that journey.
+    """
+    async def pause():
+        if think:
+            await asyncio.sleep(think)
+
+    while time.perf_counter() < deadline:
+        client.cookies.clear()
+        if not await timed(stats, "login", client.post("/login", json={"email": user.email, "password_current": PASSWORD})):
+            continue
+        await pause()
+
+        worlds = await timed(stats, "worlds", client.get("/worlds"))
+        if not worlds or not worlds.json():
+            continue
+        await pause()
+
+        world = await timed(stats, "world", client.get(f"/world/{rng.choice(worlds.json())['id']}"))
+        if not world or not world.json()["objects"]:
+            continue
+        await pause()
+
+        target = rng.choice(world.json()["objects"])
+        payload = {"description": f"Edited by load test at {time.time():.3f}"}
+        if await timed(stats, "object_post", client.post(f"/object/{target['id']}", json=payload)):
+            stats.journeys += 1
+        await pause()
+
+
+# === Main ===
+async def seed(args: argparse.Namespace) -> List[User]:
+    from backend.routes.auth_routes import hash_password
+
+    password_hash = hash_password(PASSWORD)
+    users = []
+    for index in range(args.users):
+        user = await seed_user(f"load{index}-{random.randrange(1 << 32):08x}", password_hash)
+        world = await seed_world(user, args.objects, random.Random(index))
+        await seed_campaign(user, world, rng=random.Random(index))
+        users.append(user)
+    return users
+
+async def run_load(args: argparse.Namespace) -> Dict:
+    import httpx
+
+    users = await seed(args)
+    print(f"Seeded {len(users)} users with {args.objects} objects each", file=sys.stderr)
+
+    if args.url:
+        make_client = lambda: httpx.AsyncClient(base_url=args.url, timeout=60)
+    else:
+        from backend.main import app
+        transport = httpx.ASGITransport(app=app)
+        make_client = lambda: httpx.AsyncClient(transport=transport, base_url="http://load-test", timeout=60)
+
+    clients = [make_client() for _ in range(args.concurrency)]
+    stats = LoadStats()
+    deadline = stats.started + args.duration
+    try:
+        await asyncio.gather(*[
+            virtual_user(client, users[index % len(users)], stats, deadline, args.think_ms / 1000, random.Random(index))
+            for index, client in enumerate(clients)
+        ])
+    finally:
+        stats.finished = time.perf_counter()
+        await asyncio.gather(*[client.aclose() for client in clients])
+
+    return {
+        "meta": {
+            "target": args.url or "in-process",
+            "backend": args.backend,
+            "latency_ms": args.latency_ms,
+            "users": args.users,
+            "objects": args.objects,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "python": platform.python_version(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        **stats.report(),
+    }
+
+def print_report(report: Dict):
+    print(f"\n{report['requests']} requests in {report['seconds']}s: {report['requests_per_second']} req/s, "
+          f"{report['journeys_per_second']} journeys/s, {report['error_rate']:.2%} errors")
+    print(f"{'step':<14}{'requests':>10}{'errors':>8}{'p50 ms':>10}{'p90 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for step, row in report["steps"].items():
+        print(f"{step:<14}{row['requests']:>10}{row['errors']:>8}{row['p50_ms']:>10}{row['p90_ms']:>10}"
+              f"{row['p95_ms']:>10}{row['p99_ms']:>10}{row['max_ms']:>10}")
+
+def main(args: argparse.Namespace) -> int:
+    report = asyncio.run(run_load(args))
+    print_report(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(ARGS))
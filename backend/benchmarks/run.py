@@ -0,0 +1,282 @@
+"""
+Benchmarks the response builders, repository queries and main HTTP routes against synthetic data.
+
+    python -m backend.benchmarks.run --sizes 10,100,1000 --output results.json
+    python -m backend.benchmarks.run --baseline backend/benchmarks/baseline.json
+
+Runs on the in-memory backend unless --backend is given; --latency-ms simulates a storage round trip.
+"""
+import os
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import platform
+import statistics
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10,100,1000", help="comma separated object counts per world")
+    parser.add_argument("--tree", default="3,4,4,5", help="eras,chapters,encounters,actions for the campaign tree")
+    parser.add_argument("--repeat", type=int, default=10, help="timed runs per case, after one warm-up run")
+    parser.add_argument("--backend", default="memory", choices=["memory", "sqlite"], help="storage backend to seed and read")
+    parser.add_argument("--sqlite-path", default=":memory:", help="database file for --backend sqlite")
+    parser.add_argument("--latency-ms", type=float, default=0, help="simulated round trip added to every storage call")
+    parser.add_argument("--only", default="", help="run only cases whose name contains this text")
+    parser.add_argument("--timeout", type=float, default=10, help="seconds before a single run is recorded as an error")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--baseline", help=f"compare against a stored result, such as {DEFAULT_BASELINE}")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results to --baseline (or the default baseline)")
+    parser.add_argument("--threshold", type=float, default=0.25, help="min_ms slowdown reported as slower, without failing (0.25 = 25%%)")
+    parser.add_argument("--floor-ms", type=float, default=2.0, help="slowdowns smaller than this many ms are never reported")
+    return parser.parse_args(argv)
+
+
+# The backend is chosen when repos is first imported, so configure it before importing anything from backend
+ARGS = parse_args() if __name__ == "__main__" else None
+if ARGS is not None:
+    os.environ["DATABASE_BACKEND"] = ARGS.backend
+    os.environ["SQLITE_PATH"] = ARGS.sqlite_path
+    os.environ["DATABASE_LATENCY_MS"] = str(ARGS.latency_ms)
+    os.environ["DATABASE_WARM_UP"] = "0"
+    os.environ.setdefault("JWT_KEY", "benchmark")
+    logging.disable(logging.WARNING)
+
+from backend.database.loader import begin_request, end_request
+from backend.database.read_budget import track_reads
+from backend.benchmarks.synthetic import seed_user, seed_world, seed_campaign, SeededWorld, SeededCampaign
+
+
+# === Measurement ===
+Counts = Dict[str, int]
+Case = Tuple[str, Callable[[], Awaitable[Optional[Counts]]]]
+
+
+def percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = max(0, min(len(ordered) - 1, round(percent / 100 * len(ordered) + 0.5) - 1))
+    return ordered[index]
+
+async def measure(run: Callable[[], Awaitable[Optional[Counts]]], repeat: int, timeout: float) -> Dict:
+    """
+    Times `run` once to warm up and then `repeat` times, each with a fresh request loader.
+    Runs return their repository calls and storage reads when they can count them themselves
+    (HTTP responses); otherwise they are counted here.
+    """
+    timings: List[float] = []
+    counts: Counts = {}
+    for attempt in range(repeat + 1):
+        token = begin_request()
+        try:
+            with track_reads(budget=None, strict=False) as reads:
+                started = time.perf_counter()
+                reported = await asyncio.wait_for(run(), timeout)
+                elapsed = time.perf_counter() - started
+        except asyncio.TimeoutError:
+            return {"error": f"timed out after {timeout}s"}
+        except Exception as e:
+            return {"error": f"{type(e).__name__}: {e}"[:200]}
+        finally:
+            end_request(token)
+
+        if attempt == 0:
+            continue  # Warm-up
+        timings.append(elapsed * 1000)
+        counts = reported if reported is not None else {"repo_calls": reads.calls, "storage_reads": reads.round_trips}
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "mean_ms": round(statistics.fmean(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        **counts,
+        "runs": repeat,
+    }
+
+
+# === Cases ===
+def _counts(response) -> Optional[Counts]:
+    calls, storage_reads = response.headers.get("X-Repo-Calls"), response.headers.get("X-Storage-Reads")
+    if calls is None or storage_reads is None:
+        return None
+    return {"repo_calls": int(calls), "storage_reads": int(storage_reads)}
+
+def _get(client, path: str, params: Optional[dict] = None) -> Callable[[], Awaitable[Optional[Counts]]]:
+    async def run() -> Optional[Counts]:
+        response = await client.get(path, params=params)
+        if response.status_code != 200:
+            raise RuntimeError(f"GET {path} returned {response.status_code}")
+        return _counts(response)
+    return run
+
+def _revalidate(client, path: str) -> Callable[[], Awaitable[Optional[Counts]]]:
+    """
+    GETs `path` with If-None-Match set to the ETag it returned last, as an editor re-fetching an unchanged document does.
+    """
+    etags: Dict[str, str] = {}
+
+    async def run() -> Optional[Counts]:
+        if path not in etags:
+            etags[path] = (await client.get(path)).headers["ETag"]
+        response = await client.get(path, headers={"If-None-Match": etags[path]})
+        if response.status_code != 304:
+            raise RuntimeError(f"GET {path} returned {response.status_code}, expected 304")
+        return _counts(response)
+    return run
+
+def builder_cases(size: int, user, world: SeededWorld, campaign: SeededCampaign) -> List[Case]:
+    from backend.database.repos import worlds_repo, campaigns_repo, objects_repo, eras_repo
+    from backend.routes._schemas import WorldResponse, CampaignResponse
+
+    async def world_response():
+        await WorldResponse.from_model(await worlds_repo.get(world.world_id))
+
+    async def campaign_response():
+        await CampaignResponse.from_model(await campaigns_repo.get(campaign.campaign_id))
+
+    async def era_actions():
+        eras = await eras_repo.get_many(campaign.era_ids)
+        await asyncio.gather(*[era.get_actions() for era in eras])
+
+    async def campaign_timeline():
+        await (await campaigns_repo.get(campaign.campaign_id)).get_timeline()
+
+    async def repo_query():
+        await objects_repo.query([("creator_id", "==", user.id)])
+
+    async def repo_get_many():
+        await objects_repo.get_many(world.object_ids)
+
+    return [
+        (f"world_response/{size}", world_response),
+        (f"campaign_response/{size}", campaign_response),
+        (f"era_actions/{size}", era_actions),
+        (f"campaign_timeline/{size}", campaign_timeline),
+        (f"repo_query/{size}", repo_query),
+        (f"repo_get_many/{size}", repo_get_many),
+    ]
+
+def http_cases(size: int, client, world: SeededWorld) -> List[Case]:
+    return [
+        (f"GET /worlds/{size}", _get(client, "/worlds", {"limit": 100})),
+        (f"GET /worlds?view=full/{size}", _get(client, "/worlds", {"view": "full", "limit": 100})),
+        (f"GET /world/{{id}}/{size}", _get(client, f"/world/{world.world_id}")),
+        (f"GET /blueprints/{size}", _get(client, "/blueprints", {"limit": 100})),
+        (f"GET /blueprint/{{id}}/{size}", _get(client, f"/blueprint/{world.blueprint_ids[0]}")),
+        (f"GET /object/{{id}}/{size}", _get(client, f"/object/{world.object_ids[0]}")),
+        (f"GET /world/{{id}} 304/{size}", _revalidate(client, f"/world/{world.world_id}")),
+    ]
+
+
+# === Baseline Comparison ===
+def compare(results: Dict, baseline: Dict, threshold: float, floor_ms: float) -> List[str]:
+    """
+    Prints each case against the baseline and returns the names of cases that regressed:
+    more storage reads or repository calls, or a new error. Both counts are deterministic, so
+    only they fail a run. Timings are advisory: a case is marked slower when its min_ms grows
+    by more than `threshold` and by at least `floor_ms`, since small cases vary by more than that.
+    """
+    regressions = []
+    print(f"\n{'case':<36}{'baseline ms':>14}{'current ms':>14}{'change':>10}{'reads':>12}{'calls':>12}")
+    for name, current in results["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if before is None:
+            print(f"{name:<36}{'-':>14}{current.get('min_ms', 'error'):>14}{'new':>10}")
+            continue
+        if "error" in current:
+            print(f"{name:<36}{before.get('min_ms', 'error'):>14}{'error':>14}")
+            if "error" not in before:
+                regressions.append(name)
+            continue
+        if "error" in before:
+            print(f"{name:<36}{'error':>14}{current['min_ms']:>14}{'fixed':>10}")
+            continue
+
+        change = current["min_ms"] / before["min_ms"] - 1 if before["min_ms"] else 0
+        reads = f"{before.get('storage_reads', '-')}->{current['storage_reads']}"
+        calls = f"{before['repo_calls']}->{current['repo_calls']}"
+        flag = ""
+        if current["storage_reads"] > before.get("storage_reads", current["storage_reads"]) or current["repo_calls"] > before["repo_calls"]:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        elif change > threshold and current["min_ms"] - before["min_ms"] >= floor_ms:
+            flag = "  slower"
+        print(f"{name:<36}{before['min_ms']:>14}{current['min_ms']:>14}{change:>+10.0%}{reads:>12}{calls:>12}{flag}")
+    return regressions
+
+
+# === Main ===
+async def run_benchmarks(args: argparse.Namespace) -> Dict:
+    import httpx
+    from backend.main import app
+    from backend.routes.auth_routes import hash_password, create_access_token
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    eras, chapters, encounters, actions = (int(part) for part in args.tree.split(","))
+
+    # One user per size, so listings and queries return exactly that size's documents
+    password_hash = hash_password("benchmark")
+    transport = httpx.ASGITransport(app=app)
+    results: Dict[str, Dict] = {}
+    for size in sizes:
+        user = await seed_user(f"benchmark{size}", password_hash)
+        world = await seed_world(user, size)
+        campaign = await seed_campaign(user, world, eras=eras, chapters=chapters, encounters=encounters, actions=actions)
+
+        cookies = {"access_token": create_access_token({"sub": user.id})}
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", cookies=cookies) as client:
+            for name, run in builder_cases(size, user, world, campaign) + http_cases(size, client, world):
+                if args.only and args.only not in name:
+                    continue
+                results[name] = await measure(run, args.repeat, args.timeout)
+                summary = results[name].get("error") or f"{results[name]['median_ms']} ms, {results[name]['storage_reads']} storage reads, {results[name]['repo_calls']} repo calls"
+                print(f"{name:<36}{summary}", file=sys.stderr)
+
+    return {
+        "meta": {
+            "backend": args.backend,
+            "latency_ms": args.latency_ms,
+            "sizes": sizes,
+            "tree": args.tree,
+            "repeat": args.repeat,
+            "python": platform.python_version(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+        },
+        "results": results,
+    }
+
+def main(args: argparse.Namespace) -> int:
+    results = asyncio.run(run_benchmarks(args))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    elif not args.save_baseline:
+        print(json.dumps(results, indent=2))
+
+    baseline_path = args.baseline or DEFAULT_BASELINE
+    if args.save_baseline:
+        with open(baseline_path, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved baseline to {baseline_path}", file=sys.stderr)
+        return 0
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold, args.floor_ms)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(ARGS))
@@ -0,0 +1,189 @@
+import random
+from uuid import uuid4
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+from backend.database.repos import (
+    users_repo, worlds_repo, campaigns_repo, members_repo, context_repo, blueprints_repo, objects_repo,
+    objectives_repo, eras_repo, chapters_repo, encounters_repo, actions_repo,
+)
+from backend.models import (
+    User, World, WorldSetting, Campaign, Member, Context, Blueprint, Object, CustomField,
+    Objective, Era, Chapter, Encounter, Action,
+)
+
+WORDS = (
+    "ancient ember shadow river crown iron whisper storm hollow oath silver ash vale "
+    "thorn lantern raven frost gilded tide spire warden relic dusk bramble"
+).split()
+
+
+def _text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def _new_id() -> str:
+    return uuid4().hex
+
+
+# === Seed Results ===
+class SeededWorld(BaseModel):
+    world_id: str
+    context_ids: List[str]
+    blueprint_ids: List[str]
+    object_ids: List[str]
+
+
+class SeededCampaign(BaseModel):
+    campaign_id: str
+    member_ids: List[str]
+    era_ids: List[str]
+    chapter_ids: List[str]
+    encounter_ids: List[str]
+    action_ids: List[str]
+
+
+# === Users ===
+async def seed_user(username: str, password_hash: str) -> User:
+    """
+    Adds a user with a precomputed bcrypt hash; hashing once and reusing it keeps seeding fast.
+    """
+    user = User(username=username, email=f"{username}@example.com", password_hash=password_hash)
+    if not await users_repo.add(user):
+        raise RuntimeError(f"Failed to seed user {username}")
+    return user
+
+
+# === Library ===
+def _blueprint_fields(rng: random.Random, count: int) -> List[CustomField]:
+    fields = []
+    for index in range(count):
+        kind = rng.choice(["int", "str", "bool", "dropdown"])
+        options = ["common", "rare", "epic", "legendary"] if kind == "dropdown" else None
+        value = {"int": str(rng.randint(0, 20)), "str": rng.choice(WORDS), "bool": "true", "dropdown": "0"}[kind]
+        fields.append(CustomField(name=f"{rng.choice(WORDS)}_{index}", type=kind, value=value, options=options))
+    return fields
+
+async def seed_world(user: User, objects: int, rng: Optional[random.Random] = None) -> SeededWorld:
+    """
+    Adds a world with `objects` objects, one blueprint per ten objects and one context per twenty,
+    all written in batches with their links assigned up front.
+    """
+    rng = rng or random.Random(0)
+    contexts = [
+        Context(id=_new_id(), name=f"Lore {index}", content=_text(rng, 120), creator_id=user.id)
+        for index in range(max(1, objects // 20))
+    ]
+    blueprints = [
+        Blueprint(
+            id=_new_id(), name=f"Blueprint {index}", description=_text(rng, 12), creator_id=user.id,
+            fields=_blueprint_fields(rng, 6),
+        )
+        for index in range(max(1, objects // 10))
+    ]
+    items = []
+    for index in range(objects):
+        blueprint = rng.choice(blueprints)
+        fields = [field.model_copy() for field in blueprint.fields]
+        items.append(Object(
+            id=_new_id(), name=f"Object {index}", description=_text(rng, 30), creator_id=user.id,
+            blueprint_id=blueprint.id, fields=fields,
+        ))
+    world = World(
+        id=_new_id(), name=f"World of {objects}", description=_text(rng, 20), creator_id=user.id,
+        context_ids=[c.id for c in contexts], blueprint_ids=[b.id for b in blueprints], object_ids=[o.id for o in items],
+        settings=WorldSetting(is_public=False),
+    )
+
+    for repo, documents in ((context_repo, contexts), (blueprints_repo, blueprints), (objects_repo, items), (worlds_repo, [world])):
+        if not await repo.add_many(documents):
+            raise RuntimeError(f"Failed to seed {repo._collection}")
+
+    return SeededWorld(
+        world_id=world.id,
+        context_ids=world.context_ids,
+        blueprint_ids=world.blueprint_ids,
+        object_ids=world.object_ids,
+    )
+
+
+# === Campaigns ===
+async def seed_campaign(
+    user: User,
+    world: SeededWorld,
+    members: int = 4,
+    eras: int = 3,
+    chapters: int = 4,
+    encounters: int = 4,
+    actions: int = 5,
+    quests: int = 3,
+    rng: Optional[random.Random] = None,
+) -> SeededCampaign:
+    """
+    Adds a campaign over a seeded world with members and a full era -> chapter -> encounter -> action tree.
+    Every era and chapter gets an objective tree, two levels of `quests` sub-objectives deep.
+    """
+    rng = rng or random.Random(0)
+    campaign_id = _new_id()
+
+    member_docs = [
+        Member(
+            id=_new_id(), user_id=user.id if index == 0 else None, campaign_id=campaign_id,
+            role="dm" if index == 0 else "player", sleeve_id=rng.choice(world.object_ids) if world.object_ids else None,
+        )
+        for index in range(members)
+    ]
+
+    objective_docs, era_docs, chapter_docs, encounter_docs, action_docs = [], [], [], [], []
+
+    def objective(depth: int = 2, parent: Optional[Objective] = None) -> str:
+        doc = Objective(id=_new_id(), name=rng.choice(WORDS).capitalize(), task=_text(rng, 10), progress=rng.randint(0, 100))
+        if parent:
+            parent.add_child(doc)
+        objective_docs.append(doc)
+        if depth:
+            for _ in range(quests):
+                objective(depth - 1, doc)
+        return doc.id
+
+    for era_index in range(eras):
+        era = Era(id=_new_id(), campaign_id=campaign_id, name=f"Era {era_index}", description=_text(rng, 15), objective_id=objective())
+        for chapter_index in range(chapters):
+            chapter = Chapter(id=_new_id(), era_id=era.id, name=f"Chapter {chapter_index}", description=_text(rng, 15), objective_id=objective())
+            for encounter_index in range(encounters):
+                encounter = Encounter(id=_new_id(), chapter_id=chapter.id, name=f"Encounter {encounter_index}", description=_text(rng, 15))
+                for _ in range(actions):
+                    action = Action(
+                        id=_new_id(), encounter_id=encounter.id, owner_member_id=rng.choice(member_docs).id,
+                        character_object_id=None, content=_text(rng, 25), type="narrative", dm_response=_text(rng, 25),
+                        minigame_id=None,
+                    )
+                    action_docs.append(action)
+                    encounter.action_ids.append(action.id)
+                encounter_docs.append(encounter)
+                chapter.encounter_ids.append(encounter.id)
+            chapter_docs.append(chapter)
+            era.chapter_ids.append(chapter.id)
+        era_docs.append(era)
+
+    campaign = Campaign(
+        id=campaign_id, name="Campaign", description=_text(rng, 20), creator_id=user.id, world_id=world.world_id,
+        context_ids=world.context_ids, blueprint_ids=world.blueprint_ids, object_ids=world.object_ids,
+        settings=WorldSetting(is_public=False), member_ids=[m.id for m in member_docs], era_ids=[e.id for e in era_docs],
+    )
+
+    for repo, documents in (
+        (objectives_repo, objective_docs), (actions_repo, action_docs), (encounters_repo, encounter_docs),
+        (chapters_repo, chapter_docs), (eras_repo, era_docs), (members_repo, member_docs), (campaigns_repo, [campaign]),
+    ):
+        if not await repo.add_many(documents):
+            raise RuntimeError(f"Failed to seed {repo._collection}")
+
+    return SeededCampaign(
+        campaign_id=campaign.id,
+        member_ids=campaign.member_ids,
+        era_ids=campaign.era_ids,
+        chapter_ids=[c.id for c in chapter_docs],
+        encounter_ids=[e.id for e in encounter_docs],
+        action_ids=[a.id for a in action_docs],
+    )
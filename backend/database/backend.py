@@ -0,0 +1,280 @@
+import os
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Any, Type, TypeVar, Tuple, AsyncIterator
+
+from pydantic import TypeAdapter
+
+from backend.models import BaseDocument
+
+# Create a type variable for typed model return
+T = TypeVar("T", bound=BaseDocument)
+
+# Filter operators accepted by query_collection, matching Firestore's where() operators
+FILTER_OPERATORS = ("<", "<=", "==", "!=", ">=", ">", "array-contains", "array-contains-any", "in", "not-in")
+
+# Marker for a field that is absent from a document
+_MISSING = object()
+
+
+class DatabaseBackend(ABC):
+    """
+    The storage interface used by BaseRepo.
+    Implementations log their own failures and return None/False/[] instead of raising,
+    the same contract FirestoreWrapper has always had.
+    """
+
+    def __init__(self):
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s [%(levelname)s] %(name)s - %(message)s'
+        )
+        self._logger = logging.getLogger(type(self).__module__)
+
+    async def warm_up(self):
+        """
+        Prepares connections ahead of the first request. Backends with nothing to prepare keep this no-op.
+        """
+        pass
+
+    # ----------------
+    # CRUD Operations
+    # ----------------
+
+    @abstractmethod
+    async def add_document(self, collection: str, model: T) -> Optional[str]:
+        """
+        Adds a new BaseDocument model to a collection.
+        Fails if document with same ID already exists.
+        """
+
+    @abstractmethod
+    async def get_document(self, collection: str, doc_id: str, model_class: Type[T]) -> Optional[T]:
+        """
+        Retrieves a document from a collection and parses it into the given model class.
+        """
+
+    @abstractmethod
+    async def get_documents(self, collection: str, doc_ids: List[str], model_class: Type[T]) -> List[T]:
+        """
+        Retrieves many documents from a collection using batched reads.
+        Results follow the order of `doc_ids`; missing documents are skipped.
+        """
+
+    @abstractmethod
+    async def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
+        """
+        Updates a document's fields and sets updated_at, unless the updates already carry one.
+        """
+
+    @abstractmethod
+    async def delete_document(self, collection: str, doc_id: str) -> bool:
+        """
+        Deletes a document from a collection.
+        """
+
+    @abstractmethod
+    async def add_documents(self, collection: str, models: List[T]) -> bool:
+        """
+        Adds many new documents in batched writes, keeping their IDs.
+        Fails if any document already exists.
+        """
+
+    @abstractmethod
+    async def delete_documents(self, collection: str, doc_ids: List[str]) -> bool:
+        """
+        Deletes many documents from a collection in batched writes.
+        """
+
+    @abstractmethod
+    async def array_remove(self, collection: str, doc_ids: List[str], field: str, values: List[Any]) -> bool:
+        """
+        Removes `values` from the array `field` of many documents in batched writes and sets updated_at.
+        The removal happens server-side, so the documents are not read first.
+        """
+
+    @abstractmethod
+    async def list_documents(
+        self,
+        collection: str,
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+    ) -> List[T]:
+        """
+        Returns all documents in a collection (up to limit) parsed as model objects.
+        `order_by` and `start_after` work as in query_collection.
+        """
+
+    @abstractmethod
+    async def query_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+        select: Optional[List[str]] = None,
+    ) -> List[T]:
+        """
+        Returns filtered and typed list of documents from a collection.
+        `filters` = List of tuples like: [("type", "==", "weapon")]
+        `order_by` = Ascending sort fields; documents missing any of them are excluded.
+        `start_after` = Cursor values, one per `order_by` field, of the last document already seen.
+        `select` = Field projection; only these fields are read and the models are built with parse_projection.
+        """
+
+    @abstractmethod
+    def stream_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        order_by: Optional[List[str]] = None,
+        select: Optional[List[str]] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Yields the documents query_collection would return, one at a time as they are read,
+        so callers never hold the whole result set. Errors are logged and end the stream.
+        """
+
+
+class LocalBackend(DatabaseBackend):
+    """
+    Shared behaviour for the offline backends.
+    DATABASE_LATENCY_MS adds a simulated network round trip to every call,
+    so local benchmarks see Firestore-like costs for chatty access patterns.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._latency = float(os.environ.get("DATABASE_LATENCY_MS", "0")) / 1000
+
+    async def _round_trip(self):
+        if self._latency:
+            await asyncio.sleep(self._latency)
+
+
+# ----------------
+# Projection Helpers
+# ----------------
+
+_field_adapters: Dict[Tuple[type, str], TypeAdapter] = {}
+
+
+def parse_projection(model_class: Type[T], data: Dict[str, Any]) -> T:
+    """
+    Builds a partially populated model from projected fields.
+    Each present field is validated on its own; fields that were not selected stay unset.
+    """
+    values = {}
+    for field, value in data.items():
+        info = model_class.model_fields.get(field)
+        if info is None:
+            continue
+        adapter = _field_adapters.get((model_class, field))
+        if adapter is None:
+            adapter = _field_adapters[(model_class, field)] = TypeAdapter(info.annotation)
+        values[field] = adapter.validate_python(value)
+    return model_class.model_construct(_fields_set=set(values), **values)
+
+
+# ----------------
+# Filter Helpers
+# ----------------
+
+def get_field(data: Dict[str, Any], path: str) -> Any:
+    """
+    Resolves a dotted field path in a document, returning _MISSING if absent.
+    """
+    value: Any = data
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return _MISSING
+        value = value[part]
+    return value
+
+
+def set_field(data: Dict[str, Any], path: str, value: Any):
+    """
+    Sets a dotted field path in a document, creating intermediate maps like Firestore's update().
+    """
+    parts = path.split(".")
+    for part in parts[:-1]:
+        child = data.get(part)
+        if not isinstance(child, dict):
+            child = data[part] = {}
+        data = child
+    data[parts[-1]] = value
+
+
+def matches_filters(data: Dict[str, Any], filters: List[tuple]) -> bool:
+    """
+    Evaluates Firestore-style filters against a plain document.
+    As in Firestore, documents missing a filtered field never match.
+    """
+    for field, op, expected in filters:
+        value = get_field(data, field)
+        if value is _MISSING:
+            return False
+        try:
+            if op == "==":
+                matched = value == expected
+            elif op == "!=":
+                matched = value is not None and value != expected
+            elif op == "<":
+                matched = value < expected
+            elif op == "<=":
+                matched = value <= expected
+            elif op == ">":
+                matched = value > expected
+            elif op == ">=":
+                matched = value >= expected
+            elif op == "array-contains":
+                matched = isinstance(value, list) and expected in value
+            elif op == "array-contains-any":
+                matched = isinstance(value, list) and any(item in value for item in expected)
+            elif op == "in":
+                matched = value in expected
+            elif op == "not-in":
+                matched = value is not None and value not in expected
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        except TypeError:
+            # Mismatched types never compare equal or ordered in Firestore
+            matched = False
+        if not matched:
+            return False
+    return True
+
+
+# ----------------
+# Backend Selection
+# ----------------
+
+def create_backend() -> DatabaseBackend:
+    """
+    Builds the backend named by DATABASE_BACKEND: "firestore" (default), "memory" or "sqlite".
+    Unless METRICS_ENABLED=0 it is wrapped so every call is timed for /metrics.
+    """
+    name = os.environ.get("DATABASE_BACKEND", "firestore").lower()
+    if name == "firestore":
+        from backend.database.firestore_wrapper import AsyncFirestoreWrapper
+        backend = AsyncFirestoreWrapper()
+    elif name == "memory":
+        from backend.database.memory_backend import MemoryBackend
+        backend = MemoryBackend()
+    elif name == "sqlite":
+        from backend.database.sqlite_backend import SQLiteBackend
+        backend = SQLiteBackend(os.environ.get("SQLITE_PATH", "backend/legends.sqlite3"))
+    else:
+        raise RuntimeError(f"Unknown DATABASE_BACKEND: {name}")
+
+    from backend.metrics import METRICS_ENABLED
+    if METRICS_ENABLED:
+        from backend.database.instrumented import InstrumentedBackend
+        backend = InstrumentedBackend(backend)
+    return backend
@@ -0,0 +1,80 @@
+import os
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from backend.models import BaseDocument
+from backend.metrics import register_cache
+
+
+class DocumentCache:
+    """
+    Process-wide read-through cache for repository documents.
+    Entries expire after a per-collection TTL and the least recently used
+    entry is evicted once the cache holds `max_size` documents.
+    Documents are copied on the way in and out so callers can mutate freely.
+    """
+
+    def __init__(self, max_size: int = 10000, enabled: bool = True):
+        self.enabled = enabled
+        self.max_size = max_size
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, BaseDocument]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, collection: str, doc_id: str) -> Optional[BaseDocument]:
+        """
+        Returns a copy of the cached document, or None on a miss or expired entry.
+        """
+        key = (collection, doc_id)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, document = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return document.model_copy(deep=True)
+
+    def put(self, collection: str, doc_id: str, document: BaseDocument, ttl: float):
+        key = (collection, doc_id)
+        entry = (time.monotonic() + ttl, document.model_copy(deep=True))
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, collection: str, doc_id: str):
+        with self._lock:
+            self._entries.pop((collection, doc_id), None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+# Global importable instance, off unless DOCUMENT_CACHE_ENABLED is set
+document_cache = DocumentCache(
+    max_size=int(os.environ.get("DOCUMENT_CACHE_MAX_SIZE", "10000")),
+    enabled=os.environ.get("DOCUMENT_CACHE_ENABLED", "false").lower() in ("1", "true", "yes"),
+)
+register_cache(document_cache)
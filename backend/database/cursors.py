@@ -0,0 +1,41 @@
+import base64
+import json
+from datetime import datetime, timezone
+from typing import Any, List, Sequence
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """
+    Packs cursor values into an opaque URL-safe token.
+    Datetimes are tagged so they decode back to datetimes for range comparisons.
+    """
+    packed = [{"dt": v.isoformat()} if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(packed, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, types: Sequence[type]) -> List[Any]:
+    """
+    Unpacks a token produced by encode_cursor, which must hold exactly one value of each of `types`,
+    in order. Datetimes must be tagged and are normalised to UTC (naive ones are taken as UTC).
+    Raises ValueError if the token is malformed or has the wrong shape.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        packed = json.loads(raw)
+        if not isinstance(packed, list) or len(packed) != len(types):
+            raise ValueError("wrong number of values")
+        return [_decode_value(value, expected) for value, expected in zip(packed, types)]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+
+def _decode_value(value: Any, expected: type) -> Any:
+    if expected is datetime:
+        if not isinstance(value, dict) or set(value) != {"dt"} or not isinstance(value["dt"], str):
+            raise ValueError("expected a datetime")
+        parsed = datetime.fromisoformat(value["dt"])
+        return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed.astimezone(timezone.utc)
+    if not isinstance(value, expected):
+        raise ValueError(f"expected a {expected.__name__}")
+    return value
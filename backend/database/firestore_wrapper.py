@@ -1,37 +1,73 @@
 import os
 import json
-import logging
-from typing import Optional, List, Dict, Any, Type, TypeVar
+import time
+import asyncio
+import threading
+from typing import Optional, List, Dict, Any, Type, AsyncIterator, TYPE_CHECKING
 from datetime import datetime, timezone
 
-from google.cloud import firestore
-from google.oauth2 import service_account
-from backend.models import BaseDocument
+from backend.database.backend import DatabaseBackend, T, parse_projection
 
-# Create a type variable for typed model return
-T = TypeVar("T", bound=BaseDocument)
+if TYPE_CHECKING:
+    from google.cloud import firestore
 
-class FirestoreWrapper:
+# Maximum number of document references sent in a single batch read
+GET_ALL_CHUNK_SIZE = 100
+
+# Firestore's limit on operations in a single WriteBatch
+WRITE_BATCH_SIZE = 500
+
+# Batch commits in flight at once for one bulk write, so large writes stay within Firestore's write throughput
+WRITE_BATCH_CONCURRENCY = int(os.environ.get("FIRESTORE_WRITE_CONCURRENCY", "4"))
+
+# Attempts per batch commit when Firestore reports contention or overload, backing off exponentially
+WRITE_BATCH_ATTEMPTS = 5
+WRITE_BATCH_BACKOFF = 0.5
+
+class AsyncFirestoreWrapper(DatabaseBackend):
     """
-    A wrapper class for Firestore operations with logging.
+    An asyncio wrapper class for Firestore operations with logging.
     Works with typed Pydantic models based on BaseDocument.
+    The client (and the google-cloud imports behind it) is built on first use, not at import.
     """
 
     def __init__(self):
-        self._db = self._get_firestore_client()
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s [%(levelname)s] %(name)s - %(message)s'
-        )
-        self._logger = logging.getLogger(__name__)
-
-    def _get_firestore_client(self) -> firestore.Client:
+        super().__init__()
+        self._client: Optional["firestore.AsyncClient"] = None
+        self._client_lock = threading.Lock()
+
+    @property
+    def _db(self) -> "firestore.AsyncClient":
+        if self._client is None:
+            with self._client_lock:
+                if self._client is None:
+                    started = time.perf_counter()
+                    self._client = self._get_firestore_client()
+                    self._logger.info(f"Firestore client ready in {(time.perf_counter() - started) * 1000:.0f} ms")
+        return self._client
+
+    async def warm_up(self):
+        """
+        Builds the client off the event loop, then makes one small read so the gRPC channel
+        and the OAuth token exist before the first real request needs them.
+        """
+        try:
+            db = await asyncio.to_thread(lambda: self._db)
+            await db.collection("_warmup").document("_warmup").get()
+            self._logger.info("Firestore warm-up complete")
+        except Exception as e:
+            self._logger.error(f"Firestore warm-up failed: {e}")
+
+    def _get_firestore_client(self) -> "firestore.AsyncClient":
+        from google.cloud import firestore
+        from google.oauth2 import service_account
+
         creds_json = os.environ.get("FIREBASE_CREDENTIALS")
         if creds_json:
             try:
                 service_account_info = json.loads(creds_json)
                 credentials = service_account.Credentials.from_service_account_info(service_account_info)
-                return firestore.Client(credentials=credentials, project=service_account_info.get("project_id"))
+                return firestore.AsyncClient(credentials=credentials, project=service_account_info.get("project_id"))
             except Exception as e:
                 raise RuntimeError("Failed to parse FIREBASE_CREDENTIALS: " + str(e))
 
@@ -39,7 +75,7 @@ class FirestoreWrapper:
         if os.path.exists(creds_path):
             try:
                 credentials = service_account.Credentials.from_service_account_file(creds_path)
-                return firestore.Client(credentials=credentials)
+                return firestore.AsyncClient(credentials=credentials)
             except Exception as e:
                 raise RuntimeError("Failed to load credentials from file: " + str(e))
 
@@ -49,7 +85,7 @@ class FirestoreWrapper:
     # CRUD Operations
     # ----------------
 
-    def add_document(self, collection: str, model: T) -> Optional[str]:
+    async def add_document(self, collection: str, model: T) -> Optional[str]:
         """
         Adds a new BaseDocument model to a collection.
         Fails if document with same ID already exists.
@@ -57,20 +93,20 @@ class FirestoreWrapper:
         try:
             model.created_at = datetime.now(timezone.utc)
             data = model.model_dump()
-            self._db.collection(collection).document(model.id).create(data)
+            await self._db.collection(collection).document(model.id).create(data)
             self._logger.info(f"Added document to {collection}/{model.id}")
             return model.id
         except Exception as e:
             self._logger.error(f"Error adding document to {collection}: {e}")
             return None
 
-    def get_document(self, collection: str, doc_id: str, model_class: Type[T]) -> Optional[T]:
+    async def get_document(self, collection: str, doc_id: str, model_class: Type[T]) -> Optional[T]:
         """
         Retrieves a document from a collection and parses it into the given model class.
         """
         try:
             doc_ref = self._db.collection(collection).document(doc_id)
-            doc = doc_ref.get()
+            doc = await doc_ref.get()
             if not doc.exists:
                 self._logger.warning(f"Document not found: {collection}/{doc_id}")
                 return None
@@ -83,67 +119,202 @@ class FirestoreWrapper:
             self._logger.error(f"Failed to get document {collection}/{doc_id}: {e}")
             return None
 
-    def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
+    async def get_documents(self, collection: str, doc_ids: List[str], model_class: Type[T]) -> List[T]:
+        """
+        Retrieves many documents from a collection using batched reads.
+        Results follow the order of `doc_ids`; missing documents are skipped.
+        """
+        unique_ids = list(dict.fromkeys(doc_ids))
+        found: Dict[str, T] = {}
+        try:
+            col_ref = self._db.collection(collection)
+            for start in range(0, len(unique_ids), GET_ALL_CHUNK_SIZE):
+                chunk = unique_ids[start:start + GET_ALL_CHUNK_SIZE]
+                refs = [col_ref.document(doc_id) for doc_id in chunk]
+                async for doc in self._db.get_all(refs):
+                    if not doc.exists:
+                        continue
+                    data = doc.to_dict()
+                    if isinstance(data, dict):
+                        found[doc.id] = model_class(**data)
+            missing = len(unique_ids) - len(found)
+            if missing:
+                self._logger.warning(f"{missing} of {len(unique_ids)} documents not found in {collection}")
+            self._logger.info(f"Retrieved {len(found)} documents from {collection} in batch")
+        except Exception as e:
+            self._logger.error(f"Failed to get documents from {collection}: {e}")
+            return []
+        return [found[doc_id] for doc_id in doc_ids if doc_id in found]
+
+    async def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
         """
-        Updates a document's fields and sets updated_at.
+        Updates a document's fields and sets updated_at, unless the updates already carry one.
         """
         try:
-            updates["updated_at"] = datetime.now(timezone.utc)
-            self._db.collection(collection).document(doc_id).update(updates)
+            updates.setdefault("updated_at", datetime.now(timezone.utc))
+            await self._db.collection(collection).document(doc_id).update(updates)
             self._logger.info(f"Updated document in {collection}/{doc_id}: {list(updates.keys())}")
             return True
         except Exception as e:
             self._logger.error(f"Error updating document {collection}/{doc_id}: {e}")
             return False
 
-    def delete_document(self, collection: str, doc_id: str) -> bool:
+    async def delete_document(self, collection: str, doc_id: str) -> bool:
         try:
-            self._db.collection(collection).document(doc_id).delete()
+            await self._db.collection(collection).document(doc_id).delete()
             self._logger.info(f"Deleted document from {collection}/{doc_id}")
             return True
         except Exception as e:
             self._logger.error(f"Failed to delete document {collection}/{doc_id}: {e}")
             return False
 
-    def list_documents(self, collection: str, model_class: Type[T], limit: Optional[int] = None) -> List[T]:
+    async def _commit_in_batches(self, collection: str, doc_ids: List[str], write) -> None:
         """
-        Returns all documents in a collection (up to limit) parsed as model objects.
+        Applies `write(batch, doc_ref)` to every document, committing WRITE_BATCH_SIZE operations per batch.
+        At most WRITE_BATCH_CONCURRENCY batches are in flight; a batch failing with a transient error
+        (contention, overload, timeout) is rebuilt and retried with exponential backoff.
         """
+        from google.api_core import exceptions
+
+        retryable = (exceptions.Aborted, exceptions.DeadlineExceeded, exceptions.ResourceExhausted, exceptions.ServiceUnavailable)
+        col_ref = self._db.collection(collection)
+        semaphore = asyncio.Semaphore(WRITE_BATCH_CONCURRENCY)
+
+        async def commit(chunk: List[str]):
+            async with semaphore:
+                for attempt in range(WRITE_BATCH_ATTEMPTS):
+                    batch = self._db.batch()
+                    for doc_id in chunk:
+                        write(batch, col_ref.document(doc_id))
+                    try:
+                        await batch.commit()
+                        return
+                    except retryable as e:
+                        if attempt == WRITE_BATCH_ATTEMPTS - 1:
+                            raise
+                        delay = WRITE_BATCH_BACKOFF * 2 ** attempt
+                        self._logger.warning(f"Batch write to {collection} failed ({e}), retrying in {delay:.1f}s")
+                        await asyncio.sleep(delay)
+
+        await asyncio.gather(*[
+            commit(doc_ids[start:start + WRITE_BATCH_SIZE]) for start in range(0, len(doc_ids), WRITE_BATCH_SIZE)
+        ])
+
+    async def add_documents(self, collection: str, models: List[T]) -> bool:
         try:
-            ref = self._db.collection(collection)
-            docs = ref.limit(limit).stream() if limit else ref.stream()
-            results = [model_class(**doc.to_dict()) for doc in docs if doc.exists]
-            self._logger.info(f"Retrieved {len(results)} documents from {collection}")
-            return results
+            now = datetime.now(timezone.utc)
+            data = {}
+            for model in models:
+                model.created_at = now
+                data[model.id] = model.model_dump()
+            await self._commit_in_batches(collection, list(data), lambda batch, ref: batch.create(ref, data[ref.id]))
+            self._logger.info(f"Added {len(data)} documents to {collection}")
+            return True
         except Exception as e:
-            self._logger.error(f"Error listing documents in {collection}: {e}")
-            return []
+            self._logger.error(f"Error adding documents to {collection}: {e}")
+            return False
+
+    async def delete_documents(self, collection: str, doc_ids: List[str]) -> bool:
+        try:
+            await self._commit_in_batches(collection, doc_ids, lambda batch, ref: batch.delete(ref))
+            self._logger.info(f"Deleted {len(doc_ids)} documents from {collection}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Failed to delete documents from {collection}: {e}")
+            return False
+
+    async def array_remove(self, collection: str, doc_ids: List[str], field: str, values: List[Any]) -> bool:
+        from google.cloud import firestore
+
+        try:
+            updates = {field: firestore.ArrayRemove(values), "updated_at": datetime.now(timezone.utc)}
+            await self._commit_in_batches(collection, doc_ids, lambda batch, ref: batch.update(ref, updates))
+            self._logger.info(f"Removed {values} from {field} in {len(doc_ids)} documents of {collection}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Failed to remove {values} from {collection}.{field}: {e}")
+            return False
+
+    async def list_documents(
+        self,
+        collection: str,
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+    ) -> List[T]:
+        """
+        Returns all documents in a collection (up to limit) parsed as model objects.
+        """
+        return await self.query_collection(collection, [], model_class, limit, order_by, start_after)
 
-    def query_collection(
+    async def query_collection(
         self,
         collection: str,
         filters: List[tuple],
         model_class: Type[T],
         limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+        select: Optional[List[str]] = None,
     ) -> List[T]:
         """
         Returns filtered and typed list of documents from a collection.
         `filters` = List of tuples like: [("type", "==", "weapon")]
         """
         try:
-            ref = self._db.collection(collection)
-            q = ref
-            for field, op, value in filters:
-                q = q.where(field, op, value)
-            if limit:
-                q = q.limit(limit)
-            docs = q.stream()
-            results = [model_class(**doc.to_dict()) for doc in docs if doc.exists]
+            docs = self._build_query(collection, filters, limit, order_by, start_after, select).stream()
+            if select:
+                results = [parse_projection(model_class, doc.to_dict()) async for doc in docs if doc.exists]
+            else:
+                results = [model_class(**doc.to_dict()) async for doc in docs if doc.exists]
             self._logger.info(f"Query on {collection} returned {len(results)} results.")
             return results
         except Exception as e:
             self._logger.error(f"Error querying {collection} with {filters}: {e}")
             return []
 
-# Global importable instance
-firestore_wrapper = FirestoreWrapper()
+    async def stream_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        order_by: Optional[List[str]] = None,
+        select: Optional[List[str]] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Yields query results as Firestore streams them, without collecting a list.
+        """
+        count = 0
+        try:
+            async for doc in self._build_query(collection, filters, None, order_by, None, select).stream():
+                if not doc.exists:
+                    continue
+                count += 1
+                yield parse_projection(model_class, doc.to_dict()) if select else model_class(**doc.to_dict())
+            self._logger.info(f"Streamed {count} results from {collection}.")
+        except Exception as e:
+            self._logger.error(f"Error streaming {collection} with {filters} after {count} results: {e}")
+
+    def _build_query(
+        self,
+        collection: str,
+        filters: List[tuple],
+        limit: Optional[int],
+        order_by: Optional[List[str]],
+        start_after: Optional[List[Any]],
+        select: Optional[List[str]],
+    ):
+        q = self._db.collection(collection)
+        for field, op, value in filters:
+            q = q.where(field, op, value)
+        for field in order_by or []:
+            q = q.order_by(field)
+        if start_after:
+            q = q.start_after(list(start_after))
+        if select:
+            q = q.select(select)
+        if limit:
+            q = q.limit(limit)
+        return q
+
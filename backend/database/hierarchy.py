@@ -0,0 +1,67 @@
+from typing import Dict, List, Optional
+
+from backend.models import BaseDocument, Campaign, Era, Chapter, Encounter
+from backend.database.repos import eras_repo, chapters_repo, encounters_repo, actions_repo
+
+# (level name, parent field listing the level's IDs, repository), from the top of a campaign's timeline down
+LEVELS = [
+    ("eras", "era_ids", eras_repo),
+    ("chapters", "chapter_ids", chapters_repo),
+    ("encounters", "encounter_ids", encounters_repo),
+    ("actions", "action_ids", actions_repo),
+]
+
+# The level below each kind of root
+START_LEVELS = {Campaign: 0, Era: 1, Chapter: 2, Encounter: 3}
+
+
+class Hierarchy:
+    """
+    The levels of a campaign timeline below some root documents, as loaded by load_hierarchy.
+    `children` maps a parent's ID to its loaded children, in the parent's ID order;
+    `levels` maps a level name to every document loaded at that level, in the same order.
+    """
+
+    def __init__(self, roots: List[BaseDocument]):
+        self.roots = roots
+        self.children: Dict[str, List[BaseDocument]] = {}
+        self.levels: Dict[str, List[BaseDocument]] = {}
+
+    def children_of(self, parent: BaseDocument) -> List[BaseDocument]:
+        return self.children.get(parent.id, [])
+
+    def level(self, name: str) -> List[BaseDocument]:
+        return self.levels.get(name, [])
+
+
+async def load_hierarchy(roots: List[BaseDocument], depth: Optional[int] = None, recent: Optional[Dict[str, int]] = None) -> Hierarchy:
+    """
+    Loads the timeline below `roots`, which are all campaigns, eras, chapters or encounters, one batched
+    read per level: a campaign's whole timeline is four round trips however long it runs.
+    `depth` limits how many levels are read (None reads down to actions).
+    `recent` keeps only the last N children of each parent at a level, e.g. {"chapters": 2, "encounters": 2},
+    as get_recent_chapters and get_recent_encounters do; IDs outside a window are never read.
+    """
+    hierarchy = Hierarchy(roots)
+    if not roots:
+        return hierarchy
+
+    start = START_LEVELS[type(roots[0])]
+    levels = LEVELS[start:] if depth is None else LEVELS[start:start + depth]
+    recent = recent or {}
+
+    parents = roots
+    for name, field, repo in levels:
+        windows = {}
+        for parent in parents:
+            ids = getattr(parent, field)
+            windows[parent.id] = ids[max(0, len(ids) - recent[name]):] if name in recent else ids
+
+        loaded = {document.id: document for document in await repo.get_many([id for ids in windows.values() for id in ids])}
+        for parent in parents:
+            hierarchy.children[parent.id] = [loaded[id] for id in windows[parent.id] if id in loaded]
+        parents = [child for parent in parents for child in hierarchy.children[parent.id]]
+        hierarchy.levels[name] = parents
+        if not parents:
+            break
+    return hierarchy
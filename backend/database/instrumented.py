@@ -0,0 +1,100 @@
+import time
+from typing import Optional, List, Dict, Any, Type, AsyncIterator, Awaitable
+
+from backend.database.backend import DatabaseBackend, T
+from backend.metrics import db_operation_seconds, current_route
+
+
+class InstrumentedBackend(DatabaseBackend):
+    """
+    Wraps another backend and records how long every call takes,
+    labelled by collection, operation and the route being served.
+    """
+
+    def __init__(self, inner: DatabaseBackend):
+        super().__init__()
+        self._inner = inner
+
+    def _observe(self, collection: str, operation: str, started: float):
+        db_operation_seconds.observe((collection, operation, current_route()), time.perf_counter() - started)
+
+    async def _timed(self, collection: str, operation: str, call: Awaitable):
+        started = time.perf_counter()
+        try:
+            return await call
+        finally:
+            self._observe(collection, operation, started)
+
+    async def warm_up(self):
+        await self._inner.warm_up()
+
+    # ----------------
+    # CRUD Operations
+    # ----------------
+
+    async def add_document(self, collection: str, model: T) -> Optional[str]:
+        return await self._timed(collection, "add", self._inner.add_document(collection, model))
+
+    async def add_documents(self, collection: str, models: List[T]) -> bool:
+        return await self._timed(collection, "add_many", self._inner.add_documents(collection, models))
+
+    async def get_document(self, collection: str, doc_id: str, model_class: Type[T]) -> Optional[T]:
+        return await self._timed(collection, "get", self._inner.get_document(collection, doc_id, model_class))
+
+    async def get_documents(self, collection: str, doc_ids: List[str], model_class: Type[T]) -> List[T]:
+        return await self._timed(collection, "get_many", self._inner.get_documents(collection, doc_ids, model_class))
+
+    async def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
+        return await self._timed(collection, "update", self._inner.update_document(collection, doc_id, updates))
+
+    async def delete_document(self, collection: str, doc_id: str) -> bool:
+        return await self._timed(collection, "delete", self._inner.delete_document(collection, doc_id))
+
+    async def delete_documents(self, collection: str, doc_ids: List[str]) -> bool:
+        return await self._timed(collection, "delete_many", self._inner.delete_documents(collection, doc_ids))
+
+    async def array_remove(self, collection: str, doc_ids: List[str], field: str, values: List[Any]) -> bool:
+        return await self._timed(collection, "array_remove", self._inner.array_remove(collection, doc_ids, field, values))
+
+    async def list_documents(
+        self,
+        collection: str,
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+    ) -> List[T]:
+        return await self._timed(collection, "list", self._inner.list_documents(collection, model_class, limit, order_by, start_after))
+
+    async def query_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+        select: Optional[List[str]] = None,
+    ) -> List[T]:
+        return await self._timed(
+            collection, "query",
+            self._inner.query_collection(collection, filters, model_class, limit, order_by, start_after, select),
+        )
+
+    async def stream_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        order_by: Optional[List[str]] = None,
+        select: Optional[List[str]] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Times the whole stream, from the first read until it is exhausted or abandoned.
+        """
+        started = time.perf_counter()
+        try:
+            async for obj in self._inner.stream_collection(collection, filters, model_class, order_by, select):
+                yield obj
+        finally:
+            self._observe(collection, "stream", started)
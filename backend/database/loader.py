@@ -0,0 +1,108 @@
+import asyncio
+from contextvars import ContextVar
+from typing import Awaitable, Callable, Collection, Dict, List, Optional, Tuple, Union
+
+from backend.models import BaseDocument
+
+# Sentinel for keys the loader has never seen (None means "known to be missing")
+_UNSEEN = object()
+
+FetchMany = Callable[[List[str]], Awaitable[List[BaseDocument]]]
+
+
+class RequestLoader:
+    """
+    Request-scoped identity map for repository reads.
+    Every document read during a request is cached under (collection, id),
+    so repeated lookups of the same creator or blueprint hit memory and
+    batch reads only fetch the IDs that have not been seen yet.
+    Concurrent loads of an ID that is already being fetched wait for that
+    fetch instead of issuing their own.
+    """
+
+    def __init__(self):
+        self._documents: Dict[Tuple[str, str], Union[Optional[BaseDocument], asyncio.Future]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    async def load(self, collection: str, doc_ids: List[str], fetch: FetchMany) -> List[BaseDocument]:
+        """
+        Returns the documents for `doc_ids` in order, skipping missing ones.
+        Unseen IDs are fetched together with a single call to `fetch`.
+        """
+        unseen = []
+        pending = []
+        for doc_id in dict.fromkeys(doc_ids):
+            entry = self._documents.get((collection, doc_id), _UNSEEN)
+            if entry is _UNSEEN:
+                self.misses += 1
+                unseen.append(doc_id)
+            else:
+                self.hits += 1
+                if isinstance(entry, asyncio.Future):
+                    pending.append(entry)
+
+        if unseen:
+            future = asyncio.get_running_loop().create_future()
+            for doc_id in unseen:
+                self._documents[(collection, doc_id)] = future
+            try:
+                fetched = {document.id: document for document in await fetch(unseen)}
+            except BaseException as e:
+                for doc_id in unseen:
+                    self._documents.pop((collection, doc_id), None)
+                future.set_exception(e)
+                future.exception()  # Mark retrieved when nobody else is waiting
+                raise
+            for doc_id in unseen:
+                self._documents[(collection, doc_id)] = fetched.get(doc_id)
+            future.set_result(None)
+
+        for future in pending:
+            await future
+
+        return self.resolve(collection, doc_ids)
+
+    def resolve(self, collection: str, doc_ids: List[str]) -> List[BaseDocument]:
+        """
+        Returns the loaded documents for `doc_ids` in order, skipping missing ones.
+        """
+        results = []
+        for doc_id in doc_ids:
+            document = self._documents.get((collection, doc_id))
+            if isinstance(document, BaseDocument):
+                results.append(document)
+        return results
+
+    def store(self, collection: str, doc_id: str, document: Optional[BaseDocument]):
+        self._documents[(collection, doc_id)] = document
+
+    def forget(self, collection: str, doc_id: str):
+        self._documents.pop((collection, doc_id), None)
+
+    def release(self, keep: Collection[str] = ()):
+        """
+        Drops every loaded document outside the `keep` collections, so a long-lived loader only holds what is shared.
+        """
+        self._documents = {key: document for key, document in self._documents.items() if key[0] in keep}
+
+
+_current_loader: ContextVar[Optional[RequestLoader]] = ContextVar("request_loader", default=None)
+
+
+def current_loader() -> Optional[RequestLoader]:
+    """
+    Returns the loader for the active request, if any.
+    """
+    return _current_loader.get()
+
+
+def begin_request(loader: Optional[RequestLoader] = None) -> object:
+    """
+    Installs `loader`, or a fresh one, for the current context and returns a reset token.
+    """
+    return _current_loader.set(loader or RequestLoader())
+
+
+def end_request(token):
+    _current_loader.reset(token)
@@ -0,0 +1,256 @@
+import copy
+from typing import Optional, List, Dict, Any, Type, Tuple, AsyncIterator, get_args
+from datetime import datetime, timezone
+
+from pydantic import BaseModel
+
+from backend.database.backend import LocalBackend, T, matches_filters, set_field, get_field, parse_projection, _MISSING
+
+
+class MemoryBackend(LocalBackend):
+    """
+    A process-local backend that keeps every collection in dictionaries.
+    Documents are stored as plain data and copied on every read and write,
+    so callers get the same isolation they would from Firestore. Reads let validation
+    do the copying (see _load) rather than deep-copying whole documents first.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._collections: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    def _collection(self, collection: str) -> Dict[str, Dict[str, Any]]:
+        return self._collections.setdefault(collection, {})
+
+    # ----------------
+    # CRUD Operations
+    # ----------------
+
+    async def add_document(self, collection: str, model: T) -> Optional[str]:
+        await self._round_trip()
+        try:
+            docs = self._collection(collection)
+            if model.id in docs:
+                raise ValueError("Document already exists")
+            model.created_at = datetime.now(timezone.utc)
+            docs[model.id] = model.model_dump()
+            self._logger.info(f"Added document to {collection}/{model.id}")
+            return model.id
+        except Exception as e:
+            self._logger.error(f"Error adding document to {collection}: {e}")
+            return None
+
+    async def get_document(self, collection: str, doc_id: str, model_class: Type[T]) -> Optional[T]:
+        await self._round_trip()
+        try:
+            data = self._collection(collection).get(doc_id)
+            if data is None:
+                self._logger.warning(f"Document not found: {collection}/{doc_id}")
+                return None
+            return _load(model_class, data)
+        except Exception as e:
+            self._logger.error(f"Failed to get document {collection}/{doc_id}: {e}")
+            return None
+
+    async def get_documents(self, collection: str, doc_ids: List[str], model_class: Type[T]) -> List[T]:
+        await self._round_trip()
+        try:
+            docs = self._collection(collection)
+            found: Dict[str, T] = {}
+            for doc_id in dict.fromkeys(doc_ids):
+                data = docs.get(doc_id)
+                if data is not None:
+                    found[doc_id] = _load(model_class, data)
+            self._logger.info(f"Retrieved {len(found)} documents from {collection} in batch")
+            return [found[doc_id] for doc_id in doc_ids if doc_id in found]
+        except Exception as e:
+            self._logger.error(f"Failed to get documents from {collection}: {e}")
+            return []
+
+    async def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
+        await self._round_trip()
+        try:
+            data = self._collection(collection).get(doc_id)
+            if data is None:
+                raise KeyError(f"No document to update: {collection}/{doc_id}")
+            updates.setdefault("updated_at", datetime.now(timezone.utc))
+            for field, value in copy.deepcopy(updates).items():
+                set_field(data, field, value)
+            self._logger.info(f"Updated document in {collection}/{doc_id}: {list(updates.keys())}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Error updating document {collection}/{doc_id}: {e}")
+            return False
+
+    async def delete_document(self, collection: str, doc_id: str) -> bool:
+        await self._round_trip()
+        self._collection(collection).pop(doc_id, None)
+        self._logger.info(f"Deleted document from {collection}/{doc_id}")
+        return True
+
+    async def add_documents(self, collection: str, models: List[T]) -> bool:
+        await self._round_trip()
+        try:
+            docs = self._collection(collection)
+            if any(model.id in docs for model in models):
+                raise ValueError("Document already exists")
+            now = datetime.now(timezone.utc)
+            for model in models:
+                model.created_at = now
+                docs[model.id] = model.model_dump()
+            self._logger.info(f"Added {len(models)} documents to {collection}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Error adding documents to {collection}: {e}")
+            return False
+
+    async def delete_documents(self, collection: str, doc_ids: List[str]) -> bool:
+        await self._round_trip()
+        docs = self._collection(collection)
+        for doc_id in doc_ids:
+            docs.pop(doc_id, None)
+        self._logger.info(f"Deleted {len(doc_ids)} documents from {collection}")
+        return True
+
+    async def array_remove(self, collection: str, doc_ids: List[str], field: str, values: List[Any]) -> bool:
+        await self._round_trip()
+        try:
+            docs = self._collection(collection)
+            now = datetime.now(timezone.utc)
+            for doc_id in doc_ids:
+                data = docs.get(doc_id)
+                if data is None:
+                    raise KeyError(f"No document to update: {collection}/{doc_id}")
+                current = get_field(data, field)
+                remaining = [item for item in current if item not in values] if isinstance(current, list) else []
+                set_field(data, field, remaining)
+                data["updated_at"] = now
+            self._logger.info(f"Removed {values} from {field} in {len(doc_ids)} documents of {collection}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Failed to remove {values} from {collection}.{field}: {e}")
+            return False
+
+    async def list_documents(
+        self,
+        collection: str,
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+    ) -> List[T]:
+        return await self.query_collection(collection, [], model_class, limit, order_by, start_after)
+
+    async def query_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+        select: Optional[List[str]] = None,
+    ) -> List[T]:
+        await self._round_trip()
+        try:
+            matches = [data for data in self._collection(collection).values() if matches_filters(data, filters)]
+            if order_by:
+                matches = _order(matches, order_by, start_after)
+            if limit:
+                matches = matches[:limit]
+            if select:
+                results = [parse_projection(model_class, _project(data, select)) for data in matches]
+            else:
+                results = [_load(model_class, data) for data in matches]
+            self._logger.info(f"Query on {collection} returned {len(results)} results.")
+            return results
+        except Exception as e:
+            self._logger.error(f"Error querying {collection} with {filters}: {e}")
+            return []
+
+    async def stream_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        order_by: Optional[List[str]] = None,
+        select: Optional[List[str]] = None,
+    ) -> AsyncIterator[T]:
+        await self._round_trip()
+        count = 0
+        try:
+            docs = list(self._collection(collection).values())
+            if order_by:
+                docs = _order(docs, order_by, None)
+            for data in docs:
+                if not matches_filters(data, filters):
+                    continue
+                count += 1
+                if select:
+                    yield parse_projection(model_class, _project(data, select))
+                else:
+                    yield _load(model_class, data)
+            self._logger.info(f"Streamed {count} results from {collection}.")
+        except Exception as e:
+            self._logger.error(f"Error streaming {collection} with {filters} after {count} results: {e}")
+
+
+def _order(docs: List[Dict[str, Any]], order_by: List[str], start_after: Optional[List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Sorts documents by the given fields and drops everything up to the cursor.
+    """
+    keyed = []
+    for data in docs:
+        key = tuple(get_field(data, field) for field in order_by)
+        if any(value is _MISSING for value in key):
+            continue
+        keyed.append((key, data))
+    keyed.sort(key=lambda item: item[0])
+    if start_after:
+        cursor = tuple(start_after)
+        keyed = [item for item in keyed if item[0] > cursor]
+    return [data for _, data in keyed]
+
+
+def _project(data: Dict[str, Any], select: List[str]) -> Dict[str, Any]:
+    """
+    Copies only the selected (possibly dotted) fields of a document.
+    """
+    projected: Dict[str, Any] = {}
+    for field in select:
+        value = get_field(data, field)
+        if value is not _MISSING:
+            set_field(projected, field, copy.deepcopy(value))
+    return projected
+
+
+_passthrough_fields: Dict[type, Tuple[str, ...]] = {}
+
+
+def _passes_through(annotation: Any, seen: Tuple[type, ...] = ()) -> bool:
+    """
+    Returns True if validating a value of this type can hand back stored containers as they are,
+    i.e. anything typed Any or an unparameterised dict or list, directly or inside a nested model.
+    """
+    if annotation is Any or annotation in (dict, list):
+        return True
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        if annotation in seen:
+            return False
+        return any(_passes_through(field.annotation, (*seen, annotation)) for field in annotation.model_fields.values())
+    return any(_passes_through(arg, seen) for arg in get_args(annotation))
+
+
+def _load(model_class: Type[T], data: Dict[str, Any]) -> T:
+    """
+    Builds a model from stored data. Validation already builds new lists, dicts and nested models,
+    so only the fields whose values it would pass through are deep-copied, not the whole document.
+    """
+    fields = _passthrough_fields.get(model_class)
+    if fields is None:
+        fields = _passthrough_fields[model_class] = tuple(
+            name for name, field in model_class.model_fields.items() if _passes_through(field.annotation)
+        )
+    if fields:
+        data = {**data, **{name: copy.deepcopy(data[name]) for name in fields if name in data}}
+    return model_class.model_validate(data)
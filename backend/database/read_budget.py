@@ -0,0 +1,99 @@
+import os
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+# Storage round trips a single request may make before it is reported
+READ_BUDGET = int(os.environ.get("READ_BUDGET", "100"))
+
+# Raise instead of reporting, so tests fail on read-count regressions
+READ_BUDGET_STRICT = os.environ.get("READ_BUDGET_STRICT", "false").lower() in ("1", "true", "yes")
+
+
+class ReadBudgetExceeded(RuntimeError):
+    pass
+
+
+class RequestReads:
+    """
+    Counts the storage round trips made while handling one request and how often each
+    (collection, id) was read from storage. Only round trips are charged to the budget:
+    repository calls answered by the request loader or the cache cost nothing, so the
+    total call count is kept for reporting only. Many round trips point at N+1 fan-out
+    in the from_model chains; a document read from storage more than once means the
+    request loader was bypassed or invalidated.
+    """
+
+    def __init__(self, budget: Optional[int] = READ_BUDGET, strict: bool = READ_BUDGET_STRICT):
+        self.budget = budget
+        self.strict = strict
+        self.calls = 0
+        self.round_trips = 0
+        self.operations: Counter = Counter()
+        self.storage: Counter = Counter()
+        self.reads: Counter = Counter()
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.round_trips > self.budget
+
+    def record_call(self, collection: str, operation: str):
+        self.calls += 1
+        self.operations[f"{collection}.{operation}"] += 1
+
+    def record_round_trip(self, collection: str, operation: str, doc_ids: Iterable[str] = ()):
+        """
+        Raises ReadBudgetExceeded in strict mode once the round trip count passes the budget.
+        """
+        self.round_trips += 1
+        self.storage[f"{collection}.{operation}"] += 1
+        for doc_id in doc_ids:
+            self.reads[(collection, doc_id)] += 1
+        if self.strict and self.exceeded:
+            raise ReadBudgetExceeded(f"{self.round_trips} storage round trips exceed the budget of {self.budget}: {self.summary()}")
+
+    def repeated(self) -> Dict[Tuple[str, str], int]:
+        return {key: count for key, count in self.reads.items() if count > 1}
+
+    def summary(self, top: int = 5) -> str:
+        operations = ", ".join(f"{name} x{count}" for name, count in self.storage.most_common(top))
+        repeated = sorted(self.repeated().items(), key=lambda item: -item[1])[:top]
+        text = f"round trips: {operations or 'none'}"
+        if repeated:
+            text += "; repeated reads: " + ", ".join(f"{collection}/{doc_id} x{count}" for (collection, doc_id), count in repeated)
+        return text
+
+
+_current_reads: ContextVar[Optional[RequestReads]] = ContextVar("request_reads", default=None)
+
+
+def current_reads() -> Optional[RequestReads]:
+    """
+    Returns the read counters for the active request, if any.
+    """
+    return _current_reads.get()
+
+
+def begin_reads(reads: Optional[RequestReads] = None) -> object:
+    return _current_reads.set(reads or RequestReads())
+
+
+def end_reads(token):
+    _current_reads.reset(token)
+
+
+@contextmanager
+def track_reads(budget: Optional[int] = None, strict: bool = True) -> Iterator[RequestReads]:
+    """
+    Counts storage round trips made inside the block, for code that runs outside a request:
+
+        with track_reads(budget=10):
+            await CampaignResponse.from_model(campaign)
+    """
+    reads = RequestReads(budget, strict)
+    token = begin_reads(reads)
+    try:
+        yield reads
+    finally:
+        end_reads(token)
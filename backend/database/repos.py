@@ -1,58 +1,334 @@
 # database/base_repo.py
-from typing import TypeVar, Generic, Type, List, Optional, Dict, Any
+import logging
+from typing import TypeVar, Generic, Type, List, Optional, Dict, Any, Tuple, AsyncIterator, Callable, Awaitable
 from backend.models import BaseDocument
-from backend.database.firestore_wrapper import firestore_wrapper
+from backend.database.backend import create_backend
+from backend.database.loader import current_loader
+from backend.database.read_budget import current_reads
+from backend.database.cache import document_cache
+from backend.database.cursors import encode_cursor, decode_cursor
 
 from datetime import datetime, timezone
 from uuid import uuid4
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T", bound=BaseDocument)
 
+# Called with the IDs of the documents a write changed; see BaseRepo.on_change
+ChangeListener = Callable[[List[str]], Awaitable[None]]
+
+# Storage backend shared by every repository, chosen by DATABASE_BACKEND
+database_backend = create_backend()
+
+# Stable sort order for paginated queries; Firestore needs a composite index per filtered field
+PAGE_ORDER = ["created_at", "id"]
+PAGE_ORDER_TYPES = [datetime, str]  # What a page cursor must hold, one value per PAGE_ORDER field
+
 class BaseRepo(Generic[T]):
-    def __init__(self, model_cls: Type[T], collection: str):
-        self._db = firestore_wrapper
+    def __init__(self, model_cls: Type[T], collection: str, cache_ttl: Optional[float] = None):
+        self._db = database_backend
+        self._cache = document_cache
+        self._cache_ttl = cache_ttl
         self._collection = collection
         self._model_cls = model_cls
+        self._listeners: List[ChangeListener] = []
+
+    def on_change(self, listener: ChangeListener):
+        """
+        Registers `listener(ids)` to run once per successful update, delete, delete_many or array_remove,
+        with every ID the write touched. Listeners run inline, so anything slow should be queued.
+        Listener errors are logged, never raised.
+        """
+        self._listeners.append(listener)
+
+    async def _notify(self, ids: List[str]):
+        for listener in self._listeners:
+            try:
+                await listener(ids)
+            except Exception as e:
+                logger.error(f"Change listener on {len(ids)} {self._collection} documents failed: {e}")
+
+    # --- Storage reads behind the process-wide cache ---
+
+    def _caching(self) -> bool:
+        return self._cache.enabled and self._cache_ttl is not None
+
+    def _track(self, operation: str):
+        reads = current_reads()
+        if reads is not None:
+            reads.record_call(self._collection, operation)
+
+    def _track_round_trip(self, operation: str, ids: List[str] = ()):
+        reads = current_reads()
+        if reads is not None:
+            reads.record_round_trip(self._collection, operation, ids)
+
+    async def _fetch(self, id: str) -> Optional[T]:
+        if not self._caching():
+            self._track_round_trip("get", [id])
+            obj = await self._db.get_document(self._collection, id, self._model_cls)
+        else:
+            obj = self._cache.get(self._collection, id)
+            if obj is None:
+                self._track_round_trip("get", [id])
+                obj = await self._db.get_document(self._collection, id, self._model_cls)
+                if obj is not None:
+                    self._cache.put(self._collection, id, obj, self._cache_ttl)
+        if obj is not None:
+            obj.mark_clean()
+        return obj
+
+    async def _fetch_many(self, ids: List[str]) -> List[T]:
+        if not self._caching():
+            self._track_round_trip("get_many", list(dict.fromkeys(ids)))
+            objs = await self._db.get_documents(self._collection, ids, self._model_cls)
+            for obj in objs:
+                obj.mark_clean()
+            return objs
+
+        found: Dict[str, T] = {}
+        missing = []
+        for id in dict.fromkeys(ids):
+            obj = self._cache.get(self._collection, id)
+            if obj is None:
+                missing.append(id)
+            else:
+                found[id] = obj
+        if missing:
+            self._track_round_trip("get_many", missing)
+            for obj in await self._db.get_documents(self._collection, missing, self._model_cls):
+                self._cache.put(self._collection, obj.id, obj, self._cache_ttl)
+                found[obj.id] = obj
+        for obj in found.values():
+            obj.mark_clean()
+        return [found[id] for id in ids if id in found]
+
+    def _invalidate(self, id: str):
+        if self._caching():
+            self._cache.invalidate(self._collection, id)
 
-    def get(self, id: str) -> Optional[T]:
-        return self._db.get_document(self._collection, id, self._model_cls)
+    # --- Public API ---
 
-    def add(self, obj: T) -> Optional[str]:
+    async def get(self, id: str) -> Optional[T]:
+        self._track("get")
+        loader = current_loader()
+        if loader is None:
+            return await self._fetch(id)
+
+        async def fetch_one(ids: List[str]) -> List[T]:
+            obj = await self._fetch(ids[0])
+            return [obj] if obj else []
+
+        results = await loader.load(self._collection, [id], fetch_one)
+        return results[0] if results else None
+
+    async def get_many(self, ids: List[str]) -> List[T]:
+        if not ids:
+            return []
+        self._track("get_many")
+        loader = current_loader()
+        if loader is None:
+            return await self._fetch_many(ids)
+
+        return await loader.load(self._collection, ids, self._fetch_many)
+
+    async def add(self, obj: T) -> Optional[str]:
+        self._track("add")
         obj.id = uuid4().hex
         obj.created_at = datetime.now(timezone.utc)
         obj.updated_at = datetime.now(timezone.utc)
-        return self._db.add_document(self._collection, obj)
+        obj.prepare_write()
+        id = await self._db.add_document(self._collection, obj)
+        if id:
+            obj.mark_clean()
+            self._invalidate(id)
+        loader = current_loader()
+        if id and loader is not None:
+            loader.store(self._collection, id, obj)
+        return id
+
+    async def add_many(self, objs: List[T]) -> bool:
+        """
+        Adds many documents in batched writes. Documents keep any ID already assigned
+        (anything but "new"), so callers can link documents to each other before writing them.
+        """
+        self._track("add_many")
+        if not objs:
+            return True
+        now = datetime.now(timezone.utc)
+        for obj in objs:
+            if obj.id == "new":
+                obj.id = uuid4().hex
+            obj.created_at = now
+            obj.updated_at = now
+            obj.prepare_write()
+        success = await self._db.add_documents(self._collection, objs)
+        for obj in objs:
+            self._invalidate(obj.id)
+        return success
+
+    async def stream_many(self, ids: List[str], chunk_size: int = 100) -> AsyncIterator[T]:
+        """
+        Yields the documents for `ids` in order, reading `chunk_size` at a time.
+        Like stream(), documents bypass the request loader so only one chunk is held at once.
+        """
+        self._track("stream_many")
+        for start in range(0, len(ids), chunk_size):
+            for obj in await self._fetch_many(ids[start:start + chunk_size]):
+                yield obj
 
-    def update(self, obj: T) -> bool:
+    async def update(self, obj: T) -> bool:
+        """
+        Writes only the field paths changed since the document was loaded, or the whole
+        document when it was not loaded through this repo. Unchanged documents are not written.
+        """
+        self._track("update")
+        obj.prepare_write()
+        updates = obj.changed_fields()
+        if updates == {}:
+            return True
         obj.updated_at = datetime.now(timezone.utc)
-        return self._db.update_document(self._collection, obj.id, obj.model_dump(exclude_unset=True))
+        if updates is None:
+            updates = obj.model_dump(exclude_unset=True)
+        else:
+            updates["updated_at"] = obj.updated_at
+        success = await self._db.update_document(self._collection, obj.id, updates)
+        if success:
+            obj.mark_clean()
+        self._invalidate(obj.id)
+        loader = current_loader()
+        if loader is not None:
+            if success:
+                loader.store(self._collection, obj.id, obj)
+            else:
+                loader.forget(self._collection, obj.id)
+        if success:
+            await self._notify([obj.id])
+        return success
+
+    async def delete(self, id: str) -> bool:
+        self._track("delete")
+        success = await self._db.delete_document(self._collection, id)
+        self._invalidate(id)
+        loader = current_loader()
+        if loader is not None:
+            loader.forget(self._collection, id)
+        if success:
+            await self._notify([id])
+        return success
+
+    async def delete_many(self, ids: List[str]) -> bool:
+        if not ids:
+            return True
+        self._track("delete_many")
+        success = await self._db.delete_documents(self._collection, ids)
+        loader = current_loader()
+        for id in ids:
+            self._invalidate(id)
+            if loader is not None:
+                loader.forget(self._collection, id)
+        if success:
+            await self._notify(ids)
+        return success
+
+    async def array_remove(self, ids: List[str], field: str, values: List[Any]) -> bool:
+        """
+        Removes `values` from an array field on many documents without reading them.
+        """
+        if not ids:
+            return True
+        self._track("array_remove")
+        success = await self._db.array_remove(self._collection, ids, field, values)
+        loader = current_loader()
+        for id in ids:
+            self._invalidate(id)
+            if loader is not None:
+                loader.forget(self._collection, id)
+        if success:
+            await self._notify(ids)
+        return success
+
+    async def list(self, limit: Optional[int] = None) -> List[T]:
+        self._track("list")
+        self._track_round_trip("list")
+        return await self._db.list_documents(self._collection, self._model_cls, limit)
+
+    async def query(
+        self,
+        filters: List[tuple],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+        select: Optional[List[str]] = None,
+    ) -> List[T]:
+        """
+        With `select`, only the listed fields are read and the returned models are partially populated.
+        """
+        self._track("query")
+        results = await self._db.query_collection(self._collection, filters, self._model_cls, limit, order_by, start_after, select)
+        self._track_round_trip("query", [obj.id for obj in results] if not select or "id" in select else [])
+        return results
+
+    async def stream(self, filters: List[tuple], select: Optional[List[str]] = None) -> AsyncIterator[T]:
+        """
+        Yields every matching document in PAGE_ORDER as the backend reads it.
+        Streamed documents skip the request loader and the cache, so memory stays flat however many match.
+        """
+        self._track("stream")
+        self._track_round_trip("stream")
+        async for obj in self._db.stream_collection(self._collection, filters, self._model_cls, PAGE_ORDER, select):
+            yield obj
 
-    def delete(self, id: str) -> bool:
-        return self._db.delete_document(self._collection, id)
+    async def page(
+        self,
+        filters: List[tuple],
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        select: Optional[List[str]] = None,
+    ) -> Tuple[List[T], Optional[str]]:
+        """
+        Returns one page of matching documents in PAGE_ORDER and an opaque cursor for the next page.
+        Without a limit every match is returned and the cursor is None.
+        Raises ValueError for a malformed cursor.
+        """
+        if limit is None and cursor is None:
+            return await self.query(filters, select=select), None
 
-    def list(self, limit: Optional[int] = None) -> List[T]:
-        return self._db.list_documents(self._collection, self._model_cls, limit)
+        if select:
+            select = list(dict.fromkeys([*select, *PAGE_ORDER]))
+        start_after = decode_cursor(cursor, PAGE_ORDER_TYPES) if cursor else None
+        fetch = limit + 1 if limit else None
+        results = await self.query(filters, fetch, PAGE_ORDER, start_after, select)
+        if limit is None or len(results) <= limit:
+            return results, None
 
-    def query(self, filters: List[tuple], limit: Optional[int] = None) -> List[T]:
-        return self._db.query_collection(self._collection, filters, self._model_cls, limit)
+        results = results[:limit]
+        last = results[-1]
+        return results, encode_cursor([getattr(last, field) for field in PAGE_ORDER])
 
 
 from backend.models import (
     User, World, Campaign, Member, Context,
     Blueprint, Object, Era, Chapter, Encounter, Action,
-    MinigameResult, Objective
+    MinigameResult, Objective, Tombstone, WorldAddition, WorldView, WorldViewShard
 )
 
-users_repo = BaseRepo(User, "users")
-worlds_repo = BaseRepo(World, "worlds")
-campaigns_repo = BaseRepo(Campaign, "campaigns")
-members_repo = BaseRepo(Member, "members")
-context_repo = BaseRepo(Context, "context")
-blueprints_repo = BaseRepo(Blueprint, "blueprints")
-objects_repo = BaseRepo(Object, "objects")
+# Cache TTLs in seconds; collections without one always read through to Firestore
+users_repo = BaseRepo(User, "users", cache_ttl=60)
+worlds_repo = BaseRepo(World, "worlds", cache_ttl=30)
+campaigns_repo = BaseRepo(Campaign, "campaigns", cache_ttl=30)
+members_repo = BaseRepo(Member, "members", cache_ttl=30)
+context_repo = BaseRepo(Context, "context", cache_ttl=30)
+blueprints_repo = BaseRepo(Blueprint, "blueprints", cache_ttl=300)
+objects_repo = BaseRepo(Object, "objects", cache_ttl=60)
 objectives_repo = BaseRepo(Objective, "objectives")
 eras_repo = BaseRepo(Era, "eras")
 chapters_repo = BaseRepo(Chapter, "chapters")
 encounters_repo = BaseRepo(Encounter, "encounters")
 actions_repo = BaseRepo(Action, "actions")
 minigames_repo = BaseRepo(MinigameResult, "minigames")
+tombstones_repo = BaseRepo(Tombstone, "tombstones")
+world_additions_repo = BaseRepo(WorldAddition, "world_additions")
+world_views_repo = BaseRepo(WorldView, "world_views")
+world_view_shards_repo = BaseRepo(WorldViewShard, "world_view_shards")
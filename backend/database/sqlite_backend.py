@@ -0,0 +1,432 @@
+import re
+import json
+import asyncio
+import sqlite3
+import threading
+from typing import Optional, List, Dict, Any, Type, Tuple, AsyncIterator
+from datetime import datetime, timezone
+
+from pydantic_core import to_jsonable_python
+
+from backend.database.backend import LocalBackend, T, parse_projection, set_field
+
+# SQLite caps bound parameters per statement; keep batched reads well below it
+SQLITE_CHUNK_SIZE = 500
+
+# Rows fetched per round trip when streaming a query
+STREAM_CHUNK_SIZE = 200
+
+# Datetimes are stored and compared in this fixed-width UTC form, so string order is time order
+DATETIME_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+# Bumped when the stored JSON changes form; older files are rewritten on open (see _migrate)
+SCHEMA_VERSION = 1
+
+# Expression indexes over (collection, fields...) for the tombstone and world addition queries of delta syncs
+SQLITE_INDEXES = {
+    "documents_creator_created": ["creator_id", "created_at"],
+    "documents_world_created": ["world_id", "created_at"],
+}
+
+
+class SQLiteBackend(LocalBackend):
+    """
+    A single-file backend storing every document as JSON in one SQLite table.
+    Filters are translated to SQL over the JSON1 functions, so queries run
+    inside SQLite rather than by loading whole collections into Python.
+    """
+
+    def __init__(self, path: str):
+        super().__init__()
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS documents ("
+            "collection TEXT NOT NULL, id TEXT NOT NULL, data TEXT NOT NULL, "
+            "PRIMARY KEY (collection, id))"
+        )
+        for name, fields in SQLITE_INDEXES.items():
+            columns = ", ".join(f"json_extract(data, '$.{field}')" for field in fields)
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON documents (collection, {columns})")
+        self._conn.execute("DROP INDEX IF EXISTS documents_creator_updated")  # Used by delta syncs before they queried by ID
+        self._migrate()
+        self._conn.commit()
+
+    def _migrate(self):
+        """
+        Rewrites documents stored before datetimes had one fixed-width UTC form.
+        """
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version < 1:
+            rows = self._conn.execute("SELECT collection, id, data FROM documents").fetchall()
+            self._conn.executemany(
+                "UPDATE documents SET data = ? WHERE collection = ? AND id = ?",
+                [(json.dumps(_normalise_datetimes(json.loads(data))), collection, id) for collection, id, data in rows],
+            )
+        self._conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    async def _run_many(self, sql: str, rows: List[Tuple]):
+        """
+        Runs one statement for every row in a single transaction on a worker thread.
+        """
+        def execute():
+            with self._lock:
+                try:
+                    self._conn.executemany(sql, rows)
+                    self._conn.commit()
+                except Exception:
+                    self._conn.rollback()
+                    raise
+
+        await self._round_trip()
+        await asyncio.to_thread(execute)
+
+    async def _run(self, sql: str, params: Tuple = (), fetch: bool = True) -> List[tuple]:
+        """
+        Runs one statement on a worker thread, serialised on the shared connection.
+        """
+        def execute():
+            with self._lock:
+                cursor = self._conn.execute(sql, params)
+                rows = cursor.fetchall() if fetch else []
+                self._conn.commit()
+                return rows, cursor.rowcount
+
+        await self._round_trip()
+        rows, rowcount = await asyncio.to_thread(execute)
+        return rows if fetch else [(rowcount,)]
+
+    # ----------------
+    # CRUD Operations
+    # ----------------
+
+    async def add_document(self, collection: str, model: T) -> Optional[str]:
+        try:
+            model.created_at = datetime.now(timezone.utc)
+            data = _dump(model)
+            await self._run(
+                "INSERT INTO documents (collection, id, data) VALUES (?, ?, ?)",
+                (collection, model.id, data),
+                fetch=False,
+            )
+            self._logger.info(f"Added document to {collection}/{model.id}")
+            return model.id
+        except Exception as e:
+            self._logger.error(f"Error adding document to {collection}: {e}")
+            return None
+
+    async def get_document(self, collection: str, doc_id: str, model_class: Type[T]) -> Optional[T]:
+        try:
+            rows = await self._run(
+                "SELECT data FROM documents WHERE collection = ? AND id = ?",
+                (collection, doc_id),
+            )
+            if not rows:
+                self._logger.warning(f"Document not found: {collection}/{doc_id}")
+                return None
+            return model_class.model_validate_json(rows[0][0])
+        except Exception as e:
+            self._logger.error(f"Failed to get document {collection}/{doc_id}: {e}")
+            return None
+
+    async def get_documents(self, collection: str, doc_ids: List[str], model_class: Type[T]) -> List[T]:
+        unique_ids = list(dict.fromkeys(doc_ids))
+        found: Dict[str, T] = {}
+        try:
+            for start in range(0, len(unique_ids), SQLITE_CHUNK_SIZE):
+                chunk = unique_ids[start:start + SQLITE_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                rows = await self._run(
+                    f"SELECT id, data FROM documents WHERE collection = ? AND id IN ({placeholders})",
+                    (collection, *chunk),
+                )
+                for doc_id, data in rows:
+                    found[doc_id] = model_class.model_validate_json(data)
+            self._logger.info(f"Retrieved {len(found)} documents from {collection} in batch")
+        except Exception as e:
+            self._logger.error(f"Failed to get documents from {collection}: {e}")
+            return []
+        return [found[doc_id] for doc_id in doc_ids if doc_id in found]
+
+    async def update_document(self, collection: str, doc_id: str, updates: Dict[str, Any]) -> bool:
+        try:
+            updates.setdefault("updated_at", datetime.now(timezone.utc))
+            assignments = ", ".join("?, json(?)" for _ in updates)
+            params: List[Any] = []
+            for field, value in updates.items():
+                params.extend([f"$.{field}", json.dumps(_stored(value))])
+            result = await self._run(
+                f"UPDATE documents SET data = json_set(data, {assignments}) WHERE collection = ? AND id = ?",
+                (*params, collection, doc_id),
+                fetch=False,
+            )
+            if result[0][0] == 0:
+                raise KeyError(f"No document to update: {collection}/{doc_id}")
+            self._logger.info(f"Updated document in {collection}/{doc_id}: {list(updates.keys())}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Error updating document {collection}/{doc_id}: {e}")
+            return False
+
+    async def delete_document(self, collection: str, doc_id: str) -> bool:
+        try:
+            await self._run(
+                "DELETE FROM documents WHERE collection = ? AND id = ?",
+                (collection, doc_id),
+                fetch=False,
+            )
+            self._logger.info(f"Deleted document from {collection}/{doc_id}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Failed to delete document {collection}/{doc_id}: {e}")
+            return False
+
+    async def add_documents(self, collection: str, models: List[T]) -> bool:
+        try:
+            now = datetime.now(timezone.utc)
+            for model in models:
+                model.created_at = now
+            await self._run_many(
+                "INSERT INTO documents (collection, id, data) VALUES (?, ?, ?)",
+                [(collection, model.id, _dump(model)) for model in models],
+            )
+            self._logger.info(f"Added {len(models)} documents to {collection}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Error adding documents to {collection}: {e}")
+            return False
+
+    async def delete_documents(self, collection: str, doc_ids: List[str]) -> bool:
+        try:
+            for start in range(0, len(doc_ids), SQLITE_CHUNK_SIZE):
+                chunk = doc_ids[start:start + SQLITE_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                await self._run(
+                    f"DELETE FROM documents WHERE collection = ? AND id IN ({placeholders})",
+                    (collection, *chunk),
+                    fetch=False,
+                )
+            self._logger.info(f"Deleted {len(doc_ids)} documents from {collection}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Failed to delete documents from {collection}: {e}")
+            return False
+
+    async def array_remove(self, collection: str, doc_ids: List[str], field: str, values: List[Any]) -> bool:
+        try:
+            path = f"$.{field}"
+            now = json.dumps(_stored(datetime.now(timezone.utc)))
+            value_placeholders = ", ".join("?" for _ in values)
+            removed = [_sql_value(value) for value in values]
+            for start in range(0, len(doc_ids), SQLITE_CHUNK_SIZE):
+                chunk = doc_ids[start:start + SQLITE_CHUNK_SIZE]
+                placeholders = ", ".join("?" for _ in chunk)
+                await self._run(
+                    "UPDATE documents SET data = json_set(data, ?, "
+                    f"(SELECT json_group_array(json(json_quote(value))) FROM json_each(data, ?) WHERE value NOT IN ({value_placeholders})), "
+                    f"'$.updated_at', json(?)) WHERE collection = ? AND id IN ({placeholders})",
+                    (path, path, *removed, now, collection, *chunk),
+                    fetch=False,
+                )
+            self._logger.info(f"Removed {values} from {field} in {len(doc_ids)} documents of {collection}")
+            return True
+        except Exception as e:
+            self._logger.error(f"Failed to remove {values} from {collection}.{field}: {e}")
+            return False
+
+    async def list_documents(
+        self,
+        collection: str,
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+    ) -> List[T]:
+        return await self.query_collection(collection, [], model_class, limit, order_by, start_after)
+
+    async def query_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        limit: Optional[int] = None,
+        order_by: Optional[List[str]] = None,
+        start_after: Optional[List[Any]] = None,
+        select: Optional[List[str]] = None,
+    ) -> List[T]:
+        try:
+            sql, params = _query_to_sql(collection, filters, order_by, start_after, select)
+            if limit:
+                sql += f" LIMIT {int(limit)}"
+            rows = await self._run(sql, params)
+            results = [_parse_row(model_class, data, select) for (data,) in rows]
+            self._logger.info(f"Query on {collection} returned {len(results)} results.")
+            return results
+        except Exception as e:
+            self._logger.error(f"Error querying {collection} with {filters}: {e}")
+            return []
+
+    async def stream_collection(
+        self,
+        collection: str,
+        filters: List[tuple],
+        model_class: Type[T],
+        order_by: Optional[List[str]] = None,
+        select: Optional[List[str]] = None,
+    ) -> AsyncIterator[T]:
+        """
+        Yields query results STREAM_CHUNK_SIZE rows at a time, so the connection lock is never held across a yield.
+        """
+        count = 0
+        try:
+            sql, params = _query_to_sql(collection, filters, order_by, None, select)
+            while True:
+                rows = await self._run(f"{sql} LIMIT {STREAM_CHUNK_SIZE} OFFSET {count}", params)
+                for (data,) in rows:
+                    count += 1
+                    yield _parse_row(model_class, data, select)
+                if len(rows) < STREAM_CHUNK_SIZE:
+                    break
+            self._logger.info(f"Streamed {count} results from {collection}.")
+        except Exception as e:
+            self._logger.error(f"Error streaming {collection} with {filters} after {count} results: {e}")
+
+
+# ----------------
+# Stored Form
+# ----------------
+
+_ISO_DATETIME = re.compile(r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(\.\d+)?(Z|[+-]\d{2}:\d{2})")
+
+
+def _format_datetime(value: datetime) -> str:
+    """
+    Formats a datetime in DATETIME_FORMAT; naive datetimes are taken as UTC.
+    """
+    value = value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+    return value.strftime(DATETIME_FORMAT)
+
+
+def _stored(value: Any) -> Any:
+    """
+    Converts a value to the JSON data it is stored as, with datetimes in DATETIME_FORMAT.
+    """
+    if isinstance(value, datetime):
+        return _format_datetime(value)
+    if isinstance(value, dict):
+        return {key: _stored(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_stored(item) for item in value]
+    return to_jsonable_python(value)
+
+
+def _dump(model: T) -> str:
+    return json.dumps(_stored(model.model_dump()))
+
+
+def _normalise_datetimes(value: Any) -> Any:
+    """
+    Rewrites ISO datetime strings in loaded JSON into DATETIME_FORMAT, for _migrate.
+    """
+    if isinstance(value, str) and _ISO_DATETIME.fullmatch(value):
+        return _format_datetime(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    if isinstance(value, dict):
+        return {key: _normalise_datetimes(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_normalise_datetimes(item) for item in value]
+    return value
+
+
+# ----------------
+# Filter Translation
+# ----------------
+
+_COMPARISONS = {"==": "=", "!=": "!=", "<": "<", "<=": "<=", ">": ">", ">=": ">="}
+
+
+def _sql_value(value: Any) -> Any:
+    """
+    Converts a filter value to the form it has in the stored JSON.
+    """
+    value = _stored(value)
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+
+def _filters_to_sql(filters: List[tuple]) -> Tuple[str, List[Any]]:
+    clauses = []
+    params: List[Any] = []
+    for field, op, value in filters:
+        path = f"$.{field}"
+        # Comparisons name the path inline, as the expression indexes do, so SQLite can use them;
+        # IDs use the key column instead
+        column = "id" if field == "id" else f"json_extract(data, '{path}')"
+        if op == "==" and value is None:
+            clauses.append("json_type(data, ?) = 'null'")
+            params.append(path)
+        elif op in _COMPARISONS:
+            clauses.append(f"{column} {_COMPARISONS[op]} ?")
+            params.append(_sql_value(value))
+        elif op == "array-contains":
+            clauses.append("EXISTS (SELECT 1 FROM json_each(data, ?) WHERE value = ?)")
+            params.extend([path, _sql_value(value)])
+        elif op == "array-contains-any":
+            placeholders = ", ".join("?" for _ in value)
+            clauses.append(f"EXISTS (SELECT 1 FROM json_each(data, ?) WHERE value IN ({placeholders}))")
+            params.extend([path, *(_sql_value(v) for v in value)])
+        elif op in ("in", "not-in"):
+            placeholders = ", ".join("?" for _ in value)
+            negate = "NOT " if op == "not-in" else ""
+            clauses.append(f"{column} {negate}IN ({placeholders})")
+            params.extend(_sql_value(v) for v in value)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    where = "".join(f" AND {clause}" for clause in clauses)
+    return where, params
+
+
+def _query_to_sql(
+    collection: str,
+    filters: List[tuple],
+    order_by: Optional[List[str]],
+    start_after: Optional[List[Any]],
+    select: Optional[List[str]],
+) -> Tuple[str, Tuple]:
+    """
+    Builds the SELECT for a query, without a LIMIT.
+    """
+    where, params = _filters_to_sql(filters)
+    order = "rowid"
+    if order_by:
+        columns = [f"json_extract(data, '$.{field}')" for field in order_by]
+        where += "".join(f" AND {column} IS NOT NULL" for column in columns)
+        if start_after:
+            placeholders = ", ".join("?" for _ in start_after)
+            where += f" AND ({', '.join(columns)}) > ({placeholders})"
+            params.extend(_sql_value(value) for value in start_after)
+        order = ", ".join(columns)
+    columns_sql = "data"
+    if select:
+        pairs = ", ".join(f"'{field}', json_extract(data, '$.{field}')" for field in select)
+        columns_sql = f"json_object({pairs})"
+    sql = f"SELECT {columns_sql} FROM documents WHERE collection = ?{where} ORDER BY {order}"
+    return sql, (collection, *params)
+
+
+def _parse_row(model_class: Type[T], data: str, select: Optional[List[str]]) -> T:
+    if select:
+        return parse_projection(model_class, _unflatten(json.loads(data)))
+    return model_class.model_validate_json(data)
+
+
+def _unflatten(projected: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Turns dotted projection keys back into nested maps.
+    """
+    data: Dict[str, Any] = {}
+    for field, value in projected.items():
+        set_field(data, field, value)
+    return data
@@ -1,9 +1,41 @@
-from fastapi import FastAPI
-from backend.routes import account_routes, auth_routes, library_routes
+from backend.startup import startup_report
+
+import os
+import asyncio
+from contextlib import asynccontextmanager
 
+from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+startup_report.mark("framework")
+
+from backend.database.repos import database_backend
+startup_report.mark("models and storage")
+
+from backend.routes import account_routes, auth_routes, library_routes, metrics_routes, profile_routes
+from backend.middleware import RequestLoaderMiddleware, MetricsMiddleware, ReadBudgetMiddleware, ProfilerMiddleware
+from backend.metrics import METRICS_ENABLED
+from backend.profiling import PROFILING_ENABLED
+from backend.routes._views import WORLD_VIEWS_ENABLED, install_world_views
+startup_report.mark("routes and schemas")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm the database connection in the background so it never delays readiness
+    warm_up = None
+    if os.environ.get("DATABASE_WARM_UP", "1") != "0":
+        warm_up = asyncio.create_task(database_backend.warm_up())
 
-app = FastAPI()
+    startup_report.mark("ready")
+    startup_report.log()
+    yield
+
+    if warm_up is not None and not warm_up.done():
+        warm_up.cancel()
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.add_middleware(
     CORSMiddleware,
@@ -11,8 +43,29 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Repo-Calls", "X-Storage-Reads", "X-Repeated-Reads", "X-Read-Budget-Exceeded", "X-Profile-Id", "ETag"],
 )
 
+# Added first so it runs inside RequestLoaderMiddleware and can read the request's loader
+if METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
+app.add_middleware(RequestLoaderMiddleware)
+app.add_middleware(ReadBudgetMiddleware)
+
+# Outermost, so a profile covers every other middleware as well as the route
+if PROFILING_ENABLED:
+    app.add_middleware(ProfilerMiddleware)
+
+# Keeps materialised world views current on every repository write
+if WORLD_VIEWS_ENABLED:
+    install_world_views()
+
 app.include_router(auth_routes.router)
 app.include_router(account_routes.router)
-app.include_router(library_routes.router)
\ No newline at end of file
+app.include_router(library_routes.router)
+if METRICS_ENABLED:
+    app.include_router(metrics_routes.router)
+if PROFILING_ENABLED:
+    app.include_router(profile_routes.router)
+startup_report.mark("app")
@@ -0,0 +1,204 @@
+import os
+import bisect
+import threading
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from starlette.routing import Match
+
+# Collecting metrics is on unless METRICS_ENABLED=0
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "1") != "0"
+
+DB_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """
+    A labelled Prometheus histogram. Buckets are cumulative only when rendered,
+    so observe() is a single bisect and increment under the lock.
+    """
+
+    def __init__(self, name: str, help: str, labels: Sequence[str], buckets: Sequence[float]):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Sequence[str], value: float):
+        key = tuple(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # One counter per bucket, then +Inf, then the running sum
+                series = self._series[key] = [0.0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                le = f'le="{bound}"'
+                lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {int(cumulative)}")
+            cumulative += series[len(self.buckets)]
+            le = 'le="+Inf"'
+            lines.append(f"{self.name}_bucket{_labels(self.labels, key, le)} {int(cumulative)}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, key)} {series[-1]}")
+            lines.append(f"{self.name}_count{_labels(self.labels, key)} {int(cumulative)}")
+        return lines
+
+
+class Counter:
+    """
+    A labelled monotonically increasing counter.
+    """
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Sequence[str] = (), amount: float = 1):
+        key = tuple(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            snapshot = dict(self._values)
+        for key, value in sorted(snapshot.items()):
+            lines.append(f"{self.name}{_labels(self.labels, key)} {value}")
+        return lines
+
+
+class Sampled:
+    """
+    A counter or gauge read from another object at scrape time, such as the document cache's hit count.
+    """
+
+    def __init__(self, name: str, help: str, kind: str, read: Callable[[], float]):
+        self.name = name
+        self.help = help
+        self.kind = kind
+        self._read = read
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", f"{self.name} {self._read()}"]
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """
+        Returns every metric in the Prometheus text exposition format.
+        """
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+db_operation_seconds = registry.register(Histogram(
+    "legends_db_operation_seconds",
+    "Storage backend call latency by collection, operation and route.",
+    ("collection", "operation", "route"),
+    DB_BUCKETS,
+))
+
+http_request_seconds = registry.register(Histogram(
+    "legends_http_request_seconds",
+    "HTTP request latency by method, route template and status.",
+    ("method", "route", "status"),
+    HTTP_BUCKETS,
+))
+
+loader_hits_total = registry.register(Counter(
+    "legends_request_loader_hits_total",
+    "Repository reads answered by the request-scoped loader.",
+))
+
+loader_misses_total = registry.register(Counter(
+    "legends_request_loader_misses_total",
+    "Repository reads the request-scoped loader had to fetch.",
+))
+
+
+def register_cache(cache):
+    """
+    Exposes a DocumentCache's counters, read when /metrics is scraped.
+    """
+    registry.register(Sampled("legends_document_cache_hits_total", "Process cache hits.", "counter", lambda: cache.stats()["hits"]))
+    registry.register(Sampled("legends_document_cache_misses_total", "Process cache misses.", "counter", lambda: cache.stats()["misses"]))
+    registry.register(Sampled("legends_document_cache_evictions_total", "Process cache LRU evictions.", "counter", lambda: cache.stats()["evictions"]))
+    registry.register(Sampled("legends_document_cache_entries", "Documents currently held by the process cache.", "gauge", lambda: cache.stats()["size"]))
+
+
+# === Route labels ===
+_current_scope: ContextVar[Optional[dict]] = ContextVar("metrics_scope", default=None)
+
+
+def route_template(scope: dict) -> str:
+    """
+    Returns the path template of the route handling a request, such as "/world/{id}",
+    so metric labels stay bounded however many IDs are requested.
+    """
+    template = scope.get("legends.route")
+    if template is not None:
+        return template
+
+    route = scope.get("route")  # Set by the router once it has matched
+    if route is not None and hasattr(route, "path"):
+        template = route.path
+    else:
+        # Older routers do not record the route; match against the flat route list instead
+        template = "unmatched"
+        for candidate in scope["app"].router.routes:
+            if hasattr(candidate, "path") and candidate.matches(scope)[0] == Match.FULL:
+                template = candidate.path
+                break
+        if template == "unmatched" and "endpoint" not in scope:
+            return template  # Not routed yet; try again later
+    scope["legends.route"] = template
+    return template
+
+def current_route() -> str:
+    """
+    Returns the route template of the request being handled, or "none" outside a request.
+    """
+    scope = _current_scope.get()
+    return route_template(scope) if scope is not None else "none"
+
+def track_request(scope: dict):
+    return _current_scope.set(scope)
+
+def untrack_request(token):
+    _current_scope.reset(token)
@@ -0,0 +1,189 @@
+import time
+import hmac
+import asyncio
+import logging
+from datetime import datetime, timezone
+from http.cookies import SimpleCookie
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+
+from backend.database.loader import begin_request, end_request, current_loader
+from backend.database.read_budget import begin_reads, end_reads, RequestReads
+from backend.metrics import http_request_seconds, loader_hits_total, loader_misses_total, route_template, track_request, untrack_request
+from backend import profiling
+
+
+class RequestLoaderMiddleware:
+    """
+    ASGI middleware that gives every HTTP request its own RequestLoader,
+    so repository reads are de-duplicated for the lifetime of the request.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        token = begin_request()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            end_request(token)
+
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware that labels storage calls with the route being served and records
+    request latency and request-loader counters. Must run inside RequestLoaderMiddleware.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        token = track_request(scope)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_request_seconds.observe((scope["method"], route_template(scope), str(status)), time.perf_counter() - started)
+            loader = current_loader()
+            if loader is not None:
+                loader_hits_total.inc(amount=loader.hits)
+                loader_misses_total.inc(amount=loader.misses)
+            untrack_request(token)
+
+
+class ReadBudgetMiddleware:
+    """
+    ASGI middleware that counts storage round trips per request to catch N+1 fan-out.
+    Every response carries X-Storage-Reads, X-Repeated-Reads and, for information, X-Repo-Calls
+    (every repository call, including those the request loader answered). Requests over READ_BUDGET
+    round trips, or that read a document from storage more than once, are logged with their worst offenders.
+    With READ_BUDGET_STRICT the round trip that crosses the budget raises ReadBudgetExceeded instead.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        reads = RequestReads()
+
+        async def send_with_headers(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers["X-Repo-Calls"] = str(reads.calls)
+                headers["X-Storage-Reads"] = str(reads.round_trips)
+                headers["X-Repeated-Reads"] = str(len(reads.repeated()))
+                if reads.exceeded:
+                    headers["X-Read-Budget-Exceeded"] = str(reads.budget)
+            await send(message)
+
+        token = begin_reads(reads)
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            end_reads(token)
+            if reads.exceeded or reads.repeated():
+                route = f"{scope['method']} {route_template(scope)}"
+                logger.warning(f"{route} made {reads.round_trips} storage round trips in {reads.calls} repository calls (budget {reads.budget}); {reads.summary()}")
+
+
+class ProfilerMiddleware:
+    """
+    ASGI middleware that profiles single requests on demand. A request is profiled when it sends
+    X-Profile-Token: <PROFILING_TOKEN> with X-Profile: cprofile|sample, or when its path matches a prefix
+    armed through POST /profiles/arm. The response carries X-Profile-Id, and the artifact, tagged with
+    route and user, is served from /profiles/{id}. Only installed when PROFILING_TOKEN is set.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def _requested_mode(self, scope) -> Optional[str]:
+        headers = dict(scope["headers"])
+        mode = headers.get(b"x-profile")
+        if mode is not None:
+            token = headers.get(b"x-profile-token", b"").decode("latin-1")
+            if not hmac.compare_digest(token, profiling.PROFILING_TOKEN):
+                return None
+            mode = mode.decode("latin-1")
+            return mode if mode in profiling.PROFILE_MODES else "sample"
+        return profiling.take_armed(scope["path"])
+
+    def _user_id(self, scope) -> Optional[str]:
+        from backend.routes.auth_routes import decode_token
+
+        cookie = SimpleCookie(dict(scope["headers"]).get(b"cookie", b"").decode("latin-1"))
+        if "access_token" not in cookie:
+            return None
+        try:
+            payload = decode_token(cookie["access_token"].value)
+        except Exception:
+            return None
+        return payload.get("sub") if payload else None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        mode = self._requested_mode(scope)
+        if mode is None or not profiling.try_begin():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = profiling.profile_store.new_id()
+        status = 500
+
+        async def send_with_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                MutableHeaders(scope=message)["X-Profile-Id"] = profile_id
+            await send(message)
+
+        profiler = profiling.create_profiler(mode)
+        started = time.perf_counter()
+        profiler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            data = profiler.stop()
+            duration = time.perf_counter() - started
+            profiling.end()
+            info = {
+                "mode": mode,
+                "method": scope["method"],
+                "path": scope["path"],
+                "route": route_template(scope),
+                "user_id": self._user_id(scope),
+                "status": status,
+                "duration_ms": round(duration * 1000, 2),
+                "created_at": datetime.now(timezone.utc).isoformat(),
+            }
+            await asyncio.to_thread(profiling.profile_store.save, profile_id, data, info)
+            logger.info(f"Profiled {info['method']} {info['route']} in {info['duration_ms']} ms as {profile_id}")
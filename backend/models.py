@@ -1,13 +1,69 @@
-from pydantic import BaseModel, Field, EmailStr
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, EmailStr, PrivateAttr
+from typing import List, Optional, Dict, Any, TYPE_CHECKING
 from datetime import datetime, timezone
 from uuid import uuid4
 
+if TYPE_CHECKING:
+    from backend.database.hierarchy import Hierarchy
+
 # === Base ===
 class BaseDocument(BaseModel):
     id: str = "new"
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     updated_at: Optional[datetime] = None
+    _snapshot: Optional[Dict[str, Any]] = PrivateAttr(default=None)
+
+    def prepare_write(self):
+        """
+        Refreshes denormalised fields before the document is written.
+        """
+        pass
+
+    def mark_clean(self):
+        """
+        Records the current state as the stored one; changed_fields() diffs against it.
+        """
+        self._snapshot = self.model_dump()
+
+    def changed_fields(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns {field path: value} for everything that differs from the stored state,
+        or None if the stored state is unknown and the whole document must be written.
+        """
+        if self._snapshot is None:
+            return None
+        changes: Dict[str, Any] = {}
+        _diff(self._snapshot, self.model_dump(), "", changes)
+        return changes
+
+    def apply_changes(self, updates: Dict[str, Any]):
+        """
+        Assigns payload values onto the document, skipping unknown fields and unchanged values.
+        """
+        for field, value in updates.items():
+            if field in type(self).model_fields and getattr(self, field) != value:
+                setattr(self, field, value)
+        return self
+
+
+def _diff(before: Dict[str, Any], after: Dict[str, Any], prefix: str, changes: Dict[str, Any]):
+    """
+    Collects changed field paths. Nested maps are diffed key by key when their keys are plain
+    identifiers and none were removed; lists and everything else are replaced whole.
+    """
+    for key, value in after.items():
+        path = f"{prefix}{key}"
+        old = before.get(key)
+        if key in before and old == value:
+            continue
+        if (
+            isinstance(old, dict) and isinstance(value, dict)
+            and old.keys() <= value.keys()
+            and all(isinstance(k, str) and k.isidentifier() for k in value)
+        ):
+            _diff(old, value, f"{path}.", changes)
+        else:
+            changes[path] = value
 
 
 # === Users & Core Entities ===
@@ -28,44 +84,29 @@ class World(BaseDocument):
     object_ids: List[str] = Field(default_factory=list)
     settings: WorldSetting
 
-    def get_creator(self) -> 'User': 
+    async def get_creator(self) -> 'User': 
         from backend.database.repos import users_repo
         
-        creator = users_repo.get(self.creator_id)
+        creator = await users_repo.get(self.creator_id)
         if creator:
             return creator
         else:
             raise ValueError("Creator not found")
 
-    def get_context(self) -> List['Context']:
+    async def get_context(self) -> List['Context']:
         from backend.database.repos import context_repo
         
-        results = []
-        for cid in self.context_ids:
-            context = context_repo.get(cid)
-            if context:
-                results.append(context)
-        return results
+        return await context_repo.get_many(self.context_ids)
     
-    def get_blueprints(self) -> List['Blueprint']:
+    async def get_blueprints(self) -> List['Blueprint']:
         from backend.database.repos import blueprints_repo
         
-        results = []
-        for bid in self.blueprint_ids:
-            blueprint = blueprints_repo.get(bid)
-            if blueprint:
-                results.append(blueprint)
-        return results
+        return await blueprints_repo.get_many(self.blueprint_ids)
     
-    def get_objects(self) -> List['Object']:
+    async def get_objects(self) -> List['Object']:
         from backend.database.repos import objects_repo
         
-        results = []
-        for oid in self.object_ids:
-            obj = objects_repo.get(oid)
-            if obj:
-                results.append(obj)
-        return results
+        return await objects_repo.get_many(self.object_ids)
 
 
 class Campaign(BaseDocument):
@@ -80,69 +121,52 @@ class Campaign(BaseDocument):
     member_ids: List[str] = Field(default_factory=list)
     era_ids: List[str] = Field(default_factory=list)
 
-    def get_creator(self) -> 'User':
+    async def get_creator(self) -> 'User':
         from backend.database.repos import users_repo
         
-        creator = users_repo.get(self.creator_id)
+        creator = await users_repo.get(self.creator_id)
         if creator:
             return creator
         else:
             raise ValueError("Creator not found")
 
-    def get_world(self) -> Optional['World']:
+    async def get_world(self) -> Optional['World']:
         from backend.database.repos import worlds_repo
         
-        return worlds_repo.get(self.world_id) if self.world_id else None
+        return await worlds_repo.get(self.world_id) if self.world_id else None
 
-    def get_context(self) -> List['Context']:
+    async def get_context(self) -> List['Context']:
         from backend.database.repos import context_repo
         
-        results = []
-        for cid in self.context_ids:
-            context = context_repo.get(cid)
-            if context:
-                results.append(context)
-        return results
+        return await context_repo.get_many(self.context_ids)
     
-    def get_blueprints(self) -> List['Blueprint']:
+    async def get_blueprints(self) -> List['Blueprint']:
         from backend.database.repos import blueprints_repo
         
-        results = []
-        for bid in self.blueprint_ids:
-            blueprint = blueprints_repo.get(bid)
-            if blueprint:
-                results.append(blueprint)
-        return results
+        return await blueprints_repo.get_many(self.blueprint_ids)
     
-    def get_objects(self) -> List['Object']:
+    async def get_objects(self) -> List['Object']:
         from backend.database.repos import objects_repo
         
-        results = []
-        for oid in self.object_ids:
-            obj = objects_repo.get(oid)
-            if obj:
-                results.append(obj)
-        return results
+        return await objects_repo.get_many(self.object_ids)
 
-    def get_members(self) -> List['Member']:
+    async def get_members(self) -> List['Member']:
         from backend.database.repos import members_repo
         
-        results = []
-        for mid in self.member_ids:
-            member = members_repo.get(mid)
-            if member:
-                results.append(member)
-        return results
+        return await members_repo.get_many(self.member_ids)
 
-    def get_eras(self) -> List['Era']:
+    async def get_eras(self) -> List['Era']:
         from backend.database.repos import eras_repo
         
-        results = []
-        for eid in self.era_ids:
-            era = eras_repo.get(eid)
-            if era:
-                results.append(era)
-        return results
+        return await eras_repo.get_many(self.era_ids)
+
+    async def get_timeline(self, depth: Optional[int] = None, recent: Optional[Dict[str, int]] = None) -> 'Hierarchy':
+        """
+        Loads the eras, chapters, encounters and actions of the campaign, one batched read per level.
+        """
+        from backend.database.hierarchy import load_hierarchy
+
+        return await load_hierarchy([self], depth, recent)
 
 
 # === Game Structure ===
@@ -153,28 +177,29 @@ class Member(BaseDocument):
     status: str = "active"
     sleeve_id: Optional[str] = None  # links to a GameObject like a character
 
-    def get_user(self) -> Optional['User']:
+    async def get_user(self) -> Optional['User']:
         from backend.database.repos import users_repo
         
-        return users_repo.get(self.user_id) if self.user_id else None
+        return await users_repo.get(self.user_id) if self.user_id else None
 
-    def get_campaign(self) -> 'Campaign':
+    async def get_campaign(self) -> 'Campaign':
         from backend.database.repos import campaigns_repo
         
-        campaign = campaigns_repo.get(self.campaign_id)
+        campaign = await campaigns_repo.get(self.campaign_id)
         if campaign:
             return campaign
         else:
             raise ValueError("Campaign not found")
 
-    def get_sleeve(self) -> Optional['Object']:
+    async def get_sleeve(self) -> Optional['Object']:
         from backend.database.repos import objects_repo
         
-        return objects_repo.get(self.sleeve_id) if self.sleeve_id else None
+        return await objects_repo.get(self.sleeve_id) if self.sleeve_id else None
 
 class Context(BaseDocument):
     name: str
     content: str
+    creator_id: Optional[str] = None  # None for contexts saved before contexts recorded an owner
 
 # === Blueprint System ===
 class CustomField(BaseModel):
@@ -184,11 +209,11 @@ class CustomField(BaseModel):
     options: Optional[List[str]] = None
     linked_behavior: Optional[str] = None
 
-    def get(self) -> Any:
+    async def get(self) -> Any:
         if self.type == "blueprint":
             from backend.database.repos import blueprints_repo
             
-            return blueprints_repo.get(self.value)
+            return await blueprints_repo.get(self.value)
         elif self.type == "dropdown" and self.options:
             index = int(self.value)
             return self.options[index] if 0 <= index < len(self.options) else None
@@ -202,11 +227,15 @@ class Blueprint(BaseDocument):
     is_public: bool = False
     is_developer: bool = False
     fields: List[CustomField] # fields with default values
+    field_count: Optional[int] = None # denormalised len(fields) for summaries; None until first save
 
-    def get_creator(self) -> 'User':
+    def prepare_write(self):
+        self.field_count = len(self.fields)
+
+    async def get_creator(self) -> 'User':
         from backend.database.repos import users_repo
         
-        creator = users_repo.get(self.creator_id)
+        creator = await users_repo.get(self.creator_id)
         if creator:
             return creator
         else:
@@ -219,19 +248,19 @@ class Object(BaseDocument):
     blueprint_id: str
     fields: List[CustomField] # fields with instance values
 
-    def get_creator(self) -> 'User':
+    async def get_creator(self) -> 'User':
         from backend.database.repos import users_repo
         
-        creator = users_repo.get(self.creator_id)
+        creator = await users_repo.get(self.creator_id)
         if creator:
             return creator
         else:
             raise ValueError("Creator not found")
 
-    def get_blueprint(self) -> 'Blueprint':
+    async def get_blueprint(self) -> 'Blueprint':
         from backend.database.repos import blueprints_repo
         
-        blueprint = blueprints_repo.get(self.blueprint_id)
+        blueprint = await blueprints_repo.get(self.blueprint_id)
         if blueprint:
             return blueprint
         else:
@@ -244,22 +273,54 @@ class Objective(BaseDocument):
     progress: int
     children_ids: List[str] = Field(default_factory=list)
     parent_id: Optional[str] = None
+    root_id: Optional[str] = None  # The tree's root objective; None on children saved before trees were recorded
+
+    def prepare_write(self):
+        if self.parent_id is None:
+            self.root_id = self.id
+
+    def add_child(self, child: 'Objective'):
+        """
+        Links `child` under this objective, in the same tree. Both documents still need saving.
+        """
+        child.parent_id = self.id
+        child.root_id = self.root_id or self.id
+        self.children_ids.append(child.id)
 
-    def get_children(self) -> List['Objective']:
+    async def get_children(self) -> List['Objective']:
         from backend.database.repos import objectives_repo
         
-        result = []
-        for child_id in self.children_ids:
-            child = objectives_repo.get(child_id)
-            if child:
-                result.append(child)
-        return result
+        return await objectives_repo.get_many(self.children_ids)
+
+    async def get_tree(self) -> Dict[str, 'Objective']:
+        """
+        Returns the objectives of this objective's tree by ID, this one included, read with one query on root_id.
+        Descendants saved without a root_id are read level by level, one batch per level.
+        """
+        from backend.database.repos import objectives_repo
+
+        tree: Dict[str, Objective] = {}
+        root_id = self.root_id or (self.id if self.parent_id is None else None)
+        if root_id:
+            tree = {objective.id: objective for objective in await objectives_repo.query([("root_id", "==", root_id)])}
+        tree[self.id] = self
+
+        seen = {self.id}
+        level = [self]
+        while level:
+            child_ids = [id for id in dict.fromkeys(id for objective in level for id in objective.children_ids) if id not in seen]
+            seen.update(child_ids)
+            missing = [id for id in child_ids if id not in tree]
+            if missing:
+                tree.update((objective.id, objective) for objective in await objectives_repo.get_many(missing))
+            level = [tree[id] for id in child_ids if id in tree]
+        return tree
     
-    def get_parent(self) -> Optional['Objective']:
+    async def get_parent(self) -> Optional['Objective']:
         from backend.database.repos import objectives_repo
         
         if self.parent_id:
-            return objectives_repo.get(self.parent_id)
+            return await objectives_repo.get(self.parent_id)
 
 class Era(BaseDocument):
     campaign_id: str
@@ -268,59 +329,47 @@ class Era(BaseDocument):
     objective_id: str
     chapter_ids: List[str] = Field(default_factory=list)
     
-    def get_campaign(self) -> 'Campaign':
+    async def get_campaign(self) -> 'Campaign':
         from backend.database.repos import campaigns_repo
         
-        campaign = campaigns_repo.get(self.campaign_id)
+        campaign = await campaigns_repo.get(self.campaign_id)
         if campaign:
             return campaign
         else:
             raise ValueError("Campaign not found")
 
-    def get_objective(self) -> 'Objective':
+    async def get_objective(self) -> 'Objective':
         from backend.database.repos import objectives_repo
         
-        objective = objectives_repo.get(self.objective_id)
+        objective = await objectives_repo.get(self.objective_id)
         if objective:
             return objective
         else:
             raise ValueError("Objective not found")
 
-    def get_chapters(self) -> List['Chapter']:
-        result = []
-        for chapter_id in self.chapter_ids:
-            from backend.database.repos import chapters_repo
-            
-            chapter = chapters_repo.get(chapter_id)
-            if chapter:
-                result.append(chapter)
-        return result
-
-    def get_encounters(self) -> List['Encounter']:
-        result = []
-        chapters = self.get_chapters()
-        for chapter in chapters:
-            encounters = chapter.get_encounters()
-            result.extend(encounters)
-        return result
+    async def get_chapters(self) -> List['Chapter']:
+        from backend.database.repos import chapters_repo
+        
+        return await chapters_repo.get_many(self.chapter_ids)
+
+    async def get_encounters(self) -> List['Encounter']:
+        return (await self.get_timeline(depth=2)).level("encounters")
     
-    def get_actions(self) -> List['Action']:
-        result = []
-        encounters = self.get_encounters()
-        for encounter in encounters:
-            actions = encounter.get_actions()
-            result.extend(actions)
-        return result
+    async def get_actions(self) -> List['Action']:
+        return (await self.get_timeline()).level("actions")
     
-    def get_recent_chapters(self, limit: int = 2) -> List['Chapter']:
+    async def get_recent_chapters(self, limit: int = 2) -> List['Chapter']:
         from backend.database.repos import chapters_repo
         
-        result = []
-        for chapter_id in self.chapter_ids[-limit:]:
-            chapter = chapters_repo.get(chapter_id)
-            if chapter:
-                result.append(chapter)
-        return result
+        return await chapters_repo.get_many(self.chapter_ids[-limit:])
+
+    async def get_timeline(self, depth: Optional[int] = None, recent: Optional[Dict[str, int]] = None) -> 'Hierarchy':
+        """
+        Loads the era's chapters, encounters and actions, one batched read per level.
+        """
+        from backend.database.hierarchy import load_hierarchy
+
+        return await load_hierarchy([self], depth, recent)
 
 class Chapter(BaseDocument):
     era_id: str
@@ -329,51 +378,38 @@ class Chapter(BaseDocument):
     objective_id: str
     encounter_ids: List[str] = Field(default_factory=list)
     
-    def get_era(self) -> 'Era':
+    async def get_era(self) -> 'Era':
         from backend.database.repos import eras_repo
         
-        era = eras_repo.get(self.era_id)
+        era = await eras_repo.get(self.era_id)
         if era:
             return era
         else:
             raise ValueError("Era not found")
 
-    def get_objective(self) -> 'Objective':
+    async def get_objective(self) -> 'Objective':
         from backend.database.repos import objectives_repo
         
-        objective = objectives_repo.get(self.objective_id)
+        objective = await objectives_repo.get(self.objective_id)
         if objective:
             return objective
         else:
             raise ValueError("Objective not found")
 
-    def get_encounters(self) -> List['Encounter']:
-        result = []
-        for encounter_id in self.encounter_ids:
-            from backend.database.repos import encounters_repo
-            
-            encounter = encounters_repo.get(encounter_id)
-            if encounter:
-                result.append(encounter)
-        return result
+    async def get_encounters(self) -> List['Encounter']:
+        from backend.database.repos import encounters_repo
+        
+        return await encounters_repo.get_many(self.encounter_ids)
     
-    def get_actions(self) -> List['Action']:
-        result = []
-        encounters = self.get_encounters()
-        for encounter in encounters:
-            actions = encounter.get_actions()
-            result.extend(actions)
-        return result
-
-    def get_recent_encounters(self, limit: int = 2) -> List['Encounter']:
+    async def get_actions(self) -> List['Action']:
+        from backend.database.hierarchy import load_hierarchy
+
+        return (await load_hierarchy([self])).level("actions")
+
+    async def get_recent_encounters(self, limit: int = 2) -> List['Encounter']:
         from backend.database.repos import encounters_repo
         
-        result = []
-        for encounter_id in self.encounter_ids[-limit:]:
-            encounter = encounters_repo.get(encounter_id)
-            if encounter:
-                result.append(encounter)
-        return result
+        return await encounters_repo.get_many(self.encounter_ids[-limit:])
 
 
 class Encounter(BaseDocument):
@@ -382,24 +418,19 @@ class Encounter(BaseDocument):
     description: Optional[str]
     action_ids: List[str] = Field(default_factory=list)
     
-    def get_chapter(self) -> 'Chapter':
+    async def get_chapter(self) -> 'Chapter':
         from backend.database.repos import chapters_repo
         
-        chapter = chapters_repo.get(self.chapter_id)
+        chapter = await chapters_repo.get(self.chapter_id)
         if chapter:
             return chapter
         else:
             raise ValueError("Chapter not found")
 
-    def get_actions(self) -> List['Action']:
+    async def get_actions(self) -> List['Action']:
         from backend.database.repos import actions_repo
         
-        result = []
-        for action_id in self.action_ids:
-            action = actions_repo.get(action_id)
-            if action:
-                result.append(action)
-        return result
+        return await actions_repo.get_many(self.action_ids)
 
 # === Gameplay & Events ===
 
@@ -412,33 +443,33 @@ class Action(BaseDocument):
     dm_response: Optional[str]
     minigame_id: Optional[str]
 
-    def get_encounter(self) -> 'Encounter':
+    async def get_encounter(self) -> 'Encounter':
         from backend.database.repos import encounters_repo
         
-        encounter = encounters_repo.get(self.encounter_id)
+        encounter = await encounters_repo.get(self.encounter_id)
         if encounter:
             return encounter
         else:
             raise ValueError("Encounter not found")
 
-    def get_owner(self) -> 'Member':
+    async def get_owner(self) -> 'Member':
         from backend.database.repos import members_repo
         
-        owner = members_repo.get(self.owner_member_id)
+        owner = await members_repo.get(self.owner_member_id)
         if owner:
             return owner
         else:
             raise ValueError("Owner not found")
         
-    def get_minigame(self) -> Optional['MinigameResult']:
+    async def get_minigame(self) -> Optional['MinigameResult']:
         from backend.database.repos import minigames_repo
         
-        return minigames_repo.get(self.minigame_id) if self.minigame_id else None
+        return await minigames_repo.get(self.minigame_id) if self.minigame_id else None
 
-    def get_character(self) -> Optional['Object']:
+    async def get_character(self) -> Optional['Object']:
         from backend.database.repos import objects_repo
         
-        return objects_repo.get(self.character_object_id) if self.character_object_id else None
+        return await objects_repo.get(self.character_object_id) if self.character_object_id else None
 
 
 class MinigameResult(BaseDocument):
@@ -448,11 +479,52 @@ class MinigameResult(BaseDocument):
     details: Dict[str, Any] = Field(default_factory=dict)
     completed_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
-    def get_action(self) -> 'Action':
+    async def get_action(self) -> 'Action':
         from backend.database.repos import actions_repo
         
-        action = actions_repo.get(self.action_id)
+        action = await actions_repo.get(self.action_id)
         if action:
             return action
         else:
-            raise ValueError("Action not found")
\ No newline at end of file
+            raise ValueError("Action not found")
+
+# === Sync ===
+class Tombstone(BaseDocument):
+    """
+    Records that a library document was deleted, or removed from one world, at created_at,
+    so delta syncs can tell clients to drop it.
+    """
+    collection: str
+    document_id: str
+    creator_id: str
+    world_id: Optional[str] = None  # None when the document was deleted outright
+
+class WorldAddition(BaseDocument):
+    """
+    Records that an existing library document was added to a world at created_at,
+    so delta syncs send it even if it has not changed since.
+    """
+    collection: str
+    document_id: str
+    world_id: str
+
+
+# === Views ===
+class WorldView(BaseDocument):
+    """
+    A materialised GET /world/{id} response, stored under the world's ID. The world's own fields are
+    kept here; every embedded context, blueprint, object and user is a flat entry in one of
+    `shard_count` WorldViewShard documents. The ID lists name every document embedded, linked
+    blueprints and creators included, so a change can find the views holding it.
+    """
+    version: int
+    shard_count: int
+    world: Dict[str, Any]
+    context_ids: List[str] = Field(default_factory=list)
+    blueprint_ids: List[str] = Field(default_factory=list)
+    object_ids: List[str] = Field(default_factory=list)
+    user_ids: List[str] = Field(default_factory=list)
+
+class WorldViewShard(BaseDocument):
+    world_id: str
+    entries: Dict[str, Dict[str, Any]] = Field(default_factory=dict)  # "<kind>_<id>" -> response JSON
@@ -0,0 +1,189 @@
+import os
+import sys
+import json
+import uuid
+import marshal
+import cProfile
+import logging
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Profiling is off, and its middleware and routes are not installed, unless a token is configured
+PROFILING_TOKEN = os.environ.get("PROFILING_TOKEN", "")
+PROFILING_ENABLED = bool(PROFILING_TOKEN)
+
+PROFILE_DIR = os.environ.get("PROFILE_DIR", "backend/profiles")
+PROFILE_KEEP = int(os.environ.get("PROFILE_KEEP", "50"))
+SAMPLE_INTERVAL = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_MS", "5")) / 1000
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_EXTENSIONS = {"cprofile": "pstats", "sample": "folded"}
+
+
+class CProfiler:
+    """
+    Deterministic profile of everything the event loop thread runs while enabled.
+    The artifact is a marshalled pstats file, readable with pstats, snakeviz or flameprof.
+    """
+
+    def __init__(self):
+        self._profile = cProfile.Profile()
+
+    def start(self):
+        self._profile.enable()
+
+    def stop(self) -> bytes:
+        self._profile.disable()
+        self._profile.create_stats()
+        return marshal.dumps(self._profile.stats)
+
+
+class SamplingProfiler:
+    """
+    Samples the event loop thread's stack every SAMPLE_INTERVAL from a background thread.
+    Much cheaper than cProfile on slow requests; the artifact is in the folded-stack format
+    read by flamegraph.pl and speedscope.
+    """
+
+    def __init__(self, interval: float = SAMPLE_INTERVAL):
+        self.interval = interval
+        self._thread_id = threading.get_ident()
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def _run(self):
+        while True:
+            frame = sys._current_frames().get(self._thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+                frame = frame.f_back
+            if stack:
+                self._stacks[";".join(reversed(stack))] += 1
+            if self._stop.wait(self.interval):
+                break
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self) -> bytes:
+        self._stop.set()
+        self._sampler.join()
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common()).encode()
+
+
+def create_profiler(mode: str):
+    return SamplingProfiler() if mode == "sample" else CProfiler()
+
+
+# ----------------
+# Triggers
+# ----------------
+
+_active = threading.Lock()  # Profilers see the whole thread, so only one request is profiled at a time
+_armed: Dict[str, Tuple[int, str]] = {}
+_armed_lock = threading.Lock()
+
+
+def arm(path_prefix: str, count: int, mode: str):
+    """
+    Profiles the next `count` requests whose path starts with `path_prefix`,
+    for clients that cannot send the profiling header, such as a browser.
+    """
+    with _armed_lock:
+        _armed[path_prefix] = (count, mode)
+
+def armed() -> Dict[str, Dict]:
+    with _armed_lock:
+        return {prefix: {"count": count, "mode": mode} for prefix, (count, mode) in _armed.items()}
+
+def take_armed(path: str) -> Optional[str]:
+    """
+    Returns the mode to profile `path` with if an armed prefix matches, using up one of its requests.
+    """
+    if not _armed:
+        return None
+    with _armed_lock:
+        for prefix, (count, mode) in _armed.items():
+            if path.startswith(prefix):
+                if count <= 1:
+                    del _armed[prefix]
+                else:
+                    _armed[prefix] = (count - 1, mode)
+                return mode
+    return None
+
+def try_begin() -> bool:
+    return _active.acquire(blocking=False)
+
+def end():
+    _active.release()
+
+
+# ----------------
+# Artifacts
+# ----------------
+
+class ProfileStore:
+    """
+    Keeps profile artifacts on disk, each with a JSON sidecar holding its route, user and timing.
+    Only the newest PROFILE_KEEP are kept.
+    """
+
+    def __init__(self, directory: str = PROFILE_DIR, keep: int = PROFILE_KEEP):
+        self.directory = directory
+        self.keep = keep
+
+    def new_id(self) -> str:
+        return f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    def save(self, profile_id: str, data: bytes, info: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self.path(profile_id, info["mode"]), "wb") as f:
+            f.write(data)
+        with open(os.path.join(self.directory, f"{profile_id}.json"), "w") as f:
+            json.dump({"id": profile_id, **info}, f)
+        self._prune()
+
+    def path(self, profile_id: str, mode: str) -> str:
+        return os.path.join(self.directory, f"{profile_id}.{PROFILE_EXTENSIONS[mode]}")
+
+    def list(self) -> List[Dict]:
+        if not os.path.isdir(self.directory):
+            return []
+        profiles = []
+        for name in sorted(os.listdir(self.directory), reverse=True):
+            if name.endswith(".json"):
+                with open(os.path.join(self.directory, name)) as f:
+                    profiles.append(json.load(f))
+        return profiles
+
+    def get(self, profile_id: str) -> Optional[Tuple[Dict, str]]:
+        """
+        Returns a profile's details and artifact path, or None if it does not exist.
+        """
+        if os.path.basename(profile_id) != profile_id:
+            return None
+        sidecar = os.path.join(self.directory, f"{profile_id}.json")
+        if not os.path.exists(sidecar):
+            return None
+        with open(sidecar) as f:
+            info = json.load(f)
+        return info, self.path(profile_id, info["mode"])
+
+    def _prune(self):
+        for info in self.list()[self.keep:]:
+            for path in (self.path(info["id"], info["mode"]), os.path.join(self.directory, f"{info['id']}.json")):
+                try:
+                    os.remove(path)
+                except OSError as e:
+                    logger.error(f"Error removing profile {path}: {e}")
+
+
+profile_store = ProfileStore()
@@ -0,0 +1,228 @@
+import json
+import logging
+from uuid import uuid4
+from typing import AsyncIterator, Dict, List, Optional, Set
+
+try:
+    import zstandard
+except ImportError:  # zstd archives are optional
+    zstandard = None
+
+from backend.database.repos import worlds_repo, context_repo, blueprints_repo, objects_repo, users_repo
+from backend.models import User, World, Context, Blueprint, Object, CustomField
+
+logger = logging.getLogger(__name__)
+
+# === Config ===
+ARCHIVE_VERSION = 1
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+EXPORT_CHUNK_SIZE = 100  # documents read per round trip while exporting
+IMPORT_BATCH_SIZE = 500  # documents written per batch while importing (Firestore's WriteBatch limit)
+MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def zstd_available() -> bool:
+    return zstandard is not None
+
+
+# === Export ===
+def _record(kind: str, data_json: str) -> bytes:
+    return f'{{"type":"{kind}","data":{data_json}}}\n'.encode()
+
+def _blueprint_refs(fields: List[CustomField]) -> List[str]:
+    return [field.value for field in fields if field.type == "blueprint" and field.value]
+
+async def export_world(world: World) -> AsyncIterator[bytes]:
+    """
+    Yields a world archive as NDJSON lines: a header, the world, a creator stub, then its contexts,
+    objects and every blueprint they reference. Documents are read in chunks, so only one chunk is held at a time.
+    """
+    yield (json.dumps({"type": "archive", "version": ARCHIVE_VERSION, "world_id": world.id}) + "\n").encode()
+    yield _record("world", world.model_dump_json())
+
+    creator = await users_repo.get(world.creator_id)
+    if creator:
+        yield _record("creator", json.dumps({"id": creator.id, "username": creator.username}))
+
+    async for context in context_repo.stream_many(world.context_ids, EXPORT_CHUNK_SIZE):
+        yield _record("context", context.model_dump_json())
+
+    referenced: List[str] = list(world.blueprint_ids)
+    async for obj in objects_repo.stream_many(world.object_ids, EXPORT_CHUNK_SIZE):
+        referenced.append(obj.blueprint_id)
+        referenced.extend(_blueprint_refs(obj.fields))
+        yield _record("object", obj.model_dump_json())
+
+    # Blueprint fields can point at further blueprints, so keep going until nothing new is referenced
+    exported: Set[str] = set()
+    while referenced:
+        ids = [id for id in dict.fromkeys(referenced) if id not in exported]
+        exported.update(ids)
+        referenced = []
+        async for blueprint in blueprints_repo.stream_many(ids, EXPORT_CHUNK_SIZE):
+            referenced.extend(_blueprint_refs(blueprint.fields))
+            yield _record("blueprint", blueprint.model_dump_json())
+
+async def compress(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Compresses a byte stream as a single zstd frame.
+    """
+    compressor = zstandard.ZstdCompressor().compressobj()
+    async for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+# === Import ===
+async def _decompressed(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Passes plain archives through and decompresses zstd ones, detected by their magic number.
+    Raises ValueError for corrupt zstd data.
+    """
+    head = b""
+    decompressor = None
+    sniffed = False
+    async for chunk in chunks:
+        if not chunk:
+            continue
+        if not sniffed:
+            head += chunk
+            if len(head) < len(ZSTD_MAGIC):
+                continue
+            chunk, head, sniffed = head, b"", True
+            if chunk.startswith(ZSTD_MAGIC):
+                if zstandard is None:
+                    raise ValueError("zstd archives need the zstandard package")
+                decompressor = zstandard.ZstdDecompressor().decompressobj()
+        if decompressor:
+            try:
+                chunk = decompressor.decompress(chunk)
+            except zstandard.ZstdError as e:
+                raise ValueError(f"Corrupt zstd archive: {e}")
+        yield chunk
+    if head:
+        yield head
+
+async def read_archive(chunks: AsyncIterator[bytes]) -> AsyncIterator[dict]:
+    """
+    Yields the records of an uploaded archive one at a time as the body arrives.
+    Raises ValueError for malformed archives.
+    """
+    buffer = b""
+    first = True
+    async for chunk in _decompressed(chunks):
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        if len(buffer) > MAX_LINE_BYTES:
+            raise ValueError("Archive line too long")
+        for line in lines:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if first:
+                if record.get("type") != "archive" or record.get("version") != ARCHIVE_VERSION:
+                    raise ValueError("Missing or unsupported archive header")
+                first = False
+                continue
+            yield record
+    if buffer.strip():
+        if first:
+            raise ValueError("Missing or unsupported archive header")
+        yield json.loads(buffer)
+    elif first:
+        raise ValueError("Empty archive")
+
+
+class WorldImporter:
+    """
+    Writes archive records as new documents owned by the importing user.
+    Every ID in the archive is replaced by a fresh one, assigned on first sight, so records can
+    arrive in any order. Documents are buffered per collection and written IMPORT_BATCH_SIZE at a time;
+    the world itself is written last, so a failed import never leaves a world pointing at missing documents.
+    Call abort() when an import fails to delete the batches already written.
+    """
+
+    def __init__(self, user: User):
+        self._user = user
+        self._ids: Dict[str, str] = {}
+        self._world: Optional[World] = None
+        self._pending = {"context": [], "blueprint": [], "object": []}
+        self._repos = {"context": context_repo, "blueprint": blueprints_repo, "object": objects_repo}
+        self._written: Dict[str, List[str]] = {kind: [] for kind in self._pending}
+        self.counts = {"contexts": 0, "blueprints": 0, "objects": 0}
+
+    def _remap(self, old_id: str) -> str:
+        return self._ids.setdefault(old_id, uuid4().hex)
+
+    def _remap_fields(self, fields: List[CustomField]):
+        for field in fields:
+            if field.type == "blueprint" and field.value:
+                field.value = self._remap(field.value)
+
+    async def add(self, record: dict):
+        kind, data = record.get("type"), record.get("data")
+        if not isinstance(data, dict):
+            raise ValueError("Record without data")
+
+        if kind == "world":
+            if self._world is not None:
+                raise ValueError("Archive contains more than one world")
+            world = World.model_validate(data)
+            world.id = self._remap(world.id)
+            world.creator_id = self._user.id
+            world.context_ids = [self._remap(id) for id in world.context_ids]
+            world.blueprint_ids = [self._remap(id) for id in world.blueprint_ids]
+            world.object_ids = [self._remap(id) for id in world.object_ids]
+            self._world = world
+            return
+        if kind == "creator":
+            return  # Informational; imported documents belong to the importing user
+
+        if kind == "context":
+            document = Context.model_validate(data)
+            document.creator_id = self._user.id
+        elif kind == "blueprint":
+            document = Blueprint.model_validate(data)
+            document.creator_id = self._user.id
+            document.is_developer = False
+            self._remap_fields(document.fields)
+        elif kind == "object":
+            document = Object.model_validate(data)
+            document.creator_id = self._user.id
+            document.blueprint_id = self._remap(document.blueprint_id)
+            self._remap_fields(document.fields)
+        else:
+            raise ValueError(f"Unknown record type: {kind}")
+
+        document.id = self._remap(document.id)
+        self._pending[kind].append(document)
+        self.counts[f"{kind}s"] += 1
+        if len(self._pending[kind]) >= IMPORT_BATCH_SIZE:
+            await self._flush(kind)
+
+    async def _flush(self, kind: str):
+        documents, self._pending[kind] = self._pending[kind], []
+        self._written[kind].extend(document.id for document in documents)  # Before writing, since a failed batch may be partly stored
+        if not await self._repos[kind].add_many(documents):
+            raise RuntimeError(f"Failed to write imported {kind}s")
+
+    async def finish(self) -> World:
+        if self._world is None:
+            raise ValueError("Archive contains no world")
+        for kind in self._pending:
+            await self._flush(kind)
+        if not await worlds_repo.add_many([self._world]):
+            raise RuntimeError("Failed to write imported world")
+        return self._world
+
+    async def abort(self):
+        """
+        Deletes the documents written so far by a failed import. Nothing references them yet,
+        since the world is written last.
+        """
+        for kind, ids in self._written.items():
+            if ids and not await self._repos[kind].delete_many(ids):
+                logger.error(f"Failed to delete {len(ids)} {kind}s left by a failed import")
+            self._written[kind] = []
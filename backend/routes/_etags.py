@@ -0,0 +1,79 @@
+import asyncio
+import hashlib
+from typing import Iterable, List, Optional
+
+from fastapi import Request, Response
+from backend.models import BaseDocument, World, Blueprint, Object
+from backend.routes._schemas import Expansion, load_relation, load_library_links
+
+# Bump when a response schema changes shape, so tags issued for the old shape stop matching
+ETAG_VERSION = "1"
+
+
+# === Versions ===
+def document_version(document: BaseDocument) -> str:
+    stamp = document.updated_at or document.created_at
+    return f"{type(document).__name__}:{document.id}:{stamp.isoformat()}"
+
+async def blueprint_documents(blueprint: Blueprint, expand: Expansion) -> List[BaseDocument]:
+    """
+    Returns the documents a BlueprintResponse built with `expand` embeds, the blueprint included.
+    """
+    creator = await load_relation(expand, "creator", blueprint.get_creator)
+    return [blueprint, *filter(None, [creator])]
+
+async def object_documents(object: Object, expand: Expansion) -> List[BaseDocument]:
+    """
+    Returns the documents an ObjectResponse built with `expand` embeds, the object included.
+    """
+    creator, blueprint = await asyncio.gather(
+        load_relation(expand, "creator", object.get_creator),
+        load_relation(expand, "blueprint", object.get_blueprint),
+    )
+    documents = [object, *filter(None, [creator])]
+    if blueprint:
+        documents += await blueprint_documents(blueprint, expand.child("blueprint"))
+    return documents
+
+async def world_documents(world: World, expand: Expansion) -> List[BaseDocument]:
+    """
+    Returns the documents a WorldResponse built with `expand` embeds, the world included.
+    Reads go through the request loader, so building the response afterwards reads nothing again.
+    """
+    creator, contexts, blueprints, objects = await asyncio.gather(
+        load_relation(expand, "creator", world.get_creator),
+        load_relation(expand, "contexts", world.get_context),
+        load_relation(expand, "blueprints", world.get_blueprints),
+        load_relation(expand, "objects", world.get_objects),
+    )
+    linked = await load_library_links(blueprints or [], objects or [], expand)
+    return [world, *filter(None, [creator]), *(contexts or []), *(blueprints or []), *(objects or []), *linked]
+
+
+# === Tags ===
+def make_etag(documents: Iterable[BaseDocument], expand: Expansion) -> str:
+    """
+    Returns a strong ETag over the versions of every embedded document and the expansion used.
+    """
+    digest = hashlib.sha256(f"{ETAG_VERSION}|{expand.key()}".encode())
+    for version in sorted({document_version(document) for document in documents}):
+        digest.update(b"|" + version.encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Returns True if the request's If-None-Match already holds `etag`.
+    Weak tags match too, since If-None-Match uses weak comparison.
+    """
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+def conditional(request: Request, etag: str) -> Optional[Response]:
+    """
+    Returns a 304 response if the client's copy is current, otherwise None.
+    """
+    return Response(status_code=304, headers={"ETag": etag}) if etag_matches(request, etag) else None
@@ -0,0 +1,124 @@
+import asyncio
+import inspect
+import functools
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+# Relations nested deeper than this below the response being built are returned by ID only
+GRAPH_MAX_DEPTH = 8
+
+NodeKey = Tuple[str, str, int]
+
+
+class ResponseGraph:
+    """
+    The response nodes built for one top-level response. Each (response type, document, expansion)
+    is built once and reused wherever it is referenced again, so building is linear in the number of
+    documents however often they are linked. A reference that would wait on a node which is itself
+    waiting on the caller, such as a member pointing back at the campaign embedding it, is cut to an ID.
+    """
+
+    def __init__(self, max_depth: int = GRAPH_MAX_DEPTH):
+        self.max_depth = max_depth
+        self.built: Dict[NodeKey, Any] = {}
+        self.pending: Dict[NodeKey, asyncio.Future] = {}
+        self.waits: Dict[NodeKey, Set[NodeKey]] = {}  # Pending node -> nodes it is waiting for
+
+    def _reaches(self, start: NodeKey, target: NodeKey) -> bool:
+        """
+        Returns True if the pending node `start` is waiting, directly or not, on `target`.
+        """
+        seen = set()
+        stack = [start]
+        while stack:
+            key = stack.pop()
+            if key == target:
+                return True
+            if key in seen or key not in self.pending:
+                continue
+            seen.add(key)
+            stack.extend(self.waits.get(key, ()))
+        return False
+
+    def wait_is_safe(self, waiter: Optional[NodeKey], key: NodeKey) -> bool:
+        if waiter is None:
+            return True
+        if self._reaches(key, waiter):
+            return False
+        self.waits.setdefault(waiter, set()).add(key)
+        return True
+
+    def begin(self, waiter: Optional[NodeKey], key: NodeKey) -> asyncio.Future:
+        if waiter is not None:
+            self.waits.setdefault(waiter, set()).add(key)
+        future = asyncio.get_running_loop().create_future()
+        self.pending[key] = future
+        return future
+
+    def finish(self, key: NodeKey, future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+        self.pending.pop(key, None)
+        self.waits.pop(key, None)
+        if isinstance(error, asyncio.CancelledError):
+            future.cancel()
+        elif error is not None:
+            future.set_exception(error)
+            future.exception()  # Mark retrieved; the builder re-raises it
+        else:
+            self.built[key] = result
+            future.set_result(result)
+
+
+_current_graph: ContextVar[Optional[ResponseGraph]] = ContextVar("response_graph", default=None)
+_current_path: ContextVar[Tuple[NodeKey, ...]] = ContextVar("response_path", default=())
+
+
+def graph_node(from_model: Callable) -> Callable:
+    """
+    Decorates a *Response.from_model builder so nested builds share one ResponseGraph.
+    The outermost call creates the graph. Nested calls return the node already built for the same
+    document, or None, leaving only the relation's ID, when the node is a back-reference or would
+    sit deeper than GRAPH_MAX_DEPTH.
+    """
+    name = from_model.__qualname__
+    default_expand = inspect.signature(from_model).parameters["expand"].default
+
+    @functools.wraps(from_model)
+    async def build(model, *args, **kwargs):
+        if _current_graph.get() is not None:
+            return await _build_node(from_model, name, model, args, kwargs, default_expand)
+
+        graph_token = _current_graph.set(ResponseGraph())
+        try:
+            return await _build_node(from_model, name, model, args, kwargs, default_expand)
+        finally:
+            _current_graph.reset(graph_token)
+
+    return build
+
+async def _build_node(from_model: Callable, name: str, model, args, kwargs, default_expand):
+    graph = _current_graph.get()
+    path = _current_path.get()
+    waiter = path[-1] if path else None
+    expand = args[0] if args else kwargs.get("expand", default_expand)
+    key = (name, model.id, id(expand))
+
+    if key in graph.built:
+        return graph.built[key]
+    if key in graph.pending:
+        if not graph.wait_is_safe(waiter, key):
+            return None
+        return await graph.pending[key]
+    if len(path) > graph.max_depth:
+        return None
+
+    future = graph.begin(waiter, key)
+    path_token = _current_path.set(path + (key,))
+    try:
+        result = await from_model(model, *args, **kwargs)
+    except BaseException as e:
+        graph.finish(key, future, error=e)
+        raise
+    finally:
+        _current_path.reset(path_token)
+    graph.finish(key, future, result)
+    return result
@@ -0,0 +1,33 @@
+from typing import Any, Optional
+
+from fastapi import Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+
+class TrustedJSONResponse(ORJSONResponse):
+    """
+    Returns schemas built by the *Response.from_model builders, which are valid by construction,
+    without FastAPI dumping and re-validating them against the route's response_model.
+    Models are written by pydantic's own JSON serializer; anything else falls back to orjson.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            return content.__pydantic_serializer__.to_json(content)
+        if isinstance(content, (list, tuple)) and all(isinstance(item, BaseModel) for item in content):
+            return b"[" + b",".join(item.__pydantic_serializer__.to_json(item) for item in content) + b"]"
+        return super().render(content)
+
+
+def trusted(content: Any, response: Optional[Response] = None) -> TrustedJSONResponse:
+    """
+    Wraps a route's result in a TrustedJSONResponse. FastAPI does not merge a returned response with
+    the one injected into the route, so headers set there, such as X-Next-Cursor, are copied over.
+    """
+    trusted_response = TrustedJSONResponse(content)
+    if response is not None:
+        trusted_response.headers.raw.extend(
+            (name, value) for name, value in response.headers.raw if name != b"content-length"
+        )
+    return trusted_response
@@ -1,11 +1,133 @@
+import asyncio
 from datetime import datetime, timezone
 from pydantic import BaseModel, Field, EmailStr
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, ClassVar, Callable, Awaitable
 from backend.models import *
+from backend.routes._graph import graph_node
 
 # === Config ===
 EMPTY_STRING = ""
 
+# === Expansion ===
+class Expansion:
+    """
+    The relations a response embeds, parsed from a query such as ?expand=blueprints,objects.blueprint.
+    Relations that are not named are returned by ID only; "objects.*" expands everything below objects.
+    """
+
+    def __init__(self, children: Optional[Dict[str, "Expansion"]] = None):
+        self.children = children  # None expands every relation
+
+    @staticmethod
+    def parse(value: Optional[str]) -> "Expansion":
+        """
+        Returns EXPAND_ALL when no expansion was requested, so existing clients keep full responses.
+        """
+        if value is None:
+            return EXPAND_ALL
+
+        root = Expansion({})
+        for path in value.split(","):
+            node = root
+            for name in path.strip().split("."):
+                if node.children is None or not name:
+                    break
+                if name == "*":
+                    node.children = None
+                    break
+                node = node.children.setdefault(name, Expansion({}))
+        return root
+
+    def __contains__(self, name: str) -> bool:
+        return self.children is None or name in self.children
+
+    def child(self, name: str) -> "Expansion":
+        if self.children is None:
+            return self
+        return self.children.get(name, EXPAND_NONE)
+
+    def key(self) -> str:
+        """
+        Returns a canonical form of the expansion, equal for expansions that embed the same relations.
+        """
+        if self.children is None:
+            return "*"
+        return ",".join(f"{name}({child.key()})" for name, child in sorted(self.children.items()))
+
+
+EXPAND_ALL = Expansion()
+EXPAND_NONE = Expansion({})
+
+
+# === Helper Functions ===
+async def load_relation(expand: Expansion, name: str, load: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Loads a relation only if it is expanded; unexpanded relations cost no reads.
+    """
+    return await load() if name in expand else None
+
+async def build_relation(response, model: Optional[BaseDocument], expand: Expansion):
+    return await response.from_model(model, expand) if model is not None else None
+
+async def build_relations(response, models: Optional[List[BaseDocument]], expand: Expansion) -> Optional[list]:
+    """
+    Builds a list relation. Members the response graph cuts to an ID are left out; the ID list still has them.
+    """
+    if models is None:
+        return None
+    built = await asyncio.gather(*[response.from_model(m, expand) for m in models])
+    return [schema for schema in built if schema is not None]
+
+async def prefetch_library(blueprints: List[Blueprint], objects: List[Object], expand: Expansion = EXPAND_ALL):
+    """
+    Batch-loads the blueprints and creators that nested Blueprint/Object responses resolve.
+    Only useful inside a request, where the loader keeps them for the nested from_model calls.
+    """
+    from backend.database.loader import current_loader
+
+    if current_loader() is None:
+        return
+    await load_library_links(blueprints, objects, expand)
+
+async def load_library_links(blueprints: List[Blueprint], objects: List[Object], expand: Expansion = EXPAND_ALL) -> List[BaseDocument]:
+    """
+    Returns the blueprints and creators nested Blueprint/Object responses embed, read in two batches.
+    """
+    from backend.database.repos import blueprints_repo, users_repo
+
+    linked = []
+    if "blueprint" in expand.child("objects"):
+        linked = await blueprints_repo.get_many([o.blueprint_id for o in objects])
+
+    creator_ids = []
+    if "creator" in expand.child("blueprints"):
+        creator_ids += [b.creator_id for b in blueprints]
+    if "creator" in expand.child("objects"):
+        creator_ids += [o.creator_id for o in objects]
+    if "creator" in expand.child("objects").child("blueprint"):
+        creator_ids += [b.creator_id for b in linked]
+    return [*linked, *await users_repo.get_many(creator_ids)]
+
+async def prefetch_timeline(eras: List[Era], expand: Expansion):
+    """
+    Batch-loads the chapters, encounters and actions nested Era responses resolve, one read per expanded level.
+    Only useful inside a request, where the loader keeps them for the nested from_model calls.
+    """
+    from backend.database.loader import current_loader
+    from backend.database.hierarchy import load_hierarchy
+
+    if current_loader() is None:
+        return
+
+    depth = 0
+    for name in ("chapters", "encounters", "actions"):
+        if name not in expand:
+            break
+        depth += 1
+        expand = expand.child(name)
+    if depth:
+        await load_hierarchy(eras, depth)
+
 # === Users & Core Entities ===
 
 # --- Payload: all optional fields, no from_model ---
@@ -17,10 +139,7 @@ class UserPayload(BaseModel):
     password_new: Optional[str] = None
 
     def to_model(self, model: User) -> User:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 
@@ -35,7 +154,8 @@ class UserResponse(BaseModel):
     password_new: Optional[str] = None
 
     @staticmethod
-    def from_model(model: User) -> "UserResponse":
+    @graph_node
+    async def from_model(model: User, expand: Expansion = EXPAND_ALL) -> "UserResponse":
         schema = UserResponse(
             id=model.id,
             created_at=model.created_at,
@@ -60,10 +180,7 @@ class WorldPayload(BaseModel):
     settings: Optional[WorldSetting] = None
 
     def to_model(self, model: World) -> World:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class WorldResponse(BaseModel):
@@ -72,18 +189,26 @@ class WorldResponse(BaseModel):
     updated_at: Optional[datetime] = None
     name: str
     description: Optional[str] = None
-    creator: UserResponse
-    contexts: List['ContextResponse']
-    blueprints: List['BlueprintResponse'] = []
-    objects: List['ObjectResponse'] = []
+    creator_id: str
+    creator: Optional[UserResponse] = None
+    context_ids: List[str] = []
+    contexts: Optional[List['ContextResponse']] = None
+    blueprint_ids: List[str] = []
+    blueprints: Optional[List['BlueprintResponse']] = None
+    object_ids: List[str] = []
+    objects: Optional[List['ObjectResponse']] = None
     settings: WorldSetting
 
     @staticmethod
-    def from_model(model: World) -> "WorldResponse":
-        creator = model.get_creator()
-        contexts = model.get_context()
-        blueprints = model.get_blueprints()
-        objects = model.get_objects()
+    @graph_node
+    async def from_model(model: World, expand: Expansion = EXPAND_ALL) -> "WorldResponse":
+        creator, contexts, blueprints, objects = await asyncio.gather(
+            load_relation(expand, "creator", model.get_creator),
+            load_relation(expand, "contexts", model.get_context),
+            load_relation(expand, "blueprints", model.get_blueprints),
+            load_relation(expand, "objects", model.get_objects),
+        )
+        await prefetch_library(blueprints or [], objects or [], expand)
         
         schema = WorldResponse(
             id=model.id,
@@ -91,15 +216,62 @@ class WorldResponse(BaseModel):
             updated_at=model.updated_at,
             name=model.name,
             description=model.description,
-            creator=UserResponse.from_model(creator),
-            contexts=[ContextResponse.from_model(c) for c in contexts],
-            blueprints=[BlueprintResponse.from_model(b) for b in blueprints],
-            objects=[ObjectResponse.from_model(o) for o in objects],
+            creator_id=model.creator_id,
+            creator=await build_relation(UserResponse, creator, expand.child("creator")),
+            context_ids=model.context_ids,
+            contexts=await build_relations(ContextResponse, contexts, expand.child("contexts")),
+            blueprint_ids=model.blueprint_ids,
+            blueprints=await build_relations(BlueprintResponse, blueprints, expand.child("blueprints")),
+            object_ids=model.object_ids,
+            objects=await build_relations(ObjectResponse, objects, expand.child("objects")),
+            settings=model.settings,
+        )
+        return schema
+
+
+class WorldSummary(BaseModel):
+    id: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    name: str
+    description: Optional[str] = None
+    creator: UserResponse
+    context_count: int
+    blueprint_count: int
+    object_count: int
+    settings: WorldSetting
+
+    # Fields read from storage to build a summary
+    source_fields: ClassVar[List[str]] = [
+        "id", "created_at", "updated_at", "name", "description", "creator_id",
+        "context_ids", "blueprint_ids", "object_ids", "settings",
+    ]
+
+    @staticmethod
+    async def from_model(model: World) -> "WorldSummary":
+        creator = await model.get_creator()
+        schema = WorldSummary(
+            id=model.id,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            name=model.name,
+            description=model.description,
+            creator=await UserResponse.from_model(creator),
+            context_count=len(model.context_ids),
+            blueprint_count=len(model.blueprint_ids),
+            object_count=len(model.object_ids),
             settings=model.settings,
         )
         return schema
 
 
+class WorldImportResponse(BaseModel):
+    id: str
+    contexts: int
+    blueprints: int
+    objects: int
+
+
 # === Campaign ===
 
 class CampaignPayload(BaseModel):
@@ -116,10 +288,7 @@ class CampaignPayload(BaseModel):
     era_ids: Optional[List[str]] = None
 
     def to_model(self, model: Campaign) -> Campaign:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class CampaignResponse(BaseModel):
@@ -128,24 +297,38 @@ class CampaignResponse(BaseModel):
     updated_at: Optional[datetime] = None
     name: str
     description: Optional[str] = None
-    creator: UserResponse
+    creator_id: str
+    creator: Optional[UserResponse] = None
+    world_id: Optional[str] = None
     world: Optional[WorldResponse] = None
-    contexts: List['ContextResponse']
-    blueprints: List['BlueprintResponse']
-    objects: List['ObjectResponse']
+    context_ids: List[str] = []
+    contexts: Optional[List['ContextResponse']] = None
+    blueprint_ids: List[str] = []
+    blueprints: Optional[List['BlueprintResponse']] = None
+    object_ids: List[str] = []
+    objects: Optional[List['ObjectResponse']] = None
     settings: WorldSetting
-    members: List['MemberResponse']
-    eras: List['EraResponse']
+    member_ids: List[str] = []
+    members: Optional[List['MemberResponse']] = None
+    era_ids: List[str] = []
+    eras: Optional[List['EraResponse']] = None
 
     @staticmethod
-    def from_model(model: Campaign) -> "CampaignResponse":
-        creator = model.get_creator()
-        world = model.get_world()
-        contexts = model.get_context()
-        blueprints = model.get_blueprints()
-        objects = model.get_objects()
-        members = model.get_members()
-        eras = model.get_eras()
+    @graph_node
+    async def from_model(model: Campaign, expand: Expansion = EXPAND_ALL) -> "CampaignResponse":
+        creator, world, contexts, blueprints, objects, members, eras = await asyncio.gather(
+            load_relation(expand, "creator", model.get_creator),
+            load_relation(expand, "world", model.get_world),
+            load_relation(expand, "contexts", model.get_context),
+            load_relation(expand, "blueprints", model.get_blueprints),
+            load_relation(expand, "objects", model.get_objects),
+            load_relation(expand, "members", model.get_members),
+            load_relation(expand, "eras", model.get_eras),
+        )
+        await asyncio.gather(
+            prefetch_library(blueprints or [], objects or [], expand),
+            prefetch_timeline(eras or [], expand.child("eras")),
+        )
 
         schema = CampaignResponse(
             id=model.id,
@@ -153,14 +336,21 @@ class CampaignResponse(BaseModel):
             updated_at=model.updated_at,
             name=model.name,
             description=model.description,
-            creator=UserResponse.from_model(creator),
-            world=WorldResponse.from_model(world) if world else None,
-            contexts=[ContextResponse.from_model(c) for c in contexts],
-            blueprints=[BlueprintResponse.from_model(b) for b in blueprints],
-            objects=[ObjectResponse.from_model(o) for o in objects],
+            creator_id=model.creator_id,
+            creator=await build_relation(UserResponse, creator, expand.child("creator")),
+            world_id=model.world_id,
+            world=await build_relation(WorldResponse, world, expand.child("world")),
+            context_ids=model.context_ids,
+            contexts=await build_relations(ContextResponse, contexts, expand.child("contexts")),
+            blueprint_ids=model.blueprint_ids,
+            blueprints=await build_relations(BlueprintResponse, blueprints, expand.child("blueprints")),
+            object_ids=model.object_ids,
+            objects=await build_relations(ObjectResponse, objects, expand.child("objects")),
             settings=model.settings,
-            members=[MemberResponse.from_model(m) for m in members],
-            eras=[EraResponse.from_model(e) for e in eras],
+            member_ids=model.member_ids,
+            members=await build_relations(MemberResponse, members, expand.child("members")),
+            era_ids=model.era_ids,
+            eras=await build_relations(EraResponse, eras, expand.child("eras")),
         )
         return schema
 
@@ -176,37 +366,43 @@ class MemberPayload(BaseModel):
     sleeve_id: Optional[str] = None
 
     def to_model(self, model: Member) -> Member:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class MemberResponse(BaseModel):
     id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
-    user: Optional[UserResponse]
-    campaign: CampaignResponse
+    user_id: Optional[str] = None
+    user: Optional[UserResponse] = None
+    campaign_id: str
+    campaign: Optional[CampaignResponse] = None
     role: str
     status: str
-    sleeve: Optional['ObjectResponse']
+    sleeve_id: Optional[str] = None
+    sleeve: Optional['ObjectResponse'] = None
 
     @staticmethod
-    def from_model(model: Member) -> "MemberResponse":
-        user = model.get_user()
-        campaign = model.get_campaign()
-        sleeve = model.get_sleeve()
+    @graph_node
+    async def from_model(model: Member, expand: Expansion = EXPAND_ALL) -> "MemberResponse":
+        user, campaign, sleeve = await asyncio.gather(
+            load_relation(expand, "user", model.get_user),
+            load_relation(expand, "campaign", model.get_campaign),
+            load_relation(expand, "sleeve", model.get_sleeve),
+        )
 
         schema = MemberResponse(
             id=model.id,
             created_at=model.created_at,
             updated_at=model.updated_at,
-            user=UserResponse.from_model(user) if user else None,
-            campaign=CampaignResponse.from_model(campaign),
+            user_id=model.user_id,
+            user=await build_relation(UserResponse, user, expand.child("user")),
+            campaign_id=model.campaign_id,
+            campaign=await build_relation(CampaignResponse, campaign, expand.child("campaign")),
             role=model.role,
             status=model.status,
-            sleeve=ObjectResponse.from_model(sleeve) if sleeve else None
+            sleeve_id=model.sleeve_id,
+            sleeve=await build_relation(ObjectResponse, sleeve, expand.child("sleeve")),
         )
         return schema
 
@@ -219,10 +415,7 @@ class ContextPayload(BaseModel):
     content: Optional[str] = None
 
     def to_model(self, model: Context) -> Context:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class ContextResponse(BaseModel):
@@ -233,7 +426,8 @@ class ContextResponse(BaseModel):
     content: str
 
     @staticmethod
-    def from_model(model: Context) -> "ContextResponse":
+    @graph_node
+    async def from_model(model: Context, expand: Expansion = EXPAND_ALL) -> "ContextResponse":
         schema = ContextResponse(
             id=model.id,
             created_at=model.created_at,
@@ -255,10 +449,7 @@ class BlueprintPayload(BaseModel):
     fields: Optional[List[CustomField]] = None
 
     def to_model(self, model: Blueprint) -> Blueprint:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class BlueprintResponse(BaseModel):
@@ -267,21 +458,24 @@ class BlueprintResponse(BaseModel):
     updated_at: Optional[datetime] = None
     name: str
     description: Optional[str] = None
-    creator: UserResponse
+    creator_id: str
+    creator: Optional[UserResponse] = None
     is_public: bool
     is_developer: bool
     fields: List[CustomField]
 
     @staticmethod
-    def from_model(model: Blueprint) -> "BlueprintResponse":
-        creator = model.get_creator()
+    @graph_node
+    async def from_model(model: Blueprint, expand: Expansion = EXPAND_ALL) -> "BlueprintResponse":
+        creator = await load_relation(expand, "creator", model.get_creator)
         schema = BlueprintResponse(
             id=model.id,
             created_at=model.created_at,
             updated_at=model.updated_at,
             name=model.name,
             description=model.description,
-            creator=UserResponse.from_model(creator),
+            creator_id=model.creator_id,
+            creator=await build_relation(UserResponse, creator, expand.child("creator")),
             is_public=model.is_public,
             is_developer=model.is_developer,
             fields=model.fields,
@@ -289,6 +483,40 @@ class BlueprintResponse(BaseModel):
         return schema
 
 
+class BlueprintSummary(BaseModel):
+    id: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    name: str
+    description: Optional[str] = None
+    creator: UserResponse
+    is_public: bool
+    is_developer: bool
+    field_count: Optional[int] = None
+
+    # Fields read from storage to build a summary; the fields themselves are skipped
+    source_fields: ClassVar[List[str]] = [
+        "id", "created_at", "updated_at", "name", "description", "creator_id",
+        "is_public", "is_developer", "field_count",
+    ]
+
+    @staticmethod
+    async def from_model(model: Blueprint) -> "BlueprintSummary":
+        creator = await model.get_creator()
+        schema = BlueprintSummary(
+            id=model.id,
+            created_at=model.created_at,
+            updated_at=model.updated_at,
+            name=model.name,
+            description=model.description,
+            creator=await UserResponse.from_model(creator),
+            is_public=model.is_public,
+            is_developer=model.is_developer,
+            field_count=model.field_count,
+        )
+        return schema
+
+
 # === Object ===
 
 class ObjectPayload(BaseModel):
@@ -300,10 +528,7 @@ class ObjectPayload(BaseModel):
     fields: Optional[List[CustomField]] = None
 
     def to_model(self, model: Object) -> Object:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 class ObjectResponse(BaseModel):
     id: str
@@ -311,14 +536,19 @@ class ObjectResponse(BaseModel):
     updated_at: Optional[datetime] = None
     name: str
     description: Optional[str] = None
-    creator: UserResponse
-    blueprint: BlueprintResponse
+    creator_id: str
+    creator: Optional[UserResponse] = None
+    blueprint_id: str
+    blueprint: Optional[BlueprintResponse] = None
     fields: List[CustomField]
 
     @staticmethod
-    def from_model(model: Object) -> "ObjectResponse":
-        creator = model.get_creator()
-        blueprint = model.get_blueprint()
+    @graph_node
+    async def from_model(model: Object, expand: Expansion = EXPAND_ALL) -> "ObjectResponse":
+        creator, blueprint = await asyncio.gather(
+            load_relation(expand, "creator", model.get_creator),
+            load_relation(expand, "blueprint", model.get_blueprint),
+        )
 
         schema = ObjectResponse(
             id=model.id,
@@ -326,8 +556,10 @@ class ObjectResponse(BaseModel):
             updated_at=model.updated_at,
             name=model.name,
             description=model.description,
-            creator=UserResponse.from_model(creator),
-            blueprint=BlueprintResponse.from_model(blueprint),
+            creator_id=model.creator_id,
+            creator=await build_relation(UserResponse, creator, expand.child("creator")),
+            blueprint_id=model.blueprint_id,
+            blueprint=await build_relation(BlueprintResponse, blueprint, expand.child("blueprint")),
             fields=model.fields,
         )
         return schema
@@ -344,10 +576,7 @@ class ObjectivePayload(BaseModel):
     parent_id: Optional[str] = None
 
     def to_model(self, model: Objective) -> Objective:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class ObjectiveResponse(BaseModel):
@@ -357,26 +586,84 @@ class ObjectiveResponse(BaseModel):
     name: str
     task: str
     progress: int
-    children: List['ObjectiveResponse']
-    parent: Optional['ObjectiveResponse']
+    progress_rollup: Optional[float] = None  # Own progress for a leaf, else the mean of the children's roll-ups
+    children_ids: List[str] = []
+    children: Optional[List['ObjectiveResponse']] = None
+    parent_id: Optional[str] = None
+    parent: Optional['ObjectiveResponse'] = None
+    root_id: Optional[str] = None
 
     @staticmethod
-    def from_model(model: Objective) -> "ObjectiveResponse":
-        children = model.get_children()
-        parent = model.get_parent()
-        schema = ObjectiveResponse(
-            id=model.id,
-            created_at=model.created_at,
-            updated_at=model.updated_at,
-            name=model.name,
-            task=model.task,
-            progress=model.progress,
-            children=[ObjectiveResponse.from_model(c) for c in children],
-            parent=ObjectiveResponse.from_model(parent) if parent else None,
-        )
+    @graph_node
+    async def from_model(model: Objective, expand: Expansion = EXPAND_ALL) -> "ObjectiveResponse":
+        """
+        Expanding children reads the objective's whole tree with one query and builds it in memory.
+        Nested objectives link to their parent by ID; only the requested objective embeds its parent.
+        """
+        tree = await model.get_tree() if "children" in expand else None
+        parent = None
+        if "parent" in expand and model.parent_id:
+            parent = tree.get(model.parent_id) if tree else None
+            parent = parent or await model.get_parent()
+
+        schema = build_objective_tree(model, tree, expand)
+        if parent:
+            schema.parent = build_objective_tree(parent, tree if tree and parent.id in tree else None, EXPAND_NONE)
         return schema
 
 
+def build_objective_tree(model: Objective, tree: Optional[Dict[str, Objective]], expand: Expansion) -> ObjectiveResponse:
+    """
+    Builds `model` and its expanded descendants from a loaded tree without recursion. Nodes are visited
+    depth first, then built in reverse, so children are built, and their progress rolled up, before their parents.
+    Roll-ups cover the whole subtree however far children are expanded; without a tree there are none.
+    An objective reachable twice, through bad links, is built under the first parent found.
+    """
+    tree = tree or {}
+    order = []
+    expansions: Dict[str, Optional[Expansion]] = {model.id: expand}
+    stack = [model]
+    while stack:
+        node = stack.pop()
+        order.append(node)
+        node_expand = expansions[node.id]
+        child_expand = node_expand.child("children") if node_expand is not None and "children" in node_expand else None
+        for child_id in node.children_ids:
+            if child_id in tree and child_id not in expansions:
+                expansions[child_id] = child_expand
+                stack.append(tree[child_id])
+
+    rollups: Dict[str, Optional[float]] = {}
+    built: Dict[str, ObjectiveResponse] = {}
+    for node in reversed(order):
+        if tree:
+            child_rollups = [rollups.get(child_id) for child_id in node.children_ids if child_id in tree]
+            if not child_rollups:
+                rollups[node.id] = float(node.progress)
+            elif None not in child_rollups:
+                rollups[node.id] = round(sum(child_rollups) / len(child_rollups), 1)
+            else:
+                rollups[node.id] = None  # A child was reached through another parent first
+
+        node_expand = expansions[node.id]
+        if node_expand is None:
+            continue
+        built[node.id] = ObjectiveResponse(
+            id=node.id,
+            created_at=node.created_at,
+            updated_at=node.updated_at,
+            name=node.name,
+            task=node.task,
+            progress=node.progress,
+            progress_rollup=rollups.get(node.id),
+            children_ids=node.children_ids,
+            children=[built[id] for id in node.children_ids if id in built] if "children" in node_expand else None,
+            parent_id=node.parent_id,
+            root_id=node.root_id,
+        )
+    return built[model.id]
+
+
 class EraPayload(BaseModel):
     id: Optional[str] = None
     campaign_id: Optional[str] = None
@@ -386,37 +673,43 @@ class EraPayload(BaseModel):
     chapter_ids: Optional[List[str]] = None
 
     def to_model(self, model: Era) -> Era:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class EraResponse(BaseModel):
     id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
-    campaign: CampaignResponse
+    campaign_id: str
+    campaign: Optional[CampaignResponse] = None
     name: str
     description: Optional[str] = None
-    objective: ObjectiveResponse
-    chapters: List['ChapterResponse']
+    objective_id: str
+    objective: Optional[ObjectiveResponse] = None
+    chapter_ids: List[str] = []
+    chapters: Optional[List['ChapterResponse']] = None
 
     @staticmethod
-    def from_model(model: Era) -> "EraResponse":
-        campaign = model.get_campaign()
-        objective = model.get_objective()
-        chapters = model.get_chapters()
+    @graph_node
+    async def from_model(model: Era, expand: Expansion = EXPAND_ALL) -> "EraResponse":
+        campaign, objective, chapters = await asyncio.gather(
+            load_relation(expand, "campaign", model.get_campaign),
+            load_relation(expand, "objective", model.get_objective),
+            load_relation(expand, "chapters", model.get_chapters),
+        )
 
         schema = EraResponse(
             id=model.id,
             created_at=model.created_at,
             updated_at=model.updated_at,
-            campaign=CampaignResponse.from_model(campaign),
+            campaign_id=model.campaign_id,
+            campaign=await build_relation(CampaignResponse, campaign, expand.child("campaign")),
             name=model.name,
             description=model.description,
-            objective=ObjectiveResponse.from_model(objective),
-            chapters=[ChapterResponse.from_model(c) for c in chapters],
+            objective_id=model.objective_id,
+            objective=await build_relation(ObjectiveResponse, objective, expand.child("objective")),
+            chapter_ids=model.chapter_ids,
+            chapters=await build_relations(ChapterResponse, chapters, expand.child("chapters")),
         )
         return schema
 
@@ -430,37 +723,43 @@ class ChapterPayload(BaseModel):
     encounter_ids: Optional[List[str]] = None
 
     def to_model(self, model: Chapter) -> Chapter:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class ChapterResponse(BaseModel):
     id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
-    era: EraResponse
+    era_id: str
+    era: Optional[EraResponse] = None
     name: str
     description: Optional[str] = None
-    objective: ObjectiveResponse
-    encounters: List['EncounterResponse']
+    objective_id: str
+    objective: Optional[ObjectiveResponse] = None
+    encounter_ids: List[str] = []
+    encounters: Optional[List['EncounterResponse']] = None
 
     @staticmethod
-    def from_model(model: Chapter) -> "ChapterResponse":
-        era = model.get_era()
-        objective = model.get_objective()
-        encounters = model.get_encounters()
+    @graph_node
+    async def from_model(model: Chapter, expand: Expansion = EXPAND_ALL) -> "ChapterResponse":
+        era, objective, encounters = await asyncio.gather(
+            load_relation(expand, "era", model.get_era),
+            load_relation(expand, "objective", model.get_objective),
+            load_relation(expand, "encounters", model.get_encounters),
+        )
 
         schema = ChapterResponse(
             id=model.id,
             created_at=model.created_at,
             updated_at=model.updated_at,
-            era=EraResponse.from_model(era),
+            era_id=model.era_id,
+            era=await build_relation(EraResponse, era, expand.child("era")),
             name=model.name,
             description=model.description,
-            objective=ObjectiveResponse.from_model(objective),
-            encounters=[EncounterResponse.from_model(c) for c in encounters],
+            objective_id=model.objective_id,
+            objective=await build_relation(ObjectiveResponse, objective, expand.child("objective")),
+            encounter_ids=model.encounter_ids,
+            encounters=await build_relations(EncounterResponse, encounters, expand.child("encounters")),
         )
         return schema
 
@@ -473,33 +772,37 @@ class EncounterPayload(BaseModel):
     action_ids: Optional[List[str]] = None
 
     def to_model(self, model: Encounter) -> Encounter:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 class EncounterResponse(BaseModel):
     id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
-    chapter: ChapterResponse
+    chapter_id: str
+    chapter: Optional[ChapterResponse] = None
     name: str
     description: Optional[str] = None
-    actions: List['ActionResponse']
+    action_ids: List[str] = []
+    actions: Optional[List['ActionResponse']] = None
 
     @staticmethod
-    def from_model(model: Encounter) -> "EncounterResponse":
-        chapter = model.get_chapter()
-        actions = model.get_actions()
+    @graph_node
+    async def from_model(model: Encounter, expand: Expansion = EXPAND_ALL) -> "EncounterResponse":
+        chapter, actions = await asyncio.gather(
+            load_relation(expand, "chapter", model.get_chapter),
+            load_relation(expand, "actions", model.get_actions),
+        )
 
         schema = EncounterResponse(
             id=model.id,
             created_at=model.created_at,
             updated_at=model.updated_at,
-            chapter=ChapterResponse.from_model(chapter),
+            chapter_id=model.chapter_id,
+            chapter=await build_relation(ChapterResponse, chapter, expand.child("chapter")),
             name=model.name,
             description=model.description,
-            actions=[ActionResponse.from_model(c) for c in actions],
+            action_ids=model.action_ids,
+            actions=await build_relations(ActionResponse, actions, expand.child("actions")),
         )
         return schema
 
@@ -517,42 +820,50 @@ class ActionPayload(BaseModel):
     minigame_id: Optional[str] = None
 
     def to_model(self, model: Action) -> Action:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class ActionResponse(BaseModel):
     id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
-    encounter: EncounterResponse
-    owner_member: MemberResponse
+    encounter_id: str
+    encounter: Optional[EncounterResponse] = None
+    owner_member_id: str
+    owner_member: Optional[MemberResponse] = None
+    character_object_id: Optional[str] = None
     character_object: Optional[ObjectResponse] = None
     content: str
     type: str
     dm_response: Optional[str] = None
+    minigame_id: Optional[str] = None
     minigame: Optional['MinigameResultResponse'] = None
 
     @staticmethod
-    def from_model(model: Action) -> "ActionResponse":
-        encounter = model.get_encounter()
-        owner_member = model.get_owner()
-        character_object = model.get_character()
-        minigame = model.get_minigame()
+    @graph_node
+    async def from_model(model: Action, expand: Expansion = EXPAND_ALL) -> "ActionResponse":
+        encounter, owner_member, character_object, minigame = await asyncio.gather(
+            load_relation(expand, "encounter", model.get_encounter),
+            load_relation(expand, "owner_member", model.get_owner),
+            load_relation(expand, "character_object", model.get_character),
+            load_relation(expand, "minigame", model.get_minigame),
+        )
 
         schema = ActionResponse(
             id=model.id,
             created_at=model.created_at,
             updated_at=model.updated_at,
-            encounter=EncounterResponse.from_model(encounter),
-            owner_member=MemberResponse.from_model(owner_member),
-            character_object=ObjectResponse.from_model(character_object) if character_object else None,
+            encounter_id=model.encounter_id,
+            encounter=await build_relation(EncounterResponse, encounter, expand.child("encounter")),
+            owner_member_id=model.owner_member_id,
+            owner_member=await build_relation(MemberResponse, owner_member, expand.child("owner_member")),
+            character_object_id=model.character_object_id,
+            character_object=await build_relation(ObjectResponse, character_object, expand.child("character_object")),
             content=model.content,
             type=model.type,
             dm_response=model.dm_response,
-            minigame=MinigameResultResponse.from_model(minigame) if minigame else None,
+            minigame_id=model.minigame_id,
+            minigame=await build_relation(MinigameResultResponse, minigame, expand.child("minigame")),
         )
         return schema
 
@@ -566,30 +877,30 @@ class MinigameResultPayload(BaseModel):
     completed_at: Optional[datetime] = None
 
     def to_model(self, model: MinigameResult) -> MinigameResult:
-        update_data = self.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(model, field, value)
-        return model
+        return model.apply_changes({field: getattr(self, field) for field in self.model_fields_set})
 
 
 class MinigameResultResponse(BaseModel):
     id: str
     created_at: datetime
     updated_at: Optional[datetime] = None
-    action: ActionResponse
+    action_id: str
+    action: Optional[ActionResponse] = None
     type: str
     result: str
     details: Dict[str, Any]
     completed_at: datetime
 
     @staticmethod
-    def from_model(model: MinigameResult) -> "MinigameResultResponse":
-        action = model.get_action()
+    @graph_node
+    async def from_model(model: MinigameResult, expand: Expansion = EXPAND_ALL) -> "MinigameResultResponse":
+        action = await load_relation(expand, "action", model.get_action)
         schema = MinigameResultResponse(
             id=model.id,
             created_at=model.created_at,
             updated_at=model.updated_at,
-            action=ActionResponse.from_model(action),
+            action_id=model.action_id,
+            action=await build_relation(ActionResponse, action, expand.child("action")),
             type=model.type,
             result=model.result,
             details=model.details,
@@ -598,30 +909,35 @@ class MinigameResultResponse(BaseModel):
         return schema
 
 
-# Resolve forward refs
-UserPayload.model_rebuild()
-UserResponse.model_rebuild()
-WorldPayload.model_rebuild()
+# === Sync ===
+
+class TombstoneResponse(BaseModel):
+    collection: str  # "contexts", "blueprints" or "objects"
+    id: str
+    removed_at: datetime
+
+    @staticmethod
+    async def from_model(model: Tombstone) -> "TombstoneResponse":
+        return TombstoneResponse(collection=model.collection, id=model.document_id, removed_at=model.created_at)
+
+
+class WorldChangesResponse(BaseModel):
+    world_id: str
+    since: datetime
+    until: datetime  # Pass as the next `since`
+    world: Optional[WorldResponse] = None  # The world's own fields and ID lists, if they changed
+    contexts: List[ContextResponse] = []
+    blueprints: List[BlueprintResponse] = []
+    objects: List[ObjectResponse] = []
+    tombstones: List[TombstoneResponse] = []
+
+
+# Resolve forward refs (only the responses that reference later classes need it)
 WorldResponse.model_rebuild()
-CampaignPayload.model_rebuild()
 CampaignResponse.model_rebuild()
-MemberPayload.model_rebuild()
 MemberResponse.model_rebuild()
-ContextPayload.model_rebuild()
-ContextResponse.model_rebuild()
-BlueprintPayload.model_rebuild()
-BlueprintResponse.model_rebuild()
-ObjectPayload.model_rebuild()
-ObjectResponse.model_rebuild()
-ObjectivePayload.model_rebuild()
-ObjectiveResponse.model_rebuild()
-EraPayload.model_rebuild()
 EraResponse.model_rebuild()
-ChapterPayload.model_rebuild()
 ChapterResponse.model_rebuild()
-EncounterPayload.model_rebuild()
 EncounterResponse.model_rebuild()
-ActionPayload.model_rebuild()
 ActionResponse.model_rebuild()
-MinigameResultPayload.model_rebuild()
 MinigameResultResponse.model_rebuild()
@@ -0,0 +1,354 @@
+import os
+import zlib
+import asyncio
+import logging
+import contextvars
+from collections import defaultdict
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from pydantic_core import to_jsonable_python
+
+from backend.database.repos import (
+    users_repo, worlds_repo, context_repo, blueprints_repo, objects_repo, world_views_repo, world_view_shards_repo,
+)
+from backend.models import BaseDocument, World, WorldView, WorldViewShard
+from backend.routes._schemas import EXPAND_NONE, WorldResponse, ContextResponse, BlueprintResponse, ObjectResponse, UserResponse
+
+logger = logging.getLogger(__name__)
+
+# Materialised world views are only kept, and only served, with WORLD_VIEWS=1
+WORLD_VIEWS_ENABLED = os.environ.get("WORLD_VIEWS", "0") == "1"
+
+# Entries per shard when a view is built; a 1 MiB Firestore document holds a few hundred
+VIEW_SHARD_ENTRIES = int(os.environ.get("WORLD_VIEW_SHARD_ENTRIES", "200"))
+
+# Views older than this are rebuilt on read, bounding how long a write that bypassed the repos goes unseen
+VIEW_MAX_AGE = timedelta(seconds=float(os.environ.get("WORLD_VIEW_MAX_AGE", "3600")))
+
+# Bump when a library response schema changes; views built for the old shape are rebuilt on read
+VIEW_VERSION = 1
+
+# IDs per array-contains-any lookup of the views embedding changed documents (Firestore's limit)
+VIEW_QUERY_CHUNK = 30
+
+# Locks shared by all views; a view's lock is picked by hashing its ID
+VIEW_LOCK_STRIPES = 64
+
+KIND_PREFIXES = {"contexts": "c", "blueprints": "b", "objects": "o", "users": "u"}
+VIEW_ID_FIELDS = {"contexts": "context_ids", "blueprints": "blueprint_ids", "objects": "object_ids", "users": "user_ids"}
+KIND_REPOS = {"contexts": context_repo, "blueprints": blueprints_repo, "objects": objects_repo, "users": users_repo}
+KIND_RESPONSES = {"contexts": ContextResponse, "blueprints": BlueprintResponse, "objects": ObjectResponse, "users": UserResponse}
+
+Documents = Dict[str, List[BaseDocument]]
+
+
+# ----------------
+# Entries
+# ----------------
+
+def entry_key(kind: str, id: str) -> str:
+    return f"{KIND_PREFIXES[kind]}_{id}"
+
+def shard_id(world_id: str, index: int) -> str:
+    return f"{world_id}_{index}"
+
+def shard_of(view: WorldView, key: str) -> str:
+    return shard_id(view.id, zlib.crc32(key.encode()) % view.shard_count)
+
+async def build_entry(kind: str, document: BaseDocument) -> Dict[str, Any]:
+    """
+    Builds one embedded document's response with its relations left as IDs; they are spliced in on read,
+    so a changed creator or blueprint is rewritten in one entry rather than in everything embedding it.
+    """
+    schema = await KIND_RESPONSES[kind].from_model(document, EXPAND_NONE)
+    return schema.model_dump(mode="json")
+
+async def build_entries(documents: Documents) -> Dict[str, Dict[str, Any]]:
+    keys = [entry_key(kind, document.id) for kind, docs in documents.items() for document in docs]
+    built = await asyncio.gather(*[build_entry(kind, document) for kind, docs in documents.items() for document in docs])
+    return dict(zip(keys, built))
+
+async def with_links(documents: Documents, present: Dict[str, set], user_ids: Tuple[str, ...] = ()) -> Documents:
+    """
+    Adds the blueprints objects link to and the creators of everything in `documents`, in two batched reads.
+    Documents already in `present` are not read again.
+    """
+    blueprints = list(documents.get("blueprints", []))
+    objects = documents.get("objects", [])
+    known = present["blueprints"] | {b.id for b in blueprints}
+    blueprints += await blueprints_repo.get_many(list(dict.fromkeys(o.blueprint_id for o in objects if o.blueprint_id not in known)))
+
+    users = list(documents.get("users", []))
+    known = present["users"] | {u.id for u in users}
+    creator_ids = [*user_ids, *(b.creator_id for b in blueprints), *(o.creator_id for o in objects)]
+    users += await users_repo.get_many([id for id in dict.fromkeys(creator_ids) if id not in known])
+    return {**documents, "blueprints": blueprints, "users": users}
+
+def assemble(view: WorldView, entries: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Returns the WorldResponse JSON for a view, resolving its relations from the flat entries.
+    Missing or deleted documents are left out of lists, as the response builders do.
+    """
+    def entry(kind: str, id: str) -> Optional[Dict[str, Any]]:
+        return entries.get(entry_key(kind, id)) or None  # Deleted documents leave an empty entry
+
+    def blueprint(id: str) -> Optional[Dict[str, Any]]:
+        found = entry("blueprints", id)
+        return {**found, "creator": entry("users", found["creator_id"])} if found else None
+
+    def object(id: str) -> Optional[Dict[str, Any]]:
+        found = entry("objects", id)
+        return {**found, "creator": entry("users", found["creator_id"]), "blueprint": blueprint(found["blueprint_id"])} if found else None
+
+    world = view.world
+    return {
+        **world,
+        "creator": entry("users", world["creator_id"]),
+        "contexts": [c for c in (entry("contexts", id) for id in world["context_ids"]) if c],
+        "blueprints": [b for b in (blueprint(id) for id in world["blueprint_ids"]) if b],
+        "objects": [o for o in (object(id) for id in world["object_ids"]) if o],
+    }
+
+
+# ----------------
+# Building & Reading
+# ----------------
+
+async def world_fields(world: World) -> Dict[str, Any]:
+    return (await WorldResponse.from_model(world, EXPAND_NONE)).model_dump(mode="json")
+
+def is_stale(view: WorldView, world: World) -> bool:
+    """
+    A view is rebuilt when its format is old, it missed a change to the world itself, or it has outlived VIEW_MAX_AGE.
+    """
+    return (
+        view.version != VIEW_VERSION
+        or view.world.get("updated_at") != to_jsonable_python(world.updated_at)
+        or datetime.now(timezone.utc) - view.created_at > VIEW_MAX_AGE
+    )
+
+async def delete_view(view: WorldView):
+    await world_view_shards_repo.delete_many([shard_id(view.id, index) for index in range(view.shard_count)])
+    await world_views_repo.delete(view.id)
+
+async def build_view(world: World) -> Tuple[WorldView, List[WorldViewShard]]:
+    """
+    Builds and stores the whole view of a world, replacing any previous one.
+    """
+    contexts, blueprints, objects = await asyncio.gather(world.get_context(), world.get_blueprints(), world.get_objects())
+    empty = {kind: set() for kind in KIND_PREFIXES}
+    documents = await with_links({"contexts": contexts, "blueprints": blueprints, "objects": objects}, empty, (world.creator_id,))
+    entries = await build_entries(documents)
+
+    view = WorldView(
+        id=world.id,
+        version=VIEW_VERSION,
+        shard_count=max(1, -(-len(entries) // VIEW_SHARD_ENTRIES)),
+        world=await world_fields(world),
+        **{VIEW_ID_FIELDS[kind]: list(dict.fromkeys(d.id for d in docs)) for kind, docs in documents.items()},
+    )
+    shards = {shard_id(world.id, index): WorldViewShard(id=shard_id(world.id, index), world_id=world.id) for index in range(view.shard_count)}
+    for key, entry in entries.items():
+        shards[shard_of(view, key)].entries[key] = entry
+
+    old = await world_views_repo.get(world.id)
+    if old:
+        await delete_view(old)
+    if not await world_view_shards_repo.add_many(list(shards.values())) or not await world_views_repo.add_many([view]):
+        logger.error(f"Error storing the view of world {world.id}")
+    return view, list(shards.values())
+
+async def read_world_view(world: World) -> Tuple[Dict[str, Any], List[BaseDocument]]:
+    """
+    Returns the GET /world/{id} response JSON from the world's materialised view, building the view first if
+    it is missing or stale, together with the view documents read (for the ETag).
+    Changes still queued by earlier writes are applied first, so a client reads its own writes.
+    """
+    await view_changes.drain()
+    async with view_changes.lock(world.id):
+        view = await world_views_repo.get(world.id)
+        if view is None or is_stale(view, world):
+            view, shards = await build_view(world)
+        else:
+            shards = await world_view_shards_repo.get_many([shard_id(view.id, index) for index in range(view.shard_count)])
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    for shard in shards:
+        entries.update(shard.entries)
+    return assemble(view, entries), [view, *shards]
+
+
+# ----------------
+# Incremental Updates
+# ----------------
+
+async def write_entries(view: WorldView, entries: Dict[str, Dict[str, Any]]):
+    """
+    Writes entries into their shards; only the changed entry paths are sent to storage.
+    """
+    by_shard: Dict[str, Dict[str, Dict[str, Any]]] = defaultdict(dict)
+    for key, entry in entries.items():
+        by_shard[shard_of(view, key)][key] = entry
+    for shard in await world_view_shards_repo.get_many(list(by_shard)):
+        shard.entries.update(by_shard[shard.id])
+        await world_view_shards_repo.update(shard)
+
+async def add_documents(view: WorldView, documents: Documents, removed: Optional[Dict[str, Dict[str, Any]]] = None):
+    """
+    Writes entries for `documents` and for any blueprints and creators they link to that the view lacks,
+    together with the emptied `removed` entries, then records the new IDs on the view.
+    """
+    present = {kind: set(getattr(view, field)) for kind, field in VIEW_ID_FIELDS.items()}
+    documents = await with_links(documents, present)
+    await write_entries(view, {**(removed or {}), **await build_entries(documents)})
+    for kind, docs in documents.items():
+        ids = getattr(view, VIEW_ID_FIELDS[kind])
+        ids += [d.id for d in docs if d.id not in present[kind] and d.id not in ids]
+    await world_views_repo.update(view)
+
+async def views_embedding(kind: str, ids: List[str]) -> List[WorldView]:
+    """
+    Returns the views embedding any of `ids`, one array-contains-any query per VIEW_QUERY_CHUNK IDs.
+    """
+    field = VIEW_ID_FIELDS[kind]
+    found: Dict[str, WorldView] = {}
+    for views in await asyncio.gather(*[
+        world_views_repo.query([(field, "array-contains-any", ids[start:start + VIEW_QUERY_CHUNK])])
+        for start in range(0, len(ids), VIEW_QUERY_CHUNK)
+    ]):
+        for view in views:
+            view.mark_clean()
+            found.setdefault(view.id, view)
+    return list(found.values())
+
+async def apply_entry_changes(kind: str, ids: List[str]):
+    """
+    Rewrites the entries of changed documents in every view embedding them, with one lookup of the
+    views and one read of the documents for the whole batch. Deleted documents leave an empty entry.
+    """
+    views = await views_embedding(kind, ids)
+    if not views:
+        return
+    documents = {document.id: document for document in await KIND_REPOS[kind].get_many(ids)}
+    for view in views:
+        members = set(getattr(view, VIEW_ID_FIELDS[kind]))
+        embedded = [id for id in ids if id in members]
+        async with view_changes.lock(view.id):
+            await add_documents(
+                view,
+                {kind: [documents[id] for id in embedded if id in documents]},
+                {entry_key(kind, id): {} for id in embedded if id not in documents},
+            )
+
+async def apply_world_changes(ids: List[str]):
+    """
+    Keeps views in step with their worlds: the worlds' own fields, and entries for members added to them.
+    Removed members drop out of the response with the world's ID lists; their entries stay until the next rebuild.
+    """
+    views = await world_views_repo.get_many(ids)
+    if not views:
+        return
+    worlds = {world.id: world for world in await worlds_repo.get_many([view.id for view in views])}
+    for view in views:
+        async with view_changes.lock(view.id):
+            world = worlds.get(view.id)
+            if world is None:
+                await delete_view(view)
+                continue
+
+            added = {}
+            for kind in ("contexts", "blueprints", "objects"):
+                present = set(getattr(view, VIEW_ID_FIELDS[kind]))
+                added[kind] = [doc_id for doc_id in getattr(world, VIEW_ID_FIELDS[kind]) if doc_id not in present]
+            contexts, blueprints, objects = await asyncio.gather(*[KIND_REPOS[kind].get_many(ids) for kind, ids in added.items()])
+
+            view.world = await world_fields(world)
+            await add_documents(view, {"contexts": contexts, "blueprints": blueprints, "objects": objects})
+
+
+class ViewChanges:
+    """
+    Queues the documents repository writes changed and applies them to the views in a background task,
+    so writes return without waiting on view maintenance. Queued IDs are coalesced per collection and
+    applied in batches. State is bound to the running event loop and rebuilt if the loop changes.
+    """
+
+    def __init__(self):
+        self.pending: Dict[str, Set[str]] = defaultdict(set)  # "worlds" or a KIND_REPOS kind -> changed IDs
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._wake: Optional[asyncio.Event] = None
+        self._applying: Optional[asyncio.Lock] = None
+        self._locks: List[asyncio.Lock] = []
+
+    def _bind(self):
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop, self._worker = loop, None
+            self._wake, self._applying = asyncio.Event(), asyncio.Lock()
+            self._locks = [asyncio.Lock() for _ in range(VIEW_LOCK_STRIPES)]
+        if self._worker is None or self._worker.done():
+            # A fresh context, so the worker's reads are not counted against the request that started it
+            self._worker = loop.create_task(self._run(), context=contextvars.Context())
+
+    def lock(self, view_id: str) -> asyncio.Lock:
+        """
+        Returns the lock serialising changes to a view within this process.
+        """
+        self._bind()
+        return self._locks[zlib.crc32(view_id.encode()) % VIEW_LOCK_STRIPES]
+
+    def enqueue(self, kind: str, ids: List[str]):
+        self.pending[kind].update(ids)
+        self._bind()
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            await self.drain()
+
+    async def drain(self):
+        """
+        Applies every queued change, waiting for a batch already being applied. Must not be called while holding a view lock.
+        """
+        self._bind()
+        if not self.pending and not self._applying.locked():
+            return
+        async with self._applying:
+            while self.pending:
+                kind = next(iter(self.pending))
+                ids = self.pending.pop(kind)
+                try:
+                    if kind == "worlds":
+                        await apply_world_changes(list(ids))
+                    else:
+                        await apply_entry_changes(kind, list(ids))
+                except asyncio.CancelledError:
+                    self.pending[kind] |= ids
+                    raise
+                except Exception as e:
+                    logger.error(f"Updating world views for {len(ids)} changed {kind} failed: {e}")
+
+
+view_changes = ViewChanges()
+
+
+def queue_changes(kind: str):
+    """
+    Returns a change listener that queues the changed IDs of one collection for view maintenance.
+    """
+    async def on_change(ids: List[str]):
+        view_changes.enqueue(kind, ids)
+
+    return on_change
+
+def install_world_views():
+    """
+    Registers the listeners that keep materialised world views current on every repository write.
+    """
+    for kind in KIND_PREFIXES:
+        KIND_REPOS[kind].on_change(queue_changes(kind))
+    worlds_repo.on_change(queue_changes("worlds"))
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from backend.routes.auth_routes import get_current_user, verify_password, hash_password
 from backend.database.repos import users_repo
 from backend.models import User
+from backend.routes._responses import trusted
 from backend.routes._schemas import UserPayload, UserResponse
 
 # === Config ===
@@ -12,29 +14,29 @@ router = APIRouter()
 
 # === Endpoints ===
 @router.get("/account", response_model=UserResponse)
-def get_profile(current_user: User = Depends(get_current_user)):
+async def get_profile(current_user: User = Depends(get_current_user)):
     """
     Get the profile of the currently logged-in user.
     """
-    return UserResponse.from_model(current_user)
+    return trusted(await UserResponse.from_model(current_user))
 
 @router.post("/account", response_model=UserResponse)
-def update_profile(payload: UserPayload, current_user: User = Depends(get_current_user)):
+async def update_profile(payload: UserPayload, current_user: User = Depends(get_current_user)):
     """
     Update the profile of the currently logged-in user.
     """
     current_user = payload.to_model(current_user)
 
     if payload.password_current and payload.password_new:
-        if not verify_password(payload.password_current, current_user.password_hash):
+        if not await run_in_threadpool(verify_password, payload.password_current, current_user.password_hash):
             raise HTTPException(status_code=400, detail="Current password is incorrect")
 
-        if verify_password(payload.password_new, current_user.password_hash):
+        if await run_in_threadpool(verify_password, payload.password_new, current_user.password_hash):
             raise HTTPException(status_code=400, detail="New password must be different from the current password")
 
-        current_user.password_hash = hash_password(payload.password_new)
+        current_user.password_hash = await run_in_threadpool(hash_password, payload.password_new)
 
-    if not users_repo.update(current_user):
+    if not await users_repo.update(current_user):
         raise HTTPException(status_code=400, detail="Failed to update user profile")
 
-    return UserResponse.from_model(current_user)
\ No newline at end of file
+    return trusted(await UserResponse.from_model(current_user))
\ No newline at end of file
@@ -1,11 +1,13 @@
 import os
 from fastapi import APIRouter, Depends, HTTPException, status, Cookie, Response
+from fastapi.concurrency import run_in_threadpool
 from passlib.context import CryptContext # type: ignore
 from jose import jwt, JWTError, ExpiredSignatureError # type: ignore
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from backend.database.repos import users_repo
 from backend.models import User
+from backend.routes._responses import trusted
 from backend.routes._schemas import UserPayload, UserResponse
 
 # === Config ===
@@ -99,7 +101,7 @@ def save_tokens(response: Response, access_token: str, refresh_token: str):
     
 # === Endpoints ===
 @router.post("/login")
-def login(payload: UserPayload, response: Response):
+async def login(payload: UserPayload, response: Response):
     """
     Authenticate user and return access and refresh tokens.
     The user must provide valid email and password.
@@ -107,11 +109,11 @@ def login(payload: UserPayload, response: Response):
     if( not payload.email or not payload.password_current):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email and password are required.")
     
-    user = users_repo.query([('email','==', payload.email.strip().lower())])[0]
+    user = (await users_repo.query([('email','==', payload.email.strip().lower())]))[0]
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Email does not exist.")
     
-    if not verify_password(payload.password_current, user.password_hash):
+    if not await run_in_threadpool(verify_password, payload.password_current, user.password_hash):
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Incorrect password.")
     
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -122,7 +124,7 @@ def login(payload: UserPayload, response: Response):
     save_tokens(response, access_token, refresh_token)
     
 @router.post("/register")
-def register(payload: UserPayload, response: Response):
+async def register(payload: UserPayload, response: Response):
     """
     Register a new user and return access and refresh tokens.
     The user must provide a unique username and email.
@@ -130,16 +132,16 @@ def register(payload: UserPayload, response: Response):
     if not payload.username or not payload.email or not payload.password_current:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Username, email, and password are required.")
 
-    if len(users_repo.query([('email','==', payload.email.strip().lower())])) > 0:
+    if len(await users_repo.query([('email','==', payload.email.strip().lower())])) > 0:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
     
     user = User(
         username=payload.username,
         email=payload.email,
-        password_hash=hash_password(payload.password_current)
+        password_hash=await run_in_threadpool(hash_password, payload.password_current)
     )
 
-    id = users_repo.add(user)
+    id = await users_repo.add(user)
     if not id:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="User registration failed")
     
@@ -151,7 +153,7 @@ def register(payload: UserPayload, response: Response):
     save_tokens(response, access_token, refresh_token)
     
 @router.post("/refresh")
-def refresh_token(response: Response, refresh_token: str = Cookie(None)):
+async def refresh_token(response: Response, refresh_token: str = Cookie(None)):
     """
     Refresh the access token using a valid refresh token from the cookie.
     The refresh token must be valid and not expired.
@@ -167,7 +169,7 @@ def refresh_token(response: Response, refresh_token: str = Cookie(None)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid refresh token")
     
-    user = users_repo.get(user_id)
+    user = await users_repo.get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -177,7 +179,7 @@ def refresh_token(response: Response, refresh_token: str = Cookie(None)):
     save_tokens(response, access_token, refresh_token)
     
 @router.post("/logout")
-def logout(response: Response):
+async def logout(response: Response):
     """
     Log out the user by clearing the access and refresh tokens.
     This will remove the cookies set for authentication.
@@ -187,7 +189,7 @@ def logout(response: Response):
     return {"detail": "Logged out successfully"}
 
 @router.post("/authenticate", response_model=UserResponse)
-def authenticate(response: Response, access_token: str = Cookie(None)):
+async def authenticate(response: Response, access_token: str = Cookie(None)):
     """
     Authenticate the user using the access token from the cookie.
     Returns user details if the token is valid.
@@ -203,18 +205,18 @@ def authenticate(response: Response, access_token: str = Cookie(None)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid access token")
     
-    user = users_repo.get(user_id)
+    user = await users_repo.get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    return UserResponse.from_model(user)
+    return trusted(await UserResponse.from_model(user))
 
 # === Other ===
 from fastapi.security import OAuth2PasswordBearer
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="login")
 
-def get_current_user(access_token: str = Cookie(None)):
+async def get_current_user(access_token: str = Cookie(None)):
     """
     Dependency to get the current authenticated user from the JWT access token.
     Raises 401 if invalid or expired.
@@ -227,7 +229,7 @@ def get_current_user(access_token: str = Cookie(None)):
     if not user_id:
         raise HTTPException(status_code=401, detail="Invalid access token")
     
-    user = users_repo.get(user_id)
+    user = await users_repo.get(user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -1,13 +1,38 @@
 import uuid
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+from datetime import datetime, timezone, timedelta
+from typing import Optional, List, Literal, Tuple, Union, AsyncIterator, Callable, Awaitable
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from backend.routes._archive import export_world, compress, zstd_available, read_archive, WorldImporter
+from backend.database.loader import RequestLoader, begin_request, end_request, current_loader
 from backend.routes.auth_routes import get_current_user
-from backend.database.repos import worlds_repo, campaigns_repo, blueprints_repo, context_repo, objects_repo
-from backend.models import User, World, WorldSetting, Blueprint, Context, Object
-from backend.routes._schemas import ContextResponse, ContextPayload, ObjectResponse, WorldPayload, WorldResponse, BlueprintResponse, BlueprintPayload, ObjectPayload, ObjectResponse
+from backend.database.repos import worlds_repo, campaigns_repo, blueprints_repo, context_repo, objects_repo, tombstones_repo, world_additions_repo
+from backend.models import User, World, WorldSetting, Blueprint, Context, Object, Tombstone, WorldAddition
+from backend.routes._responses import trusted
+from backend.routes._etags import make_etag, conditional, world_documents, blueprint_documents, object_documents
+from backend.routes._views import WORLD_VIEWS_ENABLED, read_world_view
+from backend.routes._schemas import Expansion, EXPAND_ALL, EXPAND_NONE, ContextResponse, ContextPayload, ObjectResponse, WorldPayload, WorldResponse, WorldSummary, WorldImportResponse, WorldChangesResponse, TombstoneResponse, BlueprintResponse, BlueprintSummary, BlueprintPayload, ObjectPayload, ObjectResponse
 
 # === Config ===
 router = APIRouter()
 
+MAX_PAGE_SIZE = 100
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+# Delta syncs hand back a watermark this far in the past, so writes stamped just before a sync
+# but committed after it are picked up by the next one; clients may see a change twice
+SYNC_OVERLAP = timedelta(seconds=5)
+
+# World ID lists by the collection name tombstones use
+WORLD_LISTS = {"contexts": "context_ids", "blueprints": "blueprint_ids", "objects": "object_ids"}
+SYNC_REPOS = {"contexts": context_repo, "blueprints": blueprints_repo, "objects": objects_repo}
+
+# Member IDs per `in` query when a delta sync looks for changed members (Firestore's limit)
+SYNC_ID_CHUNK = 30
+
 # === Defaults ===
 DefaultWorld = World(
     name="My World",
@@ -39,24 +64,147 @@ DefaultObject = Object(
 )
 
 # === Helper Functions ===
+async def get_page(repo, filters: list, response: Response, limit: Optional[int], cursor: Optional[str], select: Optional[list] = None) -> list:
+    """
+    Fetches one page from a repository and exposes the next-page cursor as a response header.
+    """
+    try:
+        items, next_cursor = await repo.page(filters, limit, cursor, select)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
+async def changed_members(repo, ids: List[str], since: datetime) -> list:
+    """
+    Returns the documents among `ids` updated after `since`, whoever owns them, one query per SYNC_ID_CHUNK IDs.
+    """
+    chunks = [ids[start:start + SYNC_ID_CHUNK] for start in range(0, len(ids), SYNC_ID_CHUNK)]
+    results = await asyncio.gather(*[repo.query([("id", "in", chunk), ("updated_at", ">", since)]) for chunk in chunks])
+    return [document for documents in results for document in documents]
+
+async def bury(collection: str, ids: List[str], creator_id: str, world_id: Optional[str] = None) -> bool:
+    """
+    Records tombstones for documents that were deleted, or removed from `world_id`, so delta syncs report them.
+    """
+    return await tombstones_repo.add_many([
+        Tombstone(collection=collection, document_id=id, creator_id=creator_id, world_id=world_id) for id in ids
+    ])
+
+def get_expansion(expand: Optional[str] = Query(None, description="Relations to embed, e.g. blueprints,objects.blueprint; others are returned as IDs. Omit to embed everything.")) -> Expansion:
+    return Expansion.parse(expand)
+
+def wants_ndjson(request: Request) -> bool:
+    return NDJSON_MEDIA_TYPE in request.headers.get("accept", "")
+
+def stream_ndjson(items: AsyncIterator, build: Callable[..., Awaitable[BaseModel]], keep: Tuple[str, ...] = ("users",)) -> StreamingResponse:
+    """
+    Streams one JSON response per line, building each as its document arrives.
+    Every line shares the request's loader. Documents in the `keep` collections, such as the current user and
+    creators, stay loaded for the whole stream; everything else is released once its line is sent.
+    """
+    async def lines():
+        loader = current_loader() or RequestLoader()
+        async for item in items:
+            token = begin_request(loader)
+            try:
+                schema = await build(item)
+            finally:
+                end_request(token)
+                loader.release(keep)
+            yield schema.model_dump_json() + "\n"
+
+    return StreamingResponse(lines(), media_type=NDJSON_MEDIA_TYPE)
 
 
 # === World Endpoints ===
-@router.get("/worlds", response_model=list[WorldResponse])
-def all_worlds(current_user: User = Depends(get_current_user)):
-    worlds = worlds_repo.query([('creator_id', '==', current_user.id)])
-    return [WorldResponse.from_model(world) for world in worlds]
+@router.get("/worlds", response_model=Union[list[WorldSummary], list[WorldResponse]])
+async def all_worlds(
+    request: Request,
+    response: Response,
+    view: Literal["summary", "full"] = "summary",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    expand: Expansion = Depends(get_expansion),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Lists the user's worlds. With `Accept: application/x-ndjson` every world is streamed one per line instead of paged.
+    """
+    filters = [('creator_id', '==', current_user.id)]
+    if wants_ndjson(request):
+        if view == "full":
+            return stream_ndjson(worlds_repo.stream(filters), lambda world: WorldResponse.from_model(world, expand), ("users", "blueprints"))
+        return stream_ndjson(worlds_repo.stream(filters, WorldSummary.source_fields), WorldSummary.from_model)
+
+    if view == "full":
+        worlds = await get_page(worlds_repo, filters, response, limit, cursor)
+        return trusted(await asyncio.gather(*[WorldResponse.from_model(world, expand) for world in worlds]), response)
+
+    worlds = await get_page(worlds_repo, filters, response, limit, cursor, WorldSummary.source_fields)
+    return trusted(await asyncio.gather(*[WorldSummary.from_model(world) for world in worlds]), response)
+
+@router.get("/world/{id}/export")
+async def world_export(id: str, compression: Literal["none", "zstd"] = "none", current_user: User = Depends(get_current_user)):
+    """
+    Downloads a world and everything it references as an NDJSON archive, streamed as it is read.
+    """
+    world = await worlds_repo.get(id)
+    if not world:
+        raise HTTPException(status_code=404, detail="World not found")
+    if world.creator_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You do not have permission to export this world")
+
+    body = export_world(world)
+    filename = f"world-{world.id}.ndjson"
+    media_type = NDJSON_MEDIA_TYPE
+    if compression == "zstd":
+        if not zstd_available():
+            raise HTTPException(status_code=400, detail="zstd compression is not available")
+        body = compress(body)
+        filename += ".zst"
+        media_type = "application/zstd"
+
+    return StreamingResponse(body, media_type=media_type, headers={"Content-Disposition": f'attachment; filename="{filename}"'})
+
+@router.post("/world/import", response_model=WorldImportResponse)
+async def world_import(request: Request, current_user: User = Depends(get_current_user)):
+    """
+    Recreates an exported world (plain or zstd) under new IDs owned by the current user.
+    The body is read and written in batches as it arrives.
+    """
+    importer = WorldImporter(current_user)
+    try:
+        async for record in read_archive(request.stream()):
+            await importer.add(record)
+        world = await importer.finish()
+    except ValueError as e:
+        await importer.abort()
+        raise HTTPException(status_code=400, detail=f"Invalid archive: {e}")
+    except RuntimeError as e:
+        await importer.abort()
+        raise HTTPException(status_code=500, detail=str(e))
+    except Exception:
+        await importer.abort()
+        raise
+
+    return WorldImportResponse(id=world.id, **importer.counts)
 
 @router.get("/world/{id}", response_model=WorldResponse)
-def world_get(id: str, current_user: User = Depends(get_current_user)):
+async def world_get(id: str, request: Request, response: Response, current_user: User = Depends(get_current_user), expand: Expansion = Depends(get_expansion)):
+    """
+    Answers 304 when If-None-Match holds the current ETag, which covers the world and every document it embeds.
+    With WORLD_VIEWS=1 the full response is read from the world's materialised view instead of being built.
+    """
     if id == "new":
         world = DefaultWorld.model_copy(deep=True)
         
         world.creator_id = current_user.id
         
-        return WorldResponse.from_model(world)
+        return trusted(await WorldResponse.from_model(world, expand))
     else:
-        world = worlds_repo.get(id)
+        world = await worlds_repo.get(id)
         
         if not world:
             raise HTTPException(status_code=404, detail="World not found")
@@ -64,19 +212,32 @@ def world_get(id: str, current_user: User = Depends(get_current_user)):
         if world.creator_id != current_user.id:
             raise HTTPException(status_code=403, detail="You do not have permission to access this world")
 
-        return WorldResponse.from_model(world)
+        if WORLD_VIEWS_ENABLED and expand is EXPAND_ALL:
+            body, sources = await read_world_view(world)
+            etag = make_etag([world, *sources], expand)
+            if unchanged := conditional(request, etag):
+                return unchanged
+            response.headers["ETag"] = etag
+            return trusted(body, response)
+
+        etag = make_etag(await world_documents(world, expand), expand)
+        if unchanged := conditional(request, etag):
+            return unchanged
+        response.headers["ETag"] = etag
+
+        return trusted(await WorldResponse.from_model(world, expand), response)
 
 @router.post("/world/{id}", response_model=WorldResponse)
-def world_post(id: str, payload: WorldPayload, current_user: User = Depends(get_current_user)):    
+async def world_post(id: str, payload: WorldPayload, current_user: User = Depends(get_current_user), expand: Expansion = Depends(get_expansion)):    
     if id == "new":
         world = payload.to_model(DefaultWorld.model_copy(deep=True))
         
         world.creator_id = current_user.id
         
-        if not worlds_repo.add(world):
+        if not await worlds_repo.add(world):
             raise HTTPException(status_code=400, detail="Failed to create world")
     else:
-        world = worlds_repo.get(id)
+        world = await worlds_repo.get(id)
         
         if not world:
             raise HTTPException(status_code=404, detail="World not found")
@@ -84,156 +245,271 @@ def world_post(id: str, payload: WorldPayload, current_user: User = Depends(get_
         if world.creator_id != current_user.id:
             raise HTTPException(status_code=403, detail="You do not have permission to update this world")
 
+        before = {collection: set(getattr(world, field)) for collection, field in WORLD_LISTS.items()}
         world = payload.to_model(world)
         
-        if not worlds_repo.update(world):
+        if not await worlds_repo.update(world):
             raise HTTPException(status_code=400, detail="Failed to update world")
 
-    return WorldResponse.from_model(world)
+        await asyncio.gather(*[
+            task
+            for collection, field in WORLD_LISTS.items()
+            for task in (
+                bury(collection, list(before[collection] - set(getattr(world, field))), world.creator_id, world.id),
+                world_additions_repo.add_many([
+                    WorldAddition(collection=collection, document_id=doc_id, world_id=world.id)
+                    for doc_id in getattr(world, field) if doc_id not in before[collection]
+                ]),
+            )
+        ])
+
+    return trusted(await WorldResponse.from_model(world, expand))
+
+@router.get("/world/{id}/changes", response_model=WorldChangesResponse)
+async def world_changes(
+    id: str,
+    since: datetime,
+    expand: str = Query("", description="Relations to embed in changed documents; by default they are returned as IDs."),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Returns the world's contexts, blueprints and objects updated after `since`, and tombstones for those deleted
+    or removed from it since. Pass the returned `until` as the next `since`.
+    """
+    until = datetime.now(timezone.utc) - SYNC_OVERLAP
+    since = since.replace(tzinfo=timezone.utc) if since.tzinfo is None else since.astimezone(timezone.utc)
+
+    world = await worlds_repo.get(id)
+    if not world:
+        raise HTTPException(status_code=404, detail="World not found")
+    if world.creator_id != current_user.id:
+        raise HTTPException(status_code=403, detail="You do not have permission to access this world")
+
+    members = {collection: set(getattr(world, field)) for collection, field in WORLD_LISTS.items()}
+    contexts, blueprints, objects, tombstones, additions = await asyncio.gather(
+        *[changed_members(SYNC_REPOS[collection], getattr(world, field), since) for collection, field in WORLD_LISTS.items()],
+        tombstones_repo.query([("creator_id", "==", world.creator_id), ("created_at", ">", since)]),
+        world_additions_repo.query([("world_id", "==", world.id), ("created_at", ">", since)]),
+    )
+    # Members added since `since` are sent even when they have not changed themselves
+    sent = {"contexts": contexts, "blueprints": blueprints, "objects": objects}
+    unsent = {}
+    for collection, documents in sent.items():
+        sent_ids = {document.id for document in documents}
+        unsent[collection] = list(dict.fromkeys(
+            a.document_id for a in additions
+            if a.collection == collection and a.document_id in members[collection] and a.document_id not in sent_ids
+        ))
+    added = await asyncio.gather(*[SYNC_REPOS[collection].get_many(ids) for collection, ids in unsent.items()])
+    contexts, blueprints, objects = [sent[collection] + documents for collection, documents in zip(unsent, added)]
+    # Deletions are reported for every world of the owner; removals only for this world, unless re-added since
+    tombstones = [
+        t for t in tombstones
+        if t.world_id is None or (t.world_id == world.id and t.document_id not in members.get(t.collection, ()))
+    ]
+
+    expansion = Expansion.parse(expand)
+    return trusted(WorldChangesResponse(
+        world_id=world.id,
+        since=since,
+        until=until,
+        world=await WorldResponse.from_model(world, EXPAND_NONE) if world.updated_at and world.updated_at > since else None,
+        contexts=await asyncio.gather(*[ContextResponse.from_model(c) for c in contexts]),
+        blueprints=await asyncio.gather(*[BlueprintResponse.from_model(bp, expansion.child("blueprints")) for bp in blueprints]),
+        objects=await asyncio.gather(*[ObjectResponse.from_model(o, expansion.child("objects")) for o in objects]),
+        tombstones=await asyncio.gather(*[TombstoneResponse.from_model(t) for t in tombstones]),
+    ))
 
 # === Blueprint Endpoints ===
-@router.get("/blueprints", response_model=list[BlueprintResponse])
-def all_blueprints(current_user: User = Depends(get_current_user)):
-    blueprints = blueprints_repo.query([('creator_id', '==', current_user.id)])
-    return [BlueprintResponse.from_model(bp) for bp in blueprints]
+@router.get("/blueprints", response_model=Union[list[BlueprintSummary], list[BlueprintResponse]])
+async def all_blueprints(
+    request: Request,
+    response: Response,
+    view: Literal["summary", "full"] = "summary",
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    expand: Expansion = Depends(get_expansion),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Lists the user's blueprints. With `Accept: application/x-ndjson` every blueprint is streamed one per line instead of paged.
+    """
+    filters = [('creator_id', '==', current_user.id)]
+    if wants_ndjson(request):
+        if view == "full":
+            return stream_ndjson(blueprints_repo.stream(filters), lambda bp: BlueprintResponse.from_model(bp, expand))
+        return stream_ndjson(blueprints_repo.stream(filters, BlueprintSummary.source_fields), BlueprintSummary.from_model)
+
+    if view == "full":
+        blueprints = await get_page(blueprints_repo, filters, response, limit, cursor)
+        return trusted(await asyncio.gather(*[BlueprintResponse.from_model(bp, expand) for bp in blueprints]), response)
+
+    blueprints = await get_page(blueprints_repo, filters, response, limit, cursor, BlueprintSummary.source_fields)
+    return trusted(await asyncio.gather(*[BlueprintSummary.from_model(bp) for bp in blueprints]), response)
 
 @router.get("/blueprint/{id}", response_model=BlueprintResponse)
-def blueprint_get(id: str, current_user: User = Depends(get_current_user)):
+async def blueprint_get(id: str, request: Request, response: Response, current_user: User = Depends(get_current_user), expand: Expansion = Depends(get_expansion)):
     if id == "new":
         blueprint = DefaultBlueprint.model_copy(deep=True)
         blueprint.creator_id = current_user.id
-        return BlueprintResponse.from_model(blueprint)
+        return trusted(await BlueprintResponse.from_model(blueprint, expand))
     else:
-        blueprint = blueprints_repo.get(id)
+        blueprint = await blueprints_repo.get(id)
         if not blueprint:
             raise HTTPException(status_code=404, detail="Blueprint not found")
         if blueprint.creator_id != current_user.id:
             raise HTTPException(status_code=403, detail="You do not have permission to access this blueprint")
-        
-        return BlueprintResponse.from_model(blueprint)
+
+        etag = make_etag(await blueprint_documents(blueprint, expand), expand)
+        if unchanged := conditional(request, etag):
+            return unchanged
+        response.headers["ETag"] = etag
+
+        return trusted(await BlueprintResponse.from_model(blueprint, expand), response)
 
 @router.post("/blueprint/{id}", response_model=BlueprintResponse)
-def blueprint_post(id: str, payload: BlueprintPayload, current_user: User = Depends(get_current_user)):
+async def blueprint_post(id: str, payload: BlueprintPayload, current_user: User = Depends(get_current_user), expand: Expansion = Depends(get_expansion)):
     if id == "new":
         blueprint = payload.to_model(DefaultBlueprint.model_copy(deep=True))
         blueprint.creator_id = current_user.id
-        if not blueprints_repo.add(blueprint):
+        if not await blueprints_repo.add(blueprint):
             raise HTTPException(status_code=400, detail="Failed to create blueprint")
     else:
-        blueprint = blueprints_repo.get(id)
+        blueprint = await blueprints_repo.get(id)
         if not blueprint:
             raise HTTPException(status_code=404, detail="Blueprint not found")
         if blueprint.creator_id != current_user.id:
             raise HTTPException(status_code=403, detail="You do not have permission to update this blueprint")
         
         blueprint = payload.to_model(blueprint)
-        if not blueprints_repo.update(blueprint):
+        if not await blueprints_repo.update(blueprint):
             raise HTTPException(status_code=400, detail="Failed to update blueprint")
 
-    return BlueprintResponse.from_model(blueprint)
+    return trusted(await BlueprintResponse.from_model(blueprint, expand))
 
 @router.get("/blueprint/{id}/delete", response_model=None)
-def blueprint_delete(id: str, current_user: User = Depends(get_current_user)):
+async def blueprint_delete(id: str, current_user: User = Depends(get_current_user)):
     # Step 1: Validate blueprint existence and ownership
-    blueprint = blueprints_repo.get(id)
+    blueprint = await blueprints_repo.get(id)
     if not blueprint:
         raise HTTPException(status_code=404, detail="Blueprint not found")
     if blueprint.creator_id != current_user.id:
         raise HTTPException(status_code=403, detail="You do not have permission to delete this blueprint")
 
-    # Step 2: Remove blueprint from all worlds
-    worlds = worlds_repo.query([("blueprint_ids", "array-contains", id)])
-    for world in worlds:
-        world.blueprint_ids = [b for b in world.blueprint_ids if b != id]
-        worlds_repo.update(world)
-
-    # Step 3: Remove blueprint from all campaigns (if campaigns also reference blueprint IDs)
-    campaigns = campaigns_repo.query([("blueprint_ids", "array-contains", id)])
-    for campaign in campaigns:
-        campaign.blueprint_ids = [b for b in campaign.blueprint_ids if b != id]
-        campaigns_repo.update(campaign)
-
-    # Step 4: Delete all objects tied to this blueprint
-    objects = objects_repo.query([("blueprint_id", "==", id)])
-    for obj in objects:
-        objects_repo.delete(obj.id)
-
-    # Step 5: Delete the blueprint itself
-    if not blueprints_repo.delete(id):
+    # Step 2: Find everything that references the blueprint, reading only document IDs
+    worlds, campaigns, objects = await asyncio.gather(
+        worlds_repo.query([("blueprint_ids", "array-contains", id)], select=["id"]),
+        campaigns_repo.query([("blueprint_ids", "array-contains", id)], select=["id"]),
+        objects_repo.query([("blueprint_id", "==", id)], select=["id", "creator_id"]),
+    )
+
+    # Step 3: Strip the blueprint from worlds and campaigns and delete its objects in batched writes
+    results = await asyncio.gather(
+        worlds_repo.array_remove([w.id for w in worlds], "blueprint_ids", [id]),
+        campaigns_repo.array_remove([c.id for c in campaigns], "blueprint_ids", [id]),
+        objects_repo.delete_many([o.id for o in objects]),
+    )
+    if not all(results):
+        raise HTTPException(status_code=500, detail="Failed to remove blueprint references")
+
+    # Step 4: Delete the blueprint itself
+    if not await blueprints_repo.delete(id):
         raise HTTPException(status_code=400, detail="Failed to delete blueprint")
 
+    # Step 5: Leave tombstones for delta syncs, under each deleted document's owner
+    owners = {}
+    for o in objects:
+        owners.setdefault(o.creator_id, []).append(o.id)
+    await asyncio.gather(
+        bury("blueprints", [id], blueprint.creator_id),
+        *[bury("objects", ids, creator_id) for creator_id, ids in owners.items()],
+    )
+
     return None
 
 @router.get("/context/{id}", response_model=ContextResponse)
-def context_get(id: str, current_user: User = Depends(get_current_user)):
+async def context_get(id: str, request: Request, response: Response, current_user: User = Depends(get_current_user)):
     if id == "new":
         context = DefaultContext.model_copy(deep=True)
-        return ContextResponse.from_model(context)
+        return trusted(await ContextResponse.from_model(context))
     else:
-        context = context_repo.get(id)
+        context = await context_repo.get(id)
         if not context:
             raise HTTPException(status_code=404, detail="Context not found")
-        
-        return ContextResponse.from_model(context)
+
+        etag = make_etag([context], EXPAND_ALL)
+        if unchanged := conditional(request, etag):
+            return unchanged
+        response.headers["ETag"] = etag
+
+        return trusted(await ContextResponse.from_model(context), response)
 
 @router.post("/context/{id}", response_model=ContextResponse)
-def context_post(id: str, payload: ContextPayload, current_user: User = Depends(get_current_user)):
+async def context_post(id: str, payload: ContextPayload, current_user: User = Depends(get_current_user)):
     if id == "new":
         context = payload.to_model(DefaultContext.model_copy(deep=True))
-        if not context_repo.add(context):
+        context.creator_id = current_user.id
+        if not await context_repo.add(context):
             raise HTTPException(status_code=400, detail="Failed to create context")
     else:
-        context = context_repo.get(id)
+        context = await context_repo.get(id)
         if not context:
             raise HTTPException(status_code=404, detail="Context not found")
 
         context = payload.to_model(context)
-        if not context_repo.update(context):
+        if not await context_repo.update(context):
             raise HTTPException(status_code=400, detail="Failed to update context")
 
-    return ContextResponse.from_model(context)
+    return trusted(await ContextResponse.from_model(context))
 
 @router.post("/context/{id}/delete")
-def context_delete(id: str, current_user: User = Depends(get_current_user)):
-    context = context_repo.get(id)
+async def context_delete(id: str, current_user: User = Depends(get_current_user)):
+    context = await context_repo.get(id)
     if not context:
         return None
     
     
 
-    if not context_repo.delete(id):
+    if not await context_repo.delete(id):
         raise HTTPException(status_code=400, detail="Failed to delete context")
 
+    await bury("contexts", [id], context.creator_id or current_user.id)
+
     return None
 
 @router.get("/object/{id}", response_model=ObjectResponse)
-def object_get(id: str, current_user: User = Depends(get_current_user)):
+async def object_get(id: str, request: Request, response: Response, current_user: User = Depends(get_current_user), expand: Expansion = Depends(get_expansion)):
     if id == "new":
         object = DefaultObject.model_copy(deep=True)
         object.creator_id = current_user.id
         object.id = uuid.uuid4().hex
-        return ObjectResponse.from_model(object)
+        return trusted(await ObjectResponse.from_model(object, expand))
     else:
-        object = objects_repo.get(id)
+        object = await objects_repo.get(id)
         if not object:
             raise HTTPException(status_code=404, detail="Object not found")
 
-        return ObjectResponse.from_model(object)
+        etag = make_etag(await object_documents(object, expand), expand)
+        if unchanged := conditional(request, etag):
+            return unchanged
+        response.headers["ETag"] = etag
+
+        return trusted(await ObjectResponse.from_model(object, expand), response)
 
 @router.post("/object/{id}", response_model=ObjectResponse)
-def object_post(id: str, payload: ObjectPayload, current_user: User = Depends(get_current_user)):
+async def object_post(id: str, payload: ObjectPayload, current_user: User = Depends(get_current_user), expand: Expansion = Depends(get_expansion)):
     if id == "new":
         object = payload.to_model(DefaultObject.model_copy(deep=True))
         object.creator_id = current_user.id
-        if not objects_repo.add(object):
+        if not await objects_repo.add(object):
             raise HTTPException(status_code=400, detail="Failed to create object")
     else:
-        object = objects_repo.get(id)
+        object = await objects_repo.get(id)
         if not object:
             raise HTTPException(status_code=404, detail="Object not found")
 
         object = payload.to_model(object)
-        if not objects_repo.update(object):
+        if not await objects_repo.update(object):
             raise HTTPException(status_code=400, detail="Failed to update object")
 
-    return ObjectResponse.from_model(object)
\ No newline at end of file
+    return trusted(await ObjectResponse.from_model(object, expand))
\ No newline at end of file
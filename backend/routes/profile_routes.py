@@ -0,0 +1,55 @@
+import hmac
+from typing import Literal
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import FileResponse
+from pydantic import BaseModel, Field
+from backend import profiling
+
+# === Config ===
+router = APIRouter()
+
+
+class ArmPayload(BaseModel):
+    path: str
+    count: int = Field(1, ge=1, le=100)
+    mode: Literal["cprofile", "sample"] = "sample"
+
+
+# === Helper Functions ===
+async def require_profiling_token(x_profile_token: str = Header(None)):
+    """
+    Dependency that only lets through callers holding PROFILING_TOKEN.
+    """
+    if not x_profile_token or not hmac.compare_digest(x_profile_token, profiling.PROFILING_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid profiling token")
+
+
+# === Profile Endpoints ===
+@router.get("/profiles", dependencies=[Depends(require_profiling_token)], include_in_schema=False)
+async def profiles_list():
+    """
+    Lists stored profiles, newest first, and the path prefixes currently armed.
+    """
+    return {"profiles": profiling.profile_store.list(), "armed": profiling.armed()}
+
+@router.post("/profiles/arm", dependencies=[Depends(require_profiling_token)], include_in_schema=False)
+async def profiles_arm(payload: ArmPayload):
+    """
+    Profiles the next `count` requests whose path starts with `path`.
+    """
+    profiling.arm(payload.path, payload.count, payload.mode)
+    return {"armed": profiling.armed()}
+
+@router.get("/profiles/{id}", dependencies=[Depends(require_profiling_token)], include_in_schema=False)
+async def profiles_get(id: str):
+    """
+    Downloads a profile artifact: pstats for cprofile, folded stacks for sample.
+    """
+    found = profiling.profile_store.get(id)
+    if not found:
+        raise HTTPException(status_code=404, detail="Profile not found")
+
+    info, path = found
+    route = info["route"].strip("/").replace("/", "_").replace("{", "").replace("}", "") or "root"
+    filename = f"{id}-{route}.{profiling.PROFILE_EXTENSIONS[info['mode']]}"
+    return FileResponse(path, media_type="application/octet-stream", filename=filename)
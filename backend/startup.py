@@ -0,0 +1,36 @@
+import time
+import logging
+from typing import List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class StartupReport:
+    """
+    Records how long each phase of process startup took, from the moment this module is imported
+    until the app begins serving. main.py imports it first so the clock covers every other import.
+    """
+
+    def __init__(self):
+        self._started = time.perf_counter()
+        self._last = self._started
+        self.phases: List[Tuple[str, float]] = []
+
+    def mark(self, phase: str):
+        """
+        Closes the current phase under the given name.
+        """
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    @property
+    def total_ms(self) -> float:
+        return (self._last - self._started) * 1000
+
+    def log(self):
+        breakdown = ", ".join(f"{phase} {ms:.0f} ms" for phase, ms in self.phases)
+        logger.info(f"Startup took {self.total_ms:.0f} ms ({breakdown})")
+
+
+startup_report = StartupReport()
@@ -0,0 +1,6 @@
+import os
+
+# Repos bind their backend on import, so the in-memory backend is chosen before anything imports them
+os.environ["DATABASE_BACKEND"] = "memory"
+os.environ["DATABASE_WARM_UP"] = "0"
+os.environ.setdefault("JWT_KEY", "tests")
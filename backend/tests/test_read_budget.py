@@ -0,0 +1,80 @@
+import asyncio
+import random
+
+import pytest
+
+from backend.benchmarks.synthetic import seed_user, seed_world, seed_campaign
+from backend.database.loader import begin_request, end_request
+from backend.database.read_budget import track_reads, ReadBudgetExceeded
+from backend.database.repos import worlds_repo, campaigns_repo
+from backend.routes._schemas import WorldResponse, CampaignResponse
+
+# Storage round trips the builders may make; neither may grow with the size of the world
+WORLD_BUDGET = 10
+CAMPAIGN_BUDGET = 50
+
+
+async def _seed(objects: int):
+    user = await seed_user(f"reader{objects}", "unused")
+    world = await seed_world(user, objects, random.Random(objects))
+    campaign = await seed_campaign(user, world, rng=random.Random(objects))
+    return world, campaign
+
+async def _build(response, repo, id: str):
+    return await response.from_model(await repo.get(id))
+
+async def _round_trips(build, budget: int) -> int:
+    token = begin_request()
+    try:
+        with track_reads(budget=budget, strict=True) as reads:
+            await build()
+    finally:
+        end_request(token)
+    return reads.round_trips
+
+async def _world_round_trips(world_id: str) -> int:
+    return await _round_trips(lambda: _build(WorldResponse, worlds_repo, world_id), WORLD_BUDGET)
+
+async def _campaign_round_trips(campaign_id: str) -> int:
+    return await _round_trips(lambda: _build(CampaignResponse, campaigns_repo, campaign_id), CAMPAIGN_BUDGET)
+
+
+def test_world_builder_within_budget():
+    async def check():
+        small, _ = await _seed(10)
+        large, _ = await _seed(200)
+        assert await _world_round_trips(small.world_id) == await _world_round_trips(large.world_id)
+
+    asyncio.run(check())
+
+def test_campaign_builder_within_budget():
+    async def check():
+        _, small = await _seed(10)
+        _, large = await _seed(200)
+        assert await _campaign_round_trips(small.campaign_id) == await _campaign_round_trips(large.campaign_id)
+
+    asyncio.run(check())
+
+def test_loader_hits_are_not_charged():
+    async def check():
+        world, _ = await _seed(20)
+        token = begin_request()
+        try:
+            with track_reads(budget=None, strict=True) as reads:
+                await worlds_repo.get(world.world_id)
+                await worlds_repo.get(world.world_id)
+        finally:
+            end_request(token)
+        assert reads.calls == 2
+        assert reads.round_trips == 1
+
+    asyncio.run(check())
+
+def test_strict_budget_raises():
+    async def check():
+        world, _ = await _seed(5)
+        with pytest.raises(ReadBudgetExceeded):
+            with track_reads(budget=1, strict=True):
+                await WorldResponse.from_model(await worlds_repo.get(world.world_id))
+
+    asyncio.run(check())
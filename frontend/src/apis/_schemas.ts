@@ -74,6 +74,17 @@ export interface WorldResponse extends BaseDocument {
   settings: WorldSetting;
 }
 
+/** Lightweight world returned by the library list endpoint */
+export interface WorldSummary extends BaseDocument {
+  name: string;
+  description?: string | null;
+  creator: UserResponse;
+  context_count: number;
+  blueprint_count: number;
+  object_count: number;
+  settings: WorldSetting;
+}
+
 
 // === Campaign ===
 
@@ -160,6 +171,16 @@ export interface BlueprintResponse extends BaseDocument {
   fields: CustomField[];
 }
 
+/** Lightweight blueprint returned by the library list endpoint */
+export interface BlueprintSummary extends BaseDocument {
+  name: string;
+  description?: string | null;
+  creator: UserResponse;
+  is_public: boolean;
+  is_developer: boolean;
+  field_count?: number | null;
+}
+
 
 // === Object ===
 
@@ -196,8 +217,12 @@ export interface ObjectiveResponse extends BaseDocument {
   name: string;
   task: string;
   progress: number;
-  children: ObjectiveResponse[];
+  progress_rollup?: number | null;
+  children_ids: string[];
+  children?: ObjectiveResponse[] | null;
+  parent_id?: string | null;
   parent?: ObjectiveResponse | null;
+  root_id?: string | null;
 }
 
 
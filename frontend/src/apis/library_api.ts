@@ -1,9 +1,9 @@
 import { GET_ENDPOINT, POST_ENDPOINT } from "./_api_core";
-import type { WorldPayload, WorldResponse, BlueprintPayload, BlueprintResponse, CustomField, ContextPayload, ContextResponse, ObjectPayload, ObjectResponse} from "./_schemas";
+import type { WorldPayload, WorldResponse, WorldSummary, BlueprintPayload, BlueprintResponse, BlueprintSummary, CustomField, ContextPayload, ContextResponse, ObjectPayload, ObjectResponse} from "./_schemas";
 
 // === World Endpoints ===
-export async function worlds_all_get(): Promise<WorldResponse[]> {
-    return GET_ENDPOINT<WorldResponse[]>(`/worlds`);
+export async function worlds_all_get(): Promise<WorldSummary[]> {
+    return GET_ENDPOINT<WorldSummary[]>(`/worlds`);
 }
 
 export async function world_get(id: string): Promise<WorldResponse> {
@@ -23,8 +23,12 @@ export async function world_post(id: string, name: string, description?: string,
     return POST_ENDPOINT<WorldPayload, WorldResponse>(`/world/${id}`, payload);
 }
 
-export async function blueprints_all_get(): Promise<BlueprintResponse[]> {
-    return GET_ENDPOINT<BlueprintResponse[]>(`/blueprints`);
+export async function blueprints_all_get(): Promise<BlueprintSummary[]> {
+    return GET_ENDPOINT<BlueprintSummary[]>(`/blueprints`);
+}
+
+export async function blueprints_all_get_full(): Promise<BlueprintResponse[]> {
+    return GET_ENDPOINT<BlueprintResponse[]>(`/blueprints?view=full`);
 }
 
 export async function blueprint_get(id: string): Promise<BlueprintResponse> {
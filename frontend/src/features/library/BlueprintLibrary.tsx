@@ -1,14 +1,14 @@
 import { useNavigate } from "react-router-dom";
 import { useEffect, useState } from "react";
 import { blueprints_all_get } from "@apis/library_api";
-import type { BlueprintResponse } from "@apis/_schemas";
+import type { BlueprintSummary } from "@apis/_schemas";
 
 import BlueprintEditor from "@/features/editors/BlueprintEditor";
 import MessageBox from "@/components/MessageBox";
 import GenericList from "@features/library/generic/GenericList";
 
 export default function BlueprintLibrary() {
-    const [allBlueprints, setAllBlueprints] = useState<BlueprintResponse[]>([]);
+    const [allBlueprints, setAllBlueprints] = useState<BlueprintSummary[]>([]);
 
     const [showEditor, setShowEditor] = useState<boolean>(false);
     const [currentBlueprintID, setCurrentBlueprintID] = useState<string | "new">("new");
@@ -38,12 +38,12 @@ export default function BlueprintLibrary() {
         setShowEditor(true);
     }
 
-    const openEditor = (blueprint: BlueprintResponse) => {
+    const openEditor = (blueprint: BlueprintSummary) => {
         setCurrentBlueprintID(blueprint.id);
         setShowEditor(true);
     }
 
-    const renderDetails = (blueprint: BlueprintResponse) => {
+    const renderDetails = (blueprint: BlueprintSummary) => {
         return (
             <>
                 <div className="d-flex flex-column gap-2 w-100">
@@ -52,7 +52,9 @@ export default function BlueprintLibrary() {
                     <p className="card-text m-0"><small className="text-muted">{blueprint.is_public ? "Public" : "Private"}</small></p>
                 </div>
                 <div className="d-flex flex-column gap-1 w-100">
-                    <p className="card-text m-0"><small className="text-muted">{blueprint.fields.length} Fields</small></p>
+                    {blueprint.field_count != null && (
+                        <p className="card-text m-0"><small className="text-muted">{blueprint.field_count} Fields</small></p>
+                    )}
                     <p className="card-text m-0"><small className="text-muted">Created by {blueprint.creator.username} on {new Date(blueprint.created_at).toLocaleDateString()}</small></p>
                     <p className="card-text m-0"><small className="text-muted">Last updated: {new Date(blueprint.updated_at || blueprint.created_at).toLocaleDateString()}</small></p>
                 </div>
@@ -67,7 +69,7 @@ export default function BlueprintLibrary() {
 
             <hr className="text-light w-100 my-2" />
 
-            <GenericList<BlueprintResponse>
+            <GenericList<BlueprintSummary>
                 itemName="blueprint"
                 items={allBlueprints}
                 refresh={fetchBlueprints}
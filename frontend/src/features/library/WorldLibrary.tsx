@@ -1,7 +1,7 @@
 import { useNavigate } from "react-router-dom";
 import { useEffect, useState } from "react";
 import { worlds_all_get } from "@apis/library_api";
-import type { WorldResponse } from "@apis/_schemas";
+import type { WorldSummary } from "@apis/_schemas";
 
 import MessageBox from "@/components/MessageBox";
 import GenericList from "@features/library/generic/GenericList";
@@ -9,7 +9,7 @@ import GenericList from "@features/library/generic/GenericList";
 export default function WorldLibrary() {
     const navigate = useNavigate();
 
-    const [allWorlds, setAllWorlds] = useState<WorldResponse[]>([]);
+    const [allWorlds, setAllWorlds] = useState<WorldSummary[]>([]);
 
     const [loading, setLoading] = useState(true);
     const [error, setError] = useState<string>("");
@@ -35,12 +35,12 @@ export default function WorldLibrary() {
         navigate("/details/world/new");
     }
 
-    const openEditor = (world: WorldResponse) => {
+    const openEditor = (world: WorldSummary) => {
         navigate(`/details/world/${world.id}`);
     }
     
 
-    const renderDetails = (world: WorldResponse) => {
+    const renderDetails = (world: WorldSummary) => {
         return (
             <>
                 <div className="d-flex flex-column gap-2 w-100">
@@ -49,9 +49,9 @@ export default function WorldLibrary() {
                     <p className="card-text m-0"><small className="text-muted">{world.settings.is_public ? "Public" : "Private"}</small></p>
                 </div>
                 <div className="d-flex flex-column gap-1 w-100">
-                    <p className="card-text m-0"><small className="text-muted">{world.contexts.length} Contexts</small></p>
-                    <p className="card-text m-0"><small className="text-muted">{world.blueprints.length} Blueprints</small></p>
-                    <p className="card-text m-0"><small className="text-muted">{world.objects.length} Objects</small></p>
+                    <p className="card-text m-0"><small className="text-muted">{world.context_count} Contexts</small></p>
+                    <p className="card-text m-0"><small className="text-muted">{world.blueprint_count} Blueprints</small></p>
+                    <p className="card-text m-0"><small className="text-muted">{world.object_count} Objects</small></p>
                 </div>
                 <div className="d-flex flex-column gap-1 w-100">
                     <p className="card-text m-0"><small className="text-muted">Created by {world.creator.username} on {new Date(world.created_at).toLocaleDateString()}</small></p>
@@ -68,7 +68,7 @@ export default function WorldLibrary() {
 
             <hr className="text-light w-100 my-2" />
 
-            <GenericList<WorldResponse>
+            <GenericList<WorldSummary>
                 itemName="world"
                 items={allWorlds}
                 refresh={fetchWorlds}
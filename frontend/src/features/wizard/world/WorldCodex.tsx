@@ -1,7 +1,7 @@
 import type { WorldResponse, BlueprintResponse, ContextResponse, ObjectResponse } from "@apis/_schemas";
 import { useEffect, useState } from "react";
 
-import { blueprints_all_get } from "@/apis/library_api";
+import { blueprints_all_get_full } from "@/apis/library_api";
 
 import BlueprintEditor from "@/features/editors/BlueprintEditor";
 import ContextEditor from "@/features/editors/ContextEditor";
@@ -50,7 +50,7 @@ export default function WorldCodex({ world, setWorld, loadingWorld, setError }:
         try {
             setLoadingBlueprints(true);
             setError("");
-            const data: BlueprintResponse[] = await blueprints_all_get();
+            const data: BlueprintResponse[] = await blueprints_all_get_full();
             setAvailableBlueprints(data);
         } catch (error) {
             setError("Failed to load blueprints. Please try again later.");